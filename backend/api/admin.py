@@ -1,6 +1,16 @@
 # Import Django admin utilities
+import posixpath
+
 from django.contrib import admin
-from .models import Project, Customer, Communication, ContactInquiry
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+from .models import Project, Customer, Communication, ContactInquiry, BackgroundJob, TechnologyFacet
+from .models import RequestProfile, SlowQuery
+from .search import full_text_filter
+from .uploads import INQUIRY_DOC_DOWNLOADS
 # api/admin.py
 from .models import ProjectStage, Task, ChangeRequest, ClientProfile
 # api/admin.py
@@ -9,6 +19,18 @@ from .models import ClientProfile
 
 
 
+class FullTextSearchMixin:
+    """
+    Replaces the admin's `icontains` search (a sequential scan per field) with a
+    prefix full-text match on the model's GIN-indexed search_vector (api/search.py).
+    `search_fields` only needs to be non-empty so the search box is shown.
+    """
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return full_text_filter(queryset, search_term), False
+
+
 @admin.register(ProjectStage)
 class ProjectStageAdmin(admin.ModelAdmin):
     list_display = ('name', 'order')
@@ -18,12 +40,14 @@ class ProjectStageAdmin(admin.ModelAdmin):
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ('project', 'title', 'assignee', 'due_date', 'completed')
+    list_select_related = ('project', 'assignee')
     list_filter = ('completed', 'due_date')
     search_fields = ('title', 'description')
 
 @admin.register(ChangeRequest)
 class ChangeRequestAdmin(admin.ModelAdmin):
     list_display = ('project', 'requester', 'priority', 'status', 'created_at')
+    list_select_related = ('project', 'requester')  # __str__ uses project.title
     list_filter = ('priority', 'status', 'created_at')
     search_fields = ('description',)
 
@@ -35,14 +59,14 @@ class ClientProfileAdmin(admin.ModelAdmin):
 
 # Register Project model with basic admin configuration
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(FullTextSearchMixin, admin.ModelAdmin):
     """
     Admin configuration for Project model:
     - Displays key fields in the admin list view.
-    - Allows filtering and searching for projects.
+    - Allows filtering and full-text searching for projects.
     """
     list_display = ('title', 'created_at')  # Columns shown in admin list
-    search_fields = ('title', 'description')  # Fields searchable in admin
+    search_fields = ('title', 'technologies', 'capabilities', 'description')  # Covered by search_vector
     list_filter = ('created_at',)  # Filter by creation date
     ordering = ('-created_at',)  # Sort by newest first
 
@@ -68,22 +92,26 @@ class CommunicationAdmin(admin.ModelAdmin):
     - Allows filtering and searching for communications.
     """
     list_display = ('customer', 'type', 'date')  # Columns shown
+    list_select_related = ('customer',)  # __str__ uses customer.name
     search_fields = ('customer__name', 'notes')  # Search by customer name or notes
     list_filter = ('type', 'date')  # Filter by type and date
     ordering = ('-date',)  # Sort by newest first
 
 # Register ContactInquiry model with detailed admin configuration
 @admin.register(ContactInquiry)
-class ContactInquiryAdmin(admin.ModelAdmin):
+class ContactInquiryAdmin(FullTextSearchMixin, admin.ModelAdmin):
     """
     Admin configuration for ContactInquiry model:
     - Displays key fields for contact form submissions.
     - Allows filtering by project type, budget range, and creation date.
-    - Provides search across multiple fields.
+    - Provides full-text search across name, email, company and description.
     - Displays preferred_technologies as a comma-separated string.
+    - Links uploaded documents to the authenticated download endpoint, not MEDIA_URL.
     """
     list_display = ('inquiry_id', 'full_name', 'email', 'company', 'project_type', 'budget_range', 'created_at')  # Columns shown
-    search_fields = ('full_name', 'email', 'company', 'project_description')  # Searchable fields
+    exclude = ('requirements_doc', 'nda_doc')  # Their widgets link to the public media URL
+    readonly_fields = ('documents',)
+    search_fields = ('full_name', 'email', 'company', 'project_description')  # Covered by search_vector
     list_filter = ('project_type', 'budget_range', 'created_at', 'communication_method', 'meeting_platform')  # Filters
     ordering = ('-created_at',)  # Sort by newest first
 
@@ -92,4 +120,125 @@ class ContactInquiryAdmin(admin.ModelAdmin):
         Custom method to display preferred_technologies as a string in admin.
         """
         return ', '.join(obj.preferred_technologies) if obj.preferred_technologies else 'None'
-    get_preferred_technologies.short_description = 'Preferred Technologies'  # Column header
\ No newline at end of file
+    get_preferred_technologies.short_description = 'Preferred Technologies'  # Column header
+
+    def documents(self, obj):
+        """
+        Download links for the uploaded PDFs (InquiryDocumentView).
+        """
+        links = [
+            (reverse('inquiry-document', args=[obj.pk, segment]), f"{segment}: {posixpath.basename(getattr(obj, field).name)}")
+            for segment, field in INQUIRY_DOC_DOWNLOADS.items() if getattr(obj, field)
+        ]
+        return format_html_join(', ', '<a href="{}">{}</a>', links) if links else 'None'
+
+# Register BackgroundJob model for queue inspection and manual retries
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for BackgroundJob model:
+    - Shows queue state, attempts and next run time.
+    - Provides an action to requeue failed jobs.
+    """
+    list_display = ('id', 'name', 'status', 'attempts', 'max_attempts', 'run_after', 'updated_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'updated_at', 'locked_at', 'last_error')
+    actions = ['requeue_jobs']
+
+    @admin.action(description='Requeue selected jobs')
+    def requeue_jobs(self, request, queryset):
+        """
+        Reset selected jobs to pending so a worker picks them up immediately.
+        """
+        count = queryset.update(status=BackgroundJob.STATUS_PENDING, attempts=0, locked_at=None, run_after=timezone.now())
+        self.message_user(request, f"Requeued {count} job(s)")
+
+# Register TechnologyFacet read-only: counts are maintained by database triggers
+@admin.register(TechnologyFacet)
+class TechnologyFacetAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for TechnologyFacet model:
+    - Shows technology usage across projects and contact inquiries.
+    - Read-only; rows are maintained by triggers on the array columns.
+    """
+    list_display = ('name', 'source', 'count')
+    list_filter = ('source',)
+    ordering = ('source', '-count')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+# Diagnostics captured by api/profiling.py: view-only
+class DiagnosticsAdmin(admin.ModelAdmin):
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(DiagnosticsAdmin):
+    """
+    Admin configuration for RequestProfile model:
+    - Lists profiled requests by duration, with SQL share.
+    - Shows the top functions; folded stacks download for flamegraph.pl / speedscope.
+    """
+    list_display = ('created_at', 'method', 'path', 'view_name', 'status_code', 'duration_ms', 'query_count', 'sql_ms', 'user')
+    list_filter = ('view_name', 'method')
+    list_select_related = ('user',)
+    search_fields = ('path',)
+    ordering = ('-created_at',)
+    fields = ('created_at', 'user', 'method', 'path', 'view_name', 'status_code', 'duration_ms', 'query_count', 'sql_ms', 'samples', 'top_functions', 'flame_graph')
+    readonly_fields = ('created_at', 'top_functions', 'flame_graph')
+
+    @admin.display(description='Top functions')
+    def top_functions(self, obj):
+        return format_html('<pre>{}</pre>', obj.summary)
+
+    @admin.display(description='Flame graph')
+    def flame_graph(self, obj):
+        url = reverse('admin:api_requestprofile_folded', args=[obj.pk])
+        return format_html('<a href="{}">Download folded stacks</a> (open in speedscope.app or flamegraph.pl)', url)
+
+    def get_urls(self):
+        return [
+            path('<int:pk>/folded/', self.admin_site.admin_view(self.folded_view), name='api_requestprofile_folded'),
+        ] + super().get_urls()
+
+    def folded_view(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(profile.folded_stacks, content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="profile-{pk}.folded"'
+        return response
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(DiagnosticsAdmin):
+    """
+    Admin configuration for SlowQuery model:
+    - Lists captured statements by originating view and duration.
+    - Shows the SQL and its EXPLAIN (ANALYZE, BUFFERS) plan.
+    """
+    list_display = ('created_at', 'view_name', 'method', 'path', 'duration_ms', 'alias')
+    list_filter = ('view_name', 'alias')
+    search_fields = ('sql', 'path')
+    ordering = ('-created_at',)
+    fields = ('created_at', 'view_name', 'method', 'path', 'alias', 'duration_ms', 'statement', 'params', 'query_plan')
+    readonly_fields = ('created_at', 'statement', 'query_plan')
+
+    @admin.display(description='SQL')
+    def statement(self, obj):
+        return format_html('<pre style="white-space: pre-wrap">{}</pre>', obj.sql)
+
+    @admin.display(description='Plan')
+    def query_plan(self, obj):
+        return format_html('<pre>{}</pre>', obj.plan)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Register background job handlers with the queue (api/jobs.py)
+        from . import tasks  # noqa: F401
+        # Connect model signal receivers (cache invalidation)
+        from . import signals  # noqa: F401
@@ -0,0 +1,47 @@
+# api/auth.py
+"""
+Cached authentication for session-authenticated API calls:
+- Sessions use the cached_db engine (settings.SESSION_ENGINE): reads come from
+  the cache, writes go to both cache and django_session.
+- CachedModelBackend.get_user() serves the logged-in user from the cache, so a
+  warm authenticated request needs neither the session nor the auth_user query.
+- Cached users are dropped on every User save/delete (api/signals.py); password
+  changes still invalidate sessions because the session hash is checked against
+  the fresh user. With a per-process cache other workers may keep a stale user
+  for up to AUTH_USER_CACHE_TIMEOUT seconds; use a shared CACHE_BACKEND in production.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .metrics import record_cache
+
+
+def user_cache_key(user_id):
+    return f'authuser:{user_id}'
+
+
+def forget_user(user_id):
+    """Drop a cached user (called when the user row changes)."""
+    cache.delete(user_cache_key(user_id))
+
+
+def user_role(user):
+    """Role used by Sidebar.jsx: 'admin' for the admin account, 'standard' otherwise."""
+    return 'admin' if user.is_authenticated and user.username == 'admin' else 'standard'
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose get_user() (called once per request by AuthenticationMiddleware)
+    is read-through cached. Authentication and permission checks are unchanged.
+    """
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        record_cache('auth_user', user is not None)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user if user is not None and self.user_can_authenticate(user) else None
@@ -0,0 +1,322 @@
+# api/bulk.py
+"""
+Streaming bulk import/export behind `manage.py import_data` / `export_data`:
+- Formats: CSV (header row, list columns as JSON arrays) and JSONL (one object per line).
+- Export reads through a server-side cursor (QuerySet.iterator), so memory stays flat
+  on million-row tables. Related rows are written by natural key (stage name, customer
+  email, assignee username), so a file can be loaded into another database.
+- Import converts `batch_size` rows at a time, COPYs each batch into a temporary
+  staging table and merges it with INSERT ... ON CONFLICT on the dataset's upsert key
+  (Customer.email, ContactInquiry.inquiry_id, or id when the file carries ids).
+  The whole import runs in one transaction: a bad row leaves the table untouched.
+- Database triggers (search vectors, technology facets) fire as for any insert. Django
+  signals do not, so response-cache versions are bumped and the recommendation rebuild
+  is scheduled explicitly afterwards.
+"""
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.utils import timezone
+
+from . import stages
+from .models import Communication, ContactInquiry, Customer, Project, Task
+from .recommendations import schedule_rebuild
+from .response_cache import bump_version
+
+DEFAULT_BATCH_SIZE = 5_000
+FORMATS = ('csv', 'jsonl')
+EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+
+class BulkDataError(Exception):
+    """Invalid input file; the message names the offending record."""
+
+
+# ---------- Datasets -------------------------------------------------
+
+class Reference:
+    """
+    Foreign key written by natural key: `column` in the file holds `model.lookup`,
+    stored in `attname`. Resolved with one query per import batch.
+    """
+    def __init__(self, column, attname, model, lookup):
+        self.column = column
+        self.attname = attname
+        self.model = model
+        self.lookup = lookup
+
+    def resolve(self, values):
+        """{natural key: pk} for the distinct `values` of one batch."""
+        return dict(
+            self.model.objects.filter(**{f'{self.lookup}__in': values}).values_list(self.lookup, 'pk')
+        )
+
+
+class StageReference(Reference):
+    """Stage names resolve through the in-process stage registry: no queries."""
+    def resolve(self, values):
+        ids = {name: stages.stage_id(name) for name in values}
+        return {name: pk for name, pk in ids.items() if pk is not None}
+
+
+class Dataset:
+    """
+    Import/export description of one model:
+    - `columns`: file columns in export order; plain fields or Reference columns.
+    - `key`: upsert key; None means id when the file has an id column, else plain inserts.
+    """
+    def __init__(self, model, columns, key=None, references=()):
+        self.model = model
+        self.columns = columns
+        self.key = key
+        self.references = {reference.column: reference for reference in references}
+
+    def export_lookups(self):
+        return [
+            f"{self.references[column].attname[:-3]}__{self.references[column].lookup}"
+            if column in self.references else column
+            for column in self.columns
+        ]
+
+
+DATASETS = {
+    'projects': Dataset(
+        Project,
+        ['id', 'title', 'description', 'image', 'link', 'technologies', 'capabilities', 'stage',
+         'budget_used', 'estimated_completion', 'created_at'],
+        references=[StageReference('stage', 'current_stage_id', None, 'name')],
+    ),
+    'customers': Dataset(Customer, ['name', 'email', 'phone', 'address', 'created_at'], key='email'),
+    'communications': Dataset(
+        Communication,
+        ['id', 'customer_email', 'type', 'notes', 'date'],
+        references=[Reference('customer_email', 'customer_id', Customer, 'email')],
+    ),
+    'tasks': Dataset(
+        Task,
+        ['id', 'project', 'title', 'description', 'assignee', 'due_date', 'completed', 'completed_at',
+         'created_at', 'updated_at'],
+        references=[Reference('assignee', 'assignee_id', get_user_model(), 'username')],
+    ),
+    'inquiries': Dataset(
+        ContactInquiry,
+        ['inquiry_id', 'full_name', 'company', 'email', 'phone', 'project_type', 'project_description',
+         'preferred_technologies', 'budget_range', 'timeline', 'communication_method', 'meeting_platform',
+         'requirements_doc', 'nda_doc', 'confidentiality', 'created_at'],
+        key='inquiry_id',
+    ),
+}
+
+
+def guess_format(path, fmt=None):
+    """Explicit `fmt`, else the format implied by the file extension."""
+    if fmt:
+        return fmt
+    for extension, guessed in EXTENSIONS.items():
+        if str(path).lower().endswith(extension):
+            return guessed
+    raise BulkDataError(f"Cannot tell the format of {path}; pass --format {'/'.join(FORMATS)}")
+
+
+# ---------- Export ---------------------------------------------------
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def export_rows(dataset_name, stream, fmt, batch_size=DEFAULT_BATCH_SIZE):
+    """Write every row of the dataset to `stream`; returns the number of rows."""
+    dataset = DATASETS[dataset_name]
+    rows = (
+        dataset.model.objects.order_by(dataset.model._meta.pk.name)
+        .values_list(*dataset.export_lookups())
+        .iterator(chunk_size=batch_size)
+    )
+    count = 0
+    if fmt == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(dataset.columns)
+        for row in rows:
+            writer.writerow([_csv_cell(value) for value in row])
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps(dict(zip(dataset.columns, row)), default=_json_default, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+# ---------- Import ---------------------------------------------------
+
+def read_records(stream, fmt):
+    """Yield one dict per CSV row / JSONL line."""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                raise BulkDataError(f"Line {number}: invalid JSON ({exc})") from exc
+
+
+class _Batch:
+    """Converts records of one dataset into rows for the staging table."""
+    def __init__(self, dataset, first_record):
+        self.dataset = dataset
+        model = dataset.model
+        pk_name = model._meta.pk.name
+        provided = [column for column in first_record if column in dataset.columns]
+
+        self.fields = {
+            column: model._meta.get_field(column)
+            for column in provided if column not in dataset.references
+        }
+        self.references = [dataset.references[column] for column in provided if column in dataset.references]
+        # Every concrete column gets a value (defaults for the missing ones) except
+        # an id the file does not carry and trigger-maintained search vectors
+        self.columns = [
+            field for field in model._meta.concrete_fields
+            if not isinstance(field, SearchVectorField)
+            and (field.name in self.fields or not field.primary_key or dataset.key == field.name)
+        ]
+        self.key = dataset.key or (pk_name if pk_name in self.fields else None)
+        # Existing rows only take the columns present in the file
+        written = set(self.fields) | {reference.attname[:-3] for reference in self.references}
+        self.update_columns = [
+            field.column for field in self.columns if field.name in written and field.name != self.key
+        ]
+        self.pending = []
+
+    def add(self, number, record):
+        self.pending.append((number, record))
+
+    def rows(self):
+        """Converted rows for the pending records (de-duplicated on the key, last one wins)."""
+        resolved = {}
+        for reference in self.references:
+            values = {record.get(reference.column) for _, record in self.pending} - {None, ''}
+            resolved[reference.column] = reference.resolve(values) if values else {}
+
+        rows, now = {}, timezone.now()
+        db = connections[DEFAULT_DB_ALIAS]  # Resolve the thread-local proxy once, not per value
+        for number, record in self.pending:
+            kwargs = {}
+            try:
+                for column, field in self.fields.items():
+                    value = record.get(column)
+                    if value is None or value == '':
+                        if field.null:
+                            kwargs[field.attname] = None
+                        continue  # Model default
+                    kwargs[field.attname] = field.to_python(value)
+            except ValidationError as exc:
+                raise BulkDataError(f"Record {number}: {column}: {' '.join(exc.messages)}") from exc
+            for reference in self.references:
+                value = record.get(reference.column)
+                if value is None or value == '':
+                    kwargs[reference.attname] = None
+                elif value in resolved[reference.column]:
+                    kwargs[reference.attname] = resolved[reference.column][value]
+                else:
+                    raise BulkDataError(f"Record {number}: unknown {reference.column} {value!r}")
+
+            obj = self.dataset.model(**kwargs)
+            row = []
+            for field in self.columns:
+                value = getattr(obj, field.attname)
+                if value is None and (getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)):
+                    value = now
+                row.append(field.get_db_prep_save(value, db))
+            key = getattr(obj, self.key) if self.key else number
+            rows[key] = row
+        self.pending = []
+        return rows.values()
+
+
+def import_rows(dataset_name, stream, fmt, batch_size=DEFAULT_BATCH_SIZE, on_conflict='update', progress=None):
+    """
+    Load records from `stream` into the dataset's table; returns the number of rows
+    inserted or updated (skipped conflicts excluded). `on_conflict` is 'update' or 'skip'.
+    `progress(count)` is called after every batch.
+    """
+    dataset = DATASETS[dataset_name]
+    table = dataset.model._meta.db_table
+    quote = connection.ops.quote_name
+    count, batch = 0, None
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        def flush():
+            nonlocal count
+            rows = batch.rows()
+            with cursor.copy(f"COPY {quote(staging)} ({columns}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+            cursor.execute(f"INSERT INTO {quote(table)} ({columns}) SELECT {columns} FROM {quote(staging)} {conflict}")
+            count += cursor.rowcount
+            cursor.execute(f"TRUNCATE {quote(staging)}")
+            if progress:
+                progress(count)
+
+        for number, record in enumerate(read_records(stream, fmt), 1):
+            if not isinstance(record, dict):
+                raise BulkDataError(f"Record {number}: expected an object")
+            if batch is None:
+                batch = _Batch(dataset, record)
+                columns = ', '.join(quote(field.column) for field in batch.columns)
+                staging = f'import_{table}'
+                cursor.execute(
+                    f"CREATE TEMP TABLE {quote(staging)} ON COMMIT DROP AS "
+                    f"SELECT {columns} FROM {quote(table)} WITH NO DATA"
+                )
+                conflict = ''
+                if batch.key:
+                    key_column = quote(dataset.model._meta.get_field(batch.key).column)
+                    if on_conflict == 'skip' or not batch.update_columns:
+                        conflict = f"ON CONFLICT ({key_column}) DO NOTHING"
+                    else:
+                        assignments = ', '.join(f"{quote(c)} = EXCLUDED.{quote(c)}" for c in batch.update_columns)
+                        conflict = f"ON CONFLICT ({key_column}) DO UPDATE SET {assignments}"
+            batch.add(number, record)
+            if len(batch.pending) >= batch_size:
+                flush()
+        if batch is not None and batch.pending:
+            flush()
+        if batch is not None:
+            # ON COMMIT DROP does not fire when called inside an outer transaction
+            cursor.execute(f"DROP TABLE {quote(staging)}")
+
+        if batch is not None and dataset.model._meta.pk.name in batch.fields:
+            # Explicit ids: move the id sequence past them
+            for sql in connection.ops.sequence_reset_sql(no_style(), [dataset.model]):
+                cursor.execute(sql)
+
+    if count:
+        bump_version(dataset.model)
+        if dataset.model is Project:
+            schedule_rebuild()
+    return count
+
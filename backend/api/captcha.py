@@ -0,0 +1,323 @@
+# api/captcha.py
+"""
+reCAPTCHA verification with pooled, keep-alive outbound HTTP:
+- `verify_captcha()` for sync (WSGI) views, backed by one shared requests.Session.
+- `averify_captcha()` for async (ASGI) views, backed by a shared httpx.AsyncClient
+  per event loop; a semaphore caps concurrent in-flight verifications.
+- Each token is verified once: verdicts are cached by token hash for RECAPTCHA_CACHE_TTL,
+  so double-submits and retries never reach Google and replays are rejected.
+- A circuit breaker fails fast (or degrades per RECAPTCHA_DEGRADED_POLICY) when
+  siteverify gets slow or starts erroring.
+- RECAPTCHA_VERIFY_URL can point at `manage.py run_captcha_stub` for offline load tests.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import weakref
+from collections import Counter, deque
+
+import httpx
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+from .metrics import record_cache, record_outbound
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+# One AsyncClient/semaphore per event loop: clients cannot be shared across loops
+_async_clients = weakref.WeakKeyDictionary()
+
+
+class CaptchaUnavailable(Exception):
+    """
+    Raised when the verification endpoint cannot be reached or answers with garbage.
+    """
+
+
+def _payload(token):
+    return {'secret': settings.RECAPTCHA_SECRET_KEY, 'response': token}
+
+
+def _get_session():
+    """Return the process-wide requests.Session with a bounded connection pool."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.RECAPTCHA_HTTP_MAX_CONNECTIONS,
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def _get_async_client():
+    """Return the (client, semaphore) pair bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.RECAPTCHA_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.RECAPTCHA_HTTP_MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(
+                settings.RECAPTCHA_HTTP_TIMEOUT,
+                pool=settings.RECAPTCHA_HTTP_POOL_TIMEOUT,
+            ),
+        )
+        entry = (client, asyncio.Semaphore(settings.RECAPTCHA_MAX_CONCURRENCY))
+        _async_clients[loop] = entry
+    return entry
+
+
+def _siteverify(token):
+    """
+    Verify `token` with the siteverify endpoint (blocking).
+    Returns the decoded JSON response; raises CaptchaUnavailable on transport errors.
+    """
+    start, ok = time.perf_counter(), False
+    try:
+        response = _get_session().post(
+            settings.RECAPTCHA_VERIFY_URL,
+            data=_payload(token),
+            timeout=settings.RECAPTCHA_HTTP_TIMEOUT,
+        )
+        result = response.json()
+        ok = True
+        return result
+    except (requests.RequestException, ValueError) as e:
+        raise CaptchaUnavailable(str(e)) from e
+    finally:
+        record_outbound('recaptcha', time.perf_counter() - start, ok)
+
+
+async def _asiteverify(token):
+    """
+    Async counterpart of _siteverify() for ASGI views.
+    Waits on the concurrency semaphore rather than opening unbounded connections.
+    """
+    client, semaphore = _get_async_client()
+    try:
+        async with semaphore:
+            start, ok = time.perf_counter(), False
+            try:
+                response = await client.post(settings.RECAPTCHA_VERIFY_URL, data=_payload(token))
+                result = response.json()
+                ok = True
+            finally:
+                record_outbound('recaptcha', time.perf_counter() - start, ok)
+        return result
+    except (httpx.HTTPError, ValueError) as e:
+        raise CaptchaUnavailable(str(e)) from e
+
+
+class CircuitBreaker:
+    """
+    Sliding-window circuit breaker around the siteverify call:
+    - closed: calls go through; outcomes from the last `window` seconds are kept.
+    - open: once at least `min_calls` were made and the share of failed or slow
+      (> `slow_call` seconds) calls reaches `failure_rate`; calls fail fast.
+    - half-open: after `reset_timeout` seconds a single trial call is let through;
+      its outcome closes or re-opens the circuit.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_rate, min_calls, window, reset_timeout, slow_call):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.slow_call = slow_call
+        self.state = self.CLOSED
+        self._outcomes = deque()  # (timestamp, ok)
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Return True if a call may go upstream now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record(self, ok, elapsed=0.0):
+        """Record the outcome of an upstream call; slow successes count as failures."""
+        ok = ok and elapsed <= self.slow_call
+        now = time.monotonic()
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+                if ok:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._trip(now)
+                return
+
+            self._outcomes.append((now, ok))
+            while self._outcomes and now - self._outcomes[0][0] > self.window:
+                self._outcomes.popleft()
+            failures = sum(1 for _, outcome in self._outcomes if not outcome)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+                self._trip(now)
+
+    def _trip(self, now):
+        if self.state != self.OPEN:
+            logger.warning("CAPTCHA circuit breaker opened")
+        self.state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+
+
+breaker = CircuitBreaker(
+    failure_rate=settings.RECAPTCHA_BREAKER_FAILURE_RATE,
+    min_calls=settings.RECAPTCHA_BREAKER_MIN_CALLS,
+    window=settings.RECAPTCHA_BREAKER_WINDOW,
+    reset_timeout=settings.RECAPTCHA_BREAKER_RESET_TIMEOUT,
+    slow_call=settings.RECAPTCHA_BREAKER_SLOW_CALL,
+)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+# Cache marker for a token whose verification is still in flight
+_PENDING = 'pending'
+_REPLAYED = {'success': False, 'error-codes': ['timeout-or-duplicate']}
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def captcha_stats():
+    """
+    Snapshot of verifier counters for this process:
+    cache_hits / cache_misses, replays_rejected, circuit_open (calls short-circuited),
+    upstream_errors, degraded (submissions let through by RECAPTCHA_DEGRADED_POLICY).
+    """
+    with _stats_lock:
+        snapshot = {name: _stats[name] for name in (
+            'cache_hits', 'cache_misses', 'replays_rejected', 'circuit_open', 'upstream_errors', 'degraded',
+        )}
+    snapshot['circuit_state'] = breaker.state
+    return snapshot
+
+
+def _cache_key(token):
+    # Tokens are long and user-supplied: key on a digest, never the raw value
+    return 'captcha:' + hashlib.sha256(token.encode()).hexdigest()
+
+
+def _cached_result(cached):
+    """
+    A token seen before is either replayed (pending or previously accepted) or
+    a known failure, which is returned as-is without asking upstream again.
+    """
+    _count('cache_hits')
+    record_cache('captcha', True)
+    if cached is None or cached == _PENDING or cached.get('success'):
+        _count('replays_rejected')
+        return _REPLAYED
+    return cached
+
+
+def _unavailable(reason):
+    """Apply RECAPTCHA_DEGRADED_POLICY when siteverify cannot be used."""
+    if settings.RECAPTCHA_DEGRADED_POLICY == 'allow':
+        _count('degraded')
+        logger.warning(f"CAPTCHA unavailable ({reason}), accepting submission per degraded policy")
+        return {'success': True, 'degraded': True}
+    raise CaptchaUnavailable(reason)
+
+
+def verify_captcha(token):
+    """
+    Verify a reCAPTCHA token (blocking), at most once per token:
+    - Replays within RECAPTCHA_CACHE_TTL are rejected without an upstream call.
+    - Upstream errors and an open circuit go through RECAPTCHA_DEGRADED_POLICY.
+    - If no verdict is reached (rejection or any exception) the token is released,
+      so the visitor's retry is verified instead of rejected as a replay.
+    Returns a siteverify-style dict; raises CaptchaUnavailable when rejecting.
+    """
+    key = _cache_key(token)
+    if not cache.add(key, _PENDING, settings.RECAPTCHA_CACHE_TTL):
+        return _cached_result(cache.get(key))
+    _count('cache_misses')
+    record_cache('captcha', False)
+
+    try:
+        if not breaker.allow_request():
+            _count('circuit_open')
+            result = _unavailable('circuit open')
+        else:
+            start, ok = time.monotonic(), False
+            try:
+                result = _siteverify(token)
+                ok = True
+            except CaptchaUnavailable as e:
+                _count('upstream_errors')
+                result = _unavailable(str(e))
+            finally:
+                # Any outcome, even an unexpected error or cancellation, ends a half-open trial
+                breaker.record(ok, time.monotonic() - start)
+    except BaseException:
+        cache.delete(key)  # Let the visitor retry the same token later
+        raise
+
+    cache.set(key, result, settings.RECAPTCHA_CACHE_TTL)
+    return result
+
+
+async def averify_captcha(token):
+    """
+    Async counterpart of verify_captcha() with the same cache and breaker.
+    """
+    key = _cache_key(token)
+    if not await cache.aadd(key, _PENDING, settings.RECAPTCHA_CACHE_TTL):
+        return _cached_result(await cache.aget(key))
+    _count('cache_misses')
+    record_cache('captcha', False)
+
+    try:
+        if not breaker.allow_request():
+            _count('circuit_open')
+            result = _unavailable('circuit open')
+        else:
+            start, ok = time.monotonic(), False
+            try:
+                result = await _asiteverify(token)
+                ok = True
+            except CaptchaUnavailable as e:
+                _count('upstream_errors')
+                result = _unavailable(str(e))
+            finally:
+                # Any outcome, even an unexpected error or cancellation, ends a half-open trial
+                breaker.record(ok, time.monotonic() - start)
+    except BaseException:
+        await cache.adelete(key)
+        raise
+
+    await cache.aset(key, result, settings.RECAPTCHA_CACHE_TTL)
+    return result
@@ -0,0 +1,54 @@
+# api/db_pool.py
+"""
+Database connection statistics for sizing the pool against the worker count:
+- Pool mode (DB_POOL): psycopg_pool counters for this process (size, idle,
+  waiting requests, wait time, errors).
+- Persistent mode: whether this worker holds a connection and how old it is.
+- Both: connections PostgreSQL currently sees for this database, by state,
+  which covers every worker process at once.
+"""
+import os
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def _server_connections(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT coalesce(state, 'unknown'), count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() GROUP BY 1"
+        )
+        by_state = dict(cursor.fetchall())
+        cursor.execute("SELECT current_setting('max_connections')::integer")
+        max_connections = cursor.fetchone()[0]
+    return {'byState': by_state, 'total': sum(by_state.values()), 'maxConnections': max_connections}
+
+
+def pool_stats(alias=DEFAULT_DB_ALIAS):
+    """Connection reuse settings and live counters for database `alias` in this process."""
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    pool_options = settings_dict['OPTIONS'].get('pool')
+    result = {
+        'alias': alias,
+        'pid': os.getpid(),
+        'healthChecks': settings_dict['CONN_HEALTH_CHECKS'],
+    }
+
+    if pool_options:
+        pool = connection.pool
+        result.update(mode='pool', config=pool_options if isinstance(pool_options, dict) else {}, stats=pool.get_stats())
+    else:
+        max_age = settings_dict['CONN_MAX_AGE']
+        age = None
+        if connection.connection is not None and connection.close_at is not None and max_age:
+            age = round(max_age - (connection.close_at - time.monotonic()), 1)
+        result.update(
+            mode='persistent' if max_age != 0 else 'per-request',
+            config={'connMaxAge': max_age},
+            stats={'connected': connection.connection is not None, 'connectionAgeSeconds': age},
+        )
+
+    result['server'] = _server_connections(connection)
+    return result
@@ -0,0 +1,117 @@
+# api/db_router.py
+"""
+Read-replica routing with read-your-writes stickiness:
+- ReplicaRoutingMiddleware marks each GET/HEAD/OPTIONS request as replica-eligible
+  (project, customer and communication lists, dashboards, reports, ...).
+- ReplicaRouter sends that request's ORM reads to one alias in DB_REPLICA_ALIASES,
+  picked at random once per request so all its reads see the same snapshot;
+  everything else (writes, unsafe methods, transactions, management commands,
+  background jobs) uses `default`.
+- Reads that fill caches keyed on write-time version counters (response cache,
+  stage registry) run inside primary_reads(): a lagging replica would otherwise
+  store pre-write data under the post-write version.
+- After a request writes (the router saw db_for_write, whatever the method) a
+  cookie pins the client's reads to the primary for DB_REPLICA_STICKY_SECONDS,
+  so replication lag never hides its own contact submission or stage change.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = 'db_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_routing = ContextVar('api_db_routing', default=None)
+
+
+class _RoutingState:
+    """Per-request routing decision; mutated by the router when it sees a write."""
+    def __init__(self, replica):
+        self.replica = replica  # Alias for every read of the request; None = primary
+        self.wrote = False
+        self.primary_only = 0  # Depth of primary_reads() blocks
+        self.replica_used = False
+
+
+def _is_pinned(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+@contextmanager
+def primary_reads():
+    """Route the current request's reads in this block to the primary."""
+    state = _routing.get()
+    if state is None:
+        yield
+        return
+    state.primary_only += 1
+    try:
+        yield
+    finally:
+        state.primary_only -= 1
+
+
+def replica_used():
+    """True when the current request has read anything from a replica."""
+    state = _routing.get()
+    return state is not None and state.replica_used
+
+
+class ReplicaRouter:
+    """
+    DATABASE_ROUTERS entry; a no-op (everything on `default`) when no replicas are configured.
+    """
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or state.replica is None or state.wrote or state.primary_only:
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction on the primary must see that transaction
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        state.replica_used = True
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Sets the routing decision for the request and refreshes the primary pin after writes.
+    Place it before any middleware that reads the database (sessions, auth).
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        replicas = settings.DB_REPLICA_ALIASES
+        eligible = replicas and request.method in SAFE_METHODS and not _is_pinned(request)
+        state = _RoutingState(random.choice(replicas) if eligible else None)
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+        # Only requests that wrote: read-only POSTs (search, recommendations) keep their replicas
+        if state.wrote and settings.DB_REPLICA_ALIASES:
+            window = settings.DB_REPLICA_STICKY_SECONDS
+            response.set_cookie(PIN_COOKIE, f"{time.time() + window:.0f}", max_age=window, httponly=True, samesite='Lax')
+        return response
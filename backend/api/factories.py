@@ -0,0 +1,147 @@
+# api/factories.py
+"""
+Bulk data factories for benchmarks and local load testing:
+- seed_crm() fills every CRM table with realistic, deterministic data using
+  batched bulk_create (no per-row signals or default-stage lookups).
+- Volumes are keyword arguments so tests can scale them down.
+"""
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .models import (
+    ChangeRequest, ClientProfile, Communication, ContactInquiry, Customer, Project, ProjectStage, Task,
+)
+
+TECHNOLOGIES = ['React', 'Django', 'Node.js', 'PostgreSQL', 'MongoDB', 'Tailwind CSS']
+WORDS = (
+    'platform dashboard migration analytics portal integration mobile checkout search '
+    'reporting workflow onboarding billing inventory booking api redesign automation'
+).split()
+
+
+def _sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _batched(model, objects, batch_size, keep=True):
+    """
+    bulk_create `objects` (any iterable) in batches.
+    Returns the created rows, or only their count with keep=False (large tables).
+    """
+    created, batch, count = [], [], 0
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            rows = model.objects.bulk_create(batch)
+            count += len(rows)
+            if keep:
+                created.extend(rows)
+            batch = []
+    if batch:
+        rows = model.objects.bulk_create(batch)
+        count += len(rows)
+        if keep:
+            created.extend(rows)
+    return created if keep else count
+
+
+def seed_crm(projects=10_000, tasks=100_000, communications=500_000, customers=5_000,
+             change_requests=20_000, inquiries=1_000, users=50, batch_size=5_000, seed=42):
+    """
+    Populate the database and return a dict of representative objects/ids
+    (`stage`, `project`, `customer`, `communication`, `user`, ...) for building URLs.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    stages = []
+    for order, (name, _) in enumerate(ProjectStage.STAGE_CHOICES):
+        stage, _ = ProjectStage.objects.get_or_create(name=name, defaults={'order': order})
+        stages.append(stage)
+
+    User = get_user_model()
+    user_rows = _batched(User, (
+        User(username=f'bench-user-{i}', email=f'bench-user-{i}@example.com') for i in range(users)
+    ), batch_size)
+
+    customer_rows = _batched(Customer, (
+        Customer(name=f'Customer {i}', email=f'customer-{i}@example.com', phone=f'+1555{i:07d}')
+        for i in range(customers)
+    ), batch_size)
+    _batched(ClientProfile, (
+        ClientProfile(
+            related_customer=customer,
+            company_size=rng.choice(['1-10', '11-50', '51-200', '201-500', '500+']),
+            industry=rng.choice(['Retail', 'Finance', 'Health', 'Education']),
+        )
+        for customer in customer_rows[::2]
+    ), batch_size)
+
+    project_rows = _batched(Project, (
+        Project(
+            title=f'Project {i}',
+            description=_sentence(rng, 40),
+            technologies=rng.sample(TECHNOLOGIES, rng.randint(1, 4)),
+            capabilities=_sentence(rng, 15),
+            current_stage=rng.choice(stages),
+            budget_used=Decimal(rng.randint(0, 100_000)),
+        )
+        for i in range(projects)
+    ), batch_size)
+    project_ids = [project.pk for project in project_rows]
+    customer_ids = [customer.pk for customer in customer_rows]
+    user_ids = [user.pk for user in user_rows]
+
+    _batched(Task, (
+        Task(
+            project_id=rng.choice(project_ids),
+            title=f'Task {i}',
+            description=_sentence(rng),
+            assignee_id=rng.choice(user_ids) if rng.random() < 0.8 else None,
+            due_date=(now + timedelta(days=rng.randint(-60, 60))).date(),
+            completed=rng.random() < 0.5,
+        )
+        for i in range(tasks)
+    ), batch_size, keep=False)
+
+    _batched(ChangeRequest, (
+        ChangeRequest(
+            project_id=rng.choice(project_ids),
+            requester_id=rng.choice(customer_ids),
+            description=_sentence(rng),
+            priority=rng.choice(ChangeRequest.PRIORITY_CHOICES)[0],
+            status=rng.choice(ChangeRequest.STATUS_CHOICES)[0],
+        )
+        for _ in range(change_requests)
+    ), batch_size, keep=False)
+
+    _batched(Communication, (
+        Communication(customer_id=rng.choice(customer_ids), type=rng.choice(['email', 'call', 'meeting']), notes=_sentence(rng))
+        for _ in range(communications)
+    ), batch_size, keep=False)
+
+    _batched(ContactInquiry, (
+        ContactInquiry(
+            full_name=f'Visitor {i}', company=f'Company {i}', email=f'visitor-{i}@example.com', phone='+15550000000',
+            project_type=rng.choice(ContactInquiry.PROJECT_TYPE_CHOICES)[0],
+            project_description=_sentence(rng, 30),
+            preferred_technologies=rng.sample(TECHNOLOGIES, 2),
+            budget_range=rng.choice(ContactInquiry.BUDGET_CHOICES)[0],
+            timeline='Three months',
+            communication_method=rng.choice(ContactInquiry.COMM_CHOICES)[0],
+            meeting_platform=rng.choice(ContactInquiry.PLATFORM_CHOICES)[0],
+        )
+        for i in range(inquiries)
+    ), batch_size, keep=False)
+
+    return {
+        'stage': stages[0],
+        'project': project_rows[0],
+        'customer': customer_rows[0],
+        'communication': Communication.objects.order_by('pk').first(),
+        'user': user_rows[0] if user_rows else None,
+    }
@@ -0,0 +1,131 @@
+# api/images.py
+"""
+Responsive variants of Project.image:
+- build_variants() decodes the upload once and writes each IMAGE_VARIANT_WIDTHS size
+  (never upscaled) in every available IMAGE_VARIANT_FORMATS format (AVIF, WebP).
+- File names carry a hash of the source bytes and the variant spec
+  (`images/variants/<hash>-medium.webp`): a re-upload gets new URLs, identical content
+  reuses existing files, and the files can be served with far-future cache headers.
+- Uploads are processed by the `process_project_image` background job, queued from
+  Project post_save (api/signals.py); `manage.py backfill_image_variants` processes
+  existing images across a process pool.
+- Project.image_variants records the source name and, per size, width/height and the
+  file per format; ProjectSerializer turns that into URLs and srcset strings.
+"""
+import hashlib
+import io
+import logging
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+from .jobs import enqueue
+from .models import Project
+from .response_cache import bump_version
+
+logger = logging.getLogger(__name__)
+
+PROCESS_JOB = 'process_project_image'
+VARIANT_DIR = 'images/variants'
+# Pillow format name, file extension, encoder options
+FORMATS = {
+    'avif': ('AVIF', 'avif', {'quality': 60, 'speed': 6}),
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+}
+
+
+def available_formats():
+    """IMAGE_VARIANT_FORMATS this Pillow build can encode, in preference order."""
+    return [name for name in settings.IMAGE_VARIANT_FORMATS if name in FORMATS and features.check(name)]
+
+
+def _source_digest(data, formats):
+    spec = repr((sorted(settings.IMAGE_VARIANT_WIDTHS.items()), formats)).encode()
+    return hashlib.sha256(spec + data).hexdigest()[:20]
+
+
+def _load(data):
+    image = Image.open(io.BytesIO(data))
+    image.draft('RGB', (max(settings.IMAGE_VARIANT_WIDTHS.values()),) * 2)  # JPEG: decode at reduced scale
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    return image
+
+
+def build_variants(name):
+    """
+    Write the variants of stored image `name`; returns the image_variants dict.
+    Safe to run repeatedly: existing variant files are reused.
+    """
+    with default_storage.open(name, 'rb') as source:
+        data = source.read()
+    formats = available_formats()
+    digest = _source_digest(data, formats)
+    image = _load(data)
+    width, height = image.size
+
+    sizes = {}
+    for size_name, target in sorted(settings.IMAGE_VARIANT_WIDTHS.items(), key=lambda item: item[1]):
+        target = min(target, width)
+        if any(entry['width'] == target for entry in sizes.values()):
+            continue  # Smaller original: don't store the same size twice
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS, reducing_gap=3.0,
+        )
+        entry = {'width': resized.width, 'height': resized.height}
+        for format_name in formats:
+            pil_format, extension, options = FORMATS[format_name]
+            path = posixpath.join(VARIANT_DIR, f"{digest}-{size_name}.{extension}")
+            if not default_storage.exists(path):
+                buffer = io.BytesIO()
+                resized.save(buffer, pil_format, **options)
+                saved = default_storage.save(path, ContentFile(buffer.getvalue()))
+                if saved != path:
+                    logger.warning(f"Variant stored as {saved} instead of {path}")
+                path = saved
+            entry[format_name] = path
+        sizes[size_name] = entry
+    return {'source': name, 'sizes': sizes}
+
+
+def needs_processing(project):
+    """True when the project has an image whose variants are missing or stale."""
+    return bool(project.image) and project.image_variants.get('source') != project.image.name
+
+
+def schedule_processing(project):
+    """Queue variant generation for a new image, or drop variants of a removed one."""
+    if needs_processing(project):
+        enqueue(PROCESS_JOB, {'project_id': project.pk, 'image': project.image.name})
+    elif not project.image and project.image_variants:
+        store_variants(project.pk, {})
+
+
+def store_variants(project_id, variants, expected_image=None):
+    """
+    Save variants without signals (no re-queue, no recommendation rebuild).
+    With `expected_image`, only if the project still has that image (it may have
+    been replaced while the variants were being built). Returns True when saved.
+    """
+    projects = Project.objects.filter(pk=project_id)
+    if expected_image is not None:
+        projects = projects.filter(image=expected_image)
+    saved = projects.update(image_variants=variants) > 0
+    if saved:
+        bump_version(Project)
+    return saved
+
+
+def process_project_image(project_id, image):
+    """Build and store variants for `image` of project `project_id`."""
+    if not Project.objects.filter(pk=project_id, image=image).exists():
+        return False  # Deleted or replaced since the job was queued
+    variants = build_variants(image)
+    saved = store_variants(project_id, variants, expected_image=image)
+    if saved:
+        logger.info(f"Stored {len(variants['sizes'])} image variants for project {project_id}")
+    return saved
@@ -0,0 +1,199 @@
+# api/jobs.py
+"""
+Database-backed background job queue:
+- `@job('name')` registers a handler; handlers live in api/tasks.py.
+- `enqueue()` inserts a BackgroundJob row inside the caller's transaction,
+  so a job only becomes visible once the data it refers to is committed.
+- Workers (`manage.py run_jobs`) claim rows with SELECT ... FOR UPDATE SKIP LOCKED
+  and retry failures with exponential backoff up to `max_attempts`.
+- A claim is only valid while `locked_at` is unchanged: the lock is renewed right
+  before each job of a batch runs, and outcomes are written only if it still holds,
+  so a job requeued by requeue_stale_jobs() is never run or recorded twice.
+"""
+import logging
+import random
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Handler registry: job name -> callable(**payload)
+_registry = {}
+
+
+def job(name):
+    """
+    Decorator registering a function as the handler for jobs called `name`.
+    The job payload is passed to the handler as keyword arguments.
+    """
+    def decorator(func):
+        if name in _registry and _registry[name] is not func:
+            raise ValueError(f"Job handler '{name}' is already registered")
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, *, delay=0, max_attempts=None):
+    """
+    Schedule job `name` with a JSON-serialisable `payload`.
+    - `delay` postpones the first attempt by that many seconds.
+    - With JOB_QUEUE_EAGER the job runs in-process once the surrounding
+      transaction commits (useful for development and tests).
+    """
+    if name not in _registry:
+        raise ValueError(f"Unknown job: {name}")
+
+    background_job = BackgroundJob.objects.create(
+        name=name,
+        payload=payload or {},
+        max_attempts=max_attempts or settings.JOB_QUEUE_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    if settings.JOB_QUEUE_EAGER:
+        transaction.on_commit(lambda: run_job(_mark_running(background_job)))
+    return background_job
+
+
+def backoff_seconds(attempt):
+    """Exponential backoff with jitter for the given (1-based) attempt number."""
+    delay = settings.JOB_QUEUE_BACKOFF_BASE * (2 ** (attempt - 1))
+    delay = min(delay, settings.JOB_QUEUE_BACKOFF_MAX)
+    return delay + random.uniform(0, delay / 10)
+
+
+def _mark_running(background_job, now=None):
+    """Flag a job as claimed by the current worker and count the attempt."""
+    background_job.status = BackgroundJob.STATUS_RUNNING
+    background_job.locked_at = now or timezone.now()
+    background_job.attempts += 1
+    background_job.save(update_fields=['status', 'locked_at', 'attempts', 'updated_at'])
+    return background_job
+
+
+def claim_jobs(limit=1):
+    """
+    Atomically claim up to `limit` due jobs for this worker.
+    SKIP LOCKED lets any number of workers poll the table without contention.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            BackgroundJob.objects.select_for_update(skip_locked=True)
+            .filter(status=BackgroundJob.STATUS_PENDING, run_after__lte=now)
+            .order_by('run_after', 'pk')[:limit]
+        )
+        for background_job in jobs:
+            _mark_running(background_job, now)
+    return jobs
+
+
+def _holding_lock(background_job):
+    """Rows still claimed by this worker: same `locked_at` as when claimed or renewed."""
+    return BackgroundJob.objects.filter(
+        pk=background_job.pk, status=BackgroundJob.STATUS_RUNNING, locked_at=background_job.locked_at,
+    )
+
+
+def renew_lock(background_job):
+    """
+    Restart the JOB_QUEUE_LOCK_TIMEOUT clock for a claimed job that is about to run.
+    Returns False when the job was requeued meanwhile (it is someone else's now).
+    """
+    now = timezone.now()
+    if not _holding_lock(background_job).update(locked_at=now, updated_at=now):
+        return False
+    background_job.locked_at = now
+    return True
+
+
+def run_job(background_job):
+    """
+    Execute a claimed job and record the outcome:
+    - success -> 'succeeded'
+    - failure -> rescheduled with backoff, or 'failed' once attempts are exhausted
+    The outcome is only saved while the claim still holds; returns the job.
+    """
+    handler = _registry.get(background_job.name)
+    label = f"{background_job.name} #{background_job.pk}"
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job '{background_job.name}'")
+        handler(**background_job.payload)
+    except Exception as e:
+        background_job.last_error = traceback.format_exc()
+        if background_job.attempts >= background_job.max_attempts:
+            background_job.status = BackgroundJob.STATUS_FAILED
+            logger.error(f"Job {label} failed permanently after {background_job.attempts} attempts: {str(e)}")
+        else:
+            delay = backoff_seconds(background_job.attempts)
+            background_job.status = BackgroundJob.STATUS_PENDING
+            background_job.run_after = timezone.now() + timedelta(seconds=delay)
+            logger.warning(f"Job {label} failed (attempt {background_job.attempts}), retrying in {delay:.1f}s: {str(e)}")
+    else:
+        background_job.status = BackgroundJob.STATUS_SUCCEEDED
+        background_job.last_error = ''
+        logger.info(f"Job {label} succeeded")
+
+    saved = _holding_lock(background_job).update(
+        status=background_job.status, run_after=background_job.run_after, locked_at=None,
+        last_error=background_job.last_error, updated_at=timezone.now(),
+    )
+    if not saved:
+        logger.warning(f"Job {label} was requeued while running; outcome not recorded")
+    background_job.locked_at = None
+    return background_job
+
+
+def requeue_stale_jobs():
+    """
+    Return jobs stuck in 'running' (e.g. the worker was killed) to the queue
+    once their lock is older than JOB_QUEUE_LOCK_TIMEOUT seconds.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.JOB_QUEUE_LOCK_TIMEOUT)
+    count = BackgroundJob.objects.filter(
+        status=BackgroundJob.STATUS_RUNNING, locked_at__lt=cutoff
+    ).update(status=BackgroundJob.STATUS_PENDING, locked_at=None, run_after=timezone.now())
+    if count:
+        logger.warning(f"Requeued {count} stale job(s)")
+    return count
+
+
+def work(batch_size=10, poll_interval=None, burst=False, should_stop=lambda: False):
+    """
+    Worker loop used by `manage.py run_jobs`.
+    - Claims and runs jobs in batches of `batch_size`.
+    - Sleeps `poll_interval` seconds when the queue is empty.
+    - With `burst=True` exits as soon as no due jobs remain.
+    Returns the number of jobs processed.
+    """
+    poll_interval = settings.JOB_QUEUE_POLL_INTERVAL if poll_interval is None else poll_interval
+    processed = 0
+    last_stale_check = 0.0
+    while not should_stop():
+        close_old_connections()
+        if time.monotonic() - last_stale_check > settings.JOB_QUEUE_LOCK_TIMEOUT:
+            requeue_stale_jobs()
+            last_stale_check = time.monotonic()
+
+        jobs = claim_jobs(batch_size)
+        for background_job in jobs:
+            # Earlier jobs of the batch may have outlasted the lock: re-check before running
+            if not renew_lock(background_job):
+                logger.warning(f"Skipping job {background_job.name} #{background_job.pk}: requeued by another worker")
+                continue
+            run_job(background_job)
+            processed += 1
+
+        if not jobs:
+            if burst:
+                break
+            time.sleep(poll_interval)
+    return processed
@@ -0,0 +1,226 @@
+# api/log.py
+"""
+Logging pipeline configured by settings.LOGGING:
+- QueueingStreamHandler only puts records on a bounded in-memory queue; a background
+  thread formats and writes them, so request threads never wait on stream I/O.
+  When the queue is full records are dropped (and counted) instead of blocking.
+- JsonFormatter emits one JSON object per line (time, level, logger, message, extra
+  fields, exception) for log shippers; TextFormatter keeps plain lines for local use.
+- Both formatters redact e-mail addresses, phone numbers, uploaded-file reprs and
+  sensitive `extra` keys (password, token, captcha, ...) before anything is written.
+- SamplingFilter keeps a fraction of INFO/DEBUG records for high-volume loggers
+  (`api.reads`, the per-call lines of read endpoints); warnings and errors are
+  always kept.
+Imported while settings are configured: no model or app-registry imports here.
+"""
+import copy
+import io
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import weakref
+from datetime import datetime, timezone
+
+from django.core.files import File
+from django.http import HttpRequest
+
+REDACTED = '[redacted]'
+SENSITIVE_KEYS = frozenset({
+    'password', 'token', 'captcha', 'secret', 'authorization', 'cookie', 'sessionid', 'csrftoken',
+    'email', 'phone', 'full_name',
+})
+_REDACTIONS = [
+    (re.compile(r'<(?:InMemory|Temporary)?UploadedFile: [^>]*>'), '<file>'),
+    (re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+'), '[email]'),
+    # 10-15 digits with single separators; timestamps and dates stay intact
+    (re.compile(r'(?<![\w:-])\+?\d(?:[ ().-]?\d){9,14}(?![\w:-])'), '[phone]'),
+]
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def redact(text):
+    """`text` with e-mail addresses, phone numbers and uploaded-file reprs masked."""
+    for pattern, replacement in _REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _redact_value(key, value):
+    if key.lower() in SENSITIVE_KEYS:
+        return REDACTED
+    if isinstance(value, str):
+        return redact(value)
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (File, io.IOBase)):
+        return '<file>'
+    if isinstance(value, HttpRequest):  # `request` extra of django.request records
+        return f"{value.method} {redact(value.path)}"
+    return redact(str(value))
+
+
+class TextFormatter(logging.Formatter):
+    """Plain `time level logger message` lines with redaction."""
+    def __init__(self, fmt='%(asctime)s %(levelname)s %(name)s %(message)s', **kwargs):
+        super().__init__(fmt, **kwargs)
+
+    def format(self, record):
+        return redact(super().format(record))
+
+
+class JsonFormatter(logging.Formatter):
+    """One redacted JSON object per record."""
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': redact(record.getMessage()),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = _redact_value(key, value)
+        if record.exc_info:
+            entry['exception'] = redact(self.formatException(record.exc_info))
+        elif record.exc_text:
+            entry['exception'] = redact(record.exc_text)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a `rate` fraction (0-1) of records below WARNING; kept records carry
+    `sample_rate` so counts derived from logs can be scaled back up.
+    """
+    def __init__(self, rate=1.0, name=''):
+        super().__init__(name)
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        if random.random() >= self.rate:
+            return False
+        record.sample_rate = self.rate
+        return True
+
+
+class _Listener(logging.handlers.QueueListener):
+    """Writer thread; reports records dropped on a full queue."""
+    def __init__(self, log_queue, target, owner):
+        super().__init__(log_queue, target, respect_handler_level=True)
+        self.owner = owner
+        self.reported = 0
+
+    def handle(self, record):
+        dropped = self.owner.dropped
+        if dropped > self.reported:
+            notice = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0, f"Log queue full, dropped {dropped - self.reported} record(s)", None, None,
+            )
+            self.reported = dropped
+            super().handle(notice)
+        super().handle(record)
+
+
+class QueueingStreamHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a background writer for `stream` (default stderr):
+    - The caller only renders the message (so later mutation of its arguments
+      cannot change it) and enqueues; formatting, redaction and I/O happen on
+      the writer thread with this handler's formatter.
+    - The writer starts on first use in each process, so it also runs in
+      workers forked after settings were loaded (run_jobs --processes).
+      Starting it is serialized by `_start_lock`; `_pid` is set only once the
+      queue and writer are in place, so concurrent first records wait for them.
+    """
+    def __init__(self, stream=None, queue_size=10_000):
+        super().__init__(queue.Queue(queue_size))
+        self.stream = stream
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        _handlers.add(self)
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():  # Started by another thread meanwhile
+                return
+            self.queue = queue.Queue(self.queue_size)  # Never share a queue with the parent process
+            target = logging.StreamHandler(self.stream or sys.stderr)
+            target.setFormatter(_FormatterProxy(self))
+            self._listener = _Listener(self.queue, target, self)
+            self._listener.start()  # Stopped (and drained) by close() from logging.shutdown()
+            self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Render the message now (on a copy: other handlers still get the original);
+        # leave formatting to the writer thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def flush(self):
+        """Wait until every queued record has been written (tests, shutdown)."""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener.start()
+
+    def close(self):
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+                self._listener = None
+                self._pid = None
+        super().close()
+
+
+# A fork can copy a `_start_lock` held by another thread; the child gets fresh ones
+_handlers = weakref.WeakSet()
+
+
+def _reset_start_locks():
+    for handler in list(_handlers):
+        handler._start_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_start_locks)
+
+
+class _FormatterProxy(logging.Formatter):
+    """Formats with the owning handler's current formatter (set later by dictConfig)."""
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+
+    def format(self, record):
+        return (self.handler.formatter or _default_formatter).format(record)
+
+
+_default_formatter = TextFormatter()
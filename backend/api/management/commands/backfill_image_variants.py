@@ -0,0 +1,59 @@
+# api/management/commands/backfill_image_variants.py
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.images import build_variants, store_variants
+from api.models import Project
+
+
+def _build(item):
+    """Pool worker: decode and resize one image (CPU-bound, no database access)."""
+    pk, name = item
+    try:
+        return pk, name, build_variants(name), None
+    except Exception as e:
+        return pk, name, None, str(e)
+
+
+class Command(BaseCommand):
+    """
+    Generates responsive variants for existing Project images:
+    - Images are decoded and encoded in `--processes` worker processes; the
+      parent only reads the project list and stores the results.
+    - Projects whose variants match their current image are skipped unless `--force`.
+    - New uploads are handled by the `process_project_image` job instead.
+    """
+    help = 'Build AVIF/WebP variants for existing Project images across a process pool.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count(), help='Worker processes (default: CPU count)')
+        parser.add_argument('--force', action='store_true', help='Rebuild variants that are already up to date')
+
+    def handle(self, *args, **options):
+        pending = [
+            (project.pk, project.image.name)
+            for project in Project.objects.exclude(image='').exclude(image__isnull=True).only('image', 'image_variants')
+            if options['force'] or project.image_variants.get('source') != project.image.name
+        ]
+        if not pending:
+            self.stdout.write(self.style.SUCCESS("All project images are up to date"))
+            return
+
+        start = time.perf_counter()
+        done = failed = 0
+        # Don't hand the parent's database connections to forked workers
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(max(1, options['processes'])) as pool:
+            for pk, name, variants, error in pool.imap_unordered(_build, pending):
+                if error is not None:
+                    failed += 1
+                    self.stderr.write(f"Project {pk} ({name}): {error}")
+                elif store_variants(pk, variants, expected_image=name):
+                    done += 1
+        seconds = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {done} of {len(pending)} images in {seconds:.1f}s ({failed} failed)"
+        ))
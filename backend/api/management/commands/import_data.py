@@ -0,0 +1,53 @@
+# api/management/commands/import_data.py
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from api.bulk import DATASETS, DEFAULT_BATCH_SIZE, FORMATS, BulkDataError, guess_format, import_rows
+
+
+class Command(BaseCommand):
+    """
+    Loads CSV/JSONL files written by `export_data` (or by hand) into a CRM table:
+    - `python manage.py import_data customers customers.csv`
+    - Rows are COPYed in batches and upserted on the dataset key (customer email,
+      inquiry id, or id when the file has an id column); `--on-conflict skip`
+      keeps existing rows instead of updating them.
+    - All or nothing: any invalid record aborts the import without changes.
+    """
+    help = 'Bulk-load projects, customers, communications, tasks or inquiries from CSV/JSONL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('path', help="Input file, or '-' for stdin (JSONL unless --format is given)")
+        parser.add_argument('--format', choices=FORMATS, default=None, help='Default: from the file extension')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows converted and COPYed per batch')
+        parser.add_argument('--on-conflict', choices=['update', 'skip'], default='update', help='Existing rows with the same key')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            if path == '-':
+                fmt, stream = options['format'] or 'jsonl', nullcontext(sys.stdin)
+            else:
+                fmt, stream = guess_format(path, options['format']), open(path, newline='', encoding='utf-8')
+        except (BulkDataError, OSError) as exc:
+            raise CommandError(exc)
+
+        progress = (lambda count: self.stderr.write(f"{count} rows...")) if options['verbosity'] > 1 else None
+        start = time.perf_counter()
+        try:
+            with stream as records:
+                count = import_rows(
+                    options['dataset'], records, fmt,
+                    batch_size=options['batch_size'], on_conflict=options['on_conflict'], progress=progress,
+                )
+        except (BulkDataError, DatabaseError) as exc:
+            raise CommandError(f"Import aborted, no rows were changed: {exc}")
+        seconds = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {count} {options['dataset']} in {seconds:.1f}s ({count / max(seconds, 1e-6):,.0f} rows/s)"
+        ))
@@ -0,0 +1,24 @@
+# api/management/commands/rebuild_recommendations.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.recommendations import rebuild_similarities
+
+
+class Command(BaseCommand):
+    """
+    Recomputes precomputed project recommendations synchronously:
+    - Suitable for cron or a deploy step; the same work also runs as the
+      `rebuild_project_similarities` background job after project edits.
+    """
+    help = 'Rebuild the top-K similar-project lists served by /api/recommend/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=None, help='Neighbours stored per project (default: RECOMMENDATIONS_TOP_K)')
+        parser.add_argument('--tech-weight', type=float, default=None, help='Weight of technology overlap vs capabilities text (0-1)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        pairs = rebuild_similarities(top_k=options['top_k'], tech_weight=options['tech_weight'])
+        self.stdout.write(self.style.SUCCESS(f"Stored {pairs} similar-project pairs in {time.perf_counter() - start:.1f}s"))
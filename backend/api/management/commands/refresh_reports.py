@@ -0,0 +1,28 @@
+# api/management/commands/refresh_reports.py
+from django.core.management.base import BaseCommand
+
+from api.reports import refresh_reports, schedule_refresh
+
+
+class Command(BaseCommand):
+    """
+    Refreshes the reporting materialized views behind /api/reports/ and /api/finances/:
+    - Without options the views are refreshed now (cron friendly).
+    - `--schedule` instead queues the self-rescheduling `refresh_reports` job,
+      so `run_jobs` workers keep the views fresh every REPORTS_REFRESH_INTERVAL seconds.
+    """
+    help = 'Refresh reporting materialized views, or start the scheduled refresh job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schedule', action='store_true', help='Queue the recurring refresh job and exit')
+        parser.add_argument('--blocking', action='store_true', help='Plain REFRESH (faster, but blocks readers)')
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            schedule_refresh(delay=0)
+            self.stdout.write(self.style.SUCCESS("Scheduled the recurring report refresh job"))
+            return
+        timings = refresh_reports(concurrently=not options['blocking'])
+        for table, seconds in timings.items():
+            self.stdout.write(f"{table:<36} {seconds * 1000:8.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {len(timings)} reporting views"))
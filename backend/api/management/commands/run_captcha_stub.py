@@ -0,0 +1,62 @@
+# api/management/commands/run_captcha_stub.py
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Runs a local stand-in for Google's siteverify endpoint so the contact
+    endpoints can be load-tested offline:
+    - Set RECAPTCHA_VERIFY_URL=http://127.0.0.1:<port>/siteverify for the backend.
+    - `--latency` simulates upstream response time, `--fail-rate` the share of
+      tokens rejected, and any token equal to 'invalid' is always rejected.
+    """
+    help = 'Serve a stub reCAPTCHA siteverify endpoint for offline testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8099)
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before answering')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of requests answered with success=false')
+
+    def handle(self, *args, **options):
+        latency = options['latency']
+        fail_rate = options['fail_rate']
+
+        class SiteVerifyHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real endpoint
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode()
+                if latency:
+                    time.sleep(latency)
+                success = 'response=invalid' not in body and random.random() >= fail_rate
+                result = {'success': success}
+                if not success:
+                    result['error-codes'] = ['invalid-input-response']
+                encoded = json.dumps(result).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format, *args):
+                pass  # Keep load tests quiet
+
+        server = ThreadingHTTPServer((options['host'], options['port']), SiteVerifyHandler)
+        server.daemon_threads = True
+        self.stdout.write(self.style.SUCCESS(
+            f"CAPTCHA stub listening on http://{options['host']}:{options['port']}/siteverify"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
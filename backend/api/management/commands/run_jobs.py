@@ -0,0 +1,74 @@
+# api/management/commands/run_jobs.py
+import logging
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api import jobs
+
+logger = logging.getLogger(__name__)
+
+
+def _worker(batch_size, poll_interval, burst):
+    """Entry point for each worker process; stops cleanly on SIGTERM/SIGINT."""
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stopping.set())
+    signal.signal(signal.SIGINT, lambda *args: stopping.set())
+    try:
+        return jobs.work(
+            batch_size=batch_size,
+            poll_interval=poll_interval,
+            burst=burst,
+            should_stop=stopping.is_set,
+        )
+    finally:
+        # Forked workers exit without atexit hooks: drain the background log writer
+        logging.shutdown()
+
+
+class Command(BaseCommand):
+    """
+    Runs background job workers:
+    - `python manage.py run_jobs` polls forever in a single process.
+    - `--processes N` forks N independent workers sharing the queue.
+    - `--burst` drains due jobs and exits (cron / CI friendly).
+    """
+    help = 'Process queued background jobs (confirmation emails, post-processing).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes')
+        parser.add_argument('--batch-size', type=int, default=10, help='Jobs claimed per poll')
+        parser.add_argument('--poll-interval', type=float, default=None, help='Seconds to sleep when idle')
+        parser.add_argument('--burst', action='store_true', help='Exit once no due jobs remain')
+
+    def handle(self, *args, **options):
+        worker_args = (options['batch_size'], options['poll_interval'], options['burst'])
+        processes = max(1, options['processes'])
+
+        if processes == 1:
+            processed = _worker(*worker_args)
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)"))
+            return
+
+        # Children must open their own DB connections rather than share the parent's socket
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=_worker, args=worker_args, name=f'run_jobs-{i}')
+            for i in range(processes)
+        ]
+        for process in workers:
+            process.start()
+        logger.info(f"Started {processes} job worker processes")
+
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            for process in workers:
+                process.terminate()
+            for process in workers:
+                process.join()
+        self.stdout.write(self.style.SUCCESS(f"{processes} worker(s) stopped"))
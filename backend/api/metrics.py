@@ -0,0 +1,217 @@
+# api/metrics.py
+"""
+In-process metrics registry with Prometheus text exposition (GET /metrics):
+- MetricsMiddleware records, per route template and method: requests by status
+  class, latency, response size, SQL queries and SQL time per request.
+- Cache hit/miss counters (response cache, conditional GETs, cached users, CAPTCHA
+  verdicts) and outbound HTTP timings (reCAPTCHA siteverify) are recorded where they happen.
+- Recording is lock-free: each thread updates its own shard of plain lists, and a
+  scrape sums the shards. Shards of exited threads are folded into one retired
+  total, so thread-per-request servers do not grow the shard list. Histogram
+  buckets are fixed up front, and series are found by a (route, method) tuple
+  key; no label dicts are built per request.
+- /metrics needs METRICS_TOKEN or a METRICS_ALLOWED_IPS entry (empty by default).
+- Values are per process; with several workers each scrape sees one worker, so label
+  targets per worker (or scrape each worker's port) when running more than one.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from django.db import connections
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+STATUS_CLASSES = ('1xx', '2xx', '3xx', '4xx', '5xx')
+METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+class Family:
+    """
+    One metric name with a fixed label schema. Each thread writes its own
+    {label tuple: values} shard; `collect()` merges the shards.
+    - counter: values = [total]
+    - histogram: values = [bucket counts..., +Inf count, sum]
+    """
+    def __init__(self, name, help_text, kind, labelnames, buckets=None):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.width = len(buckets) + 2 if kind == 'histogram' else 1
+        self._local = threading.local()
+        self._shards = []  # (writing thread, shard)
+        self._retired = {}  # Merged shards of threads that have exited
+        self._shards_lock = threading.Lock()  # Only taken on a thread's first write and by collect()
+
+    def _retire_dead_shards(self):
+        """Fold the shards of exited threads into `_retired` (caller holds the lock)."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            for labels, values in shard.items():
+                total = self._retired.setdefault(labels, [0] * self.width)
+                for i, value in enumerate(values):
+                    total[i] += value
+        self._shards = live
+
+    def series(self, labels):
+        """This thread's value list for `labels` (a tuple in labelnames order)."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                # Short-lived threads (thread-per-request servers) would otherwise grow the list
+                self._retire_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+        values = shard.get(labels)
+        if values is None:
+            values = shard[labels] = [0] * self.width
+        return values
+
+    def inc(self, labels, amount=1):
+        self.series(labels)[0] += amount
+
+    def observe(self, labels, value):
+        values = self.series(labels)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def collect(self):
+        """{labels: merged values} across every thread."""
+        with self._shards_lock:
+            self._retire_dead_shards()
+            merged = {labels: list(values) for labels, values in self._retired.items()}
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for labels, values in list(shard.items()):
+                total = merged.setdefault(labels, [0] * self.width)
+                for i, value in enumerate(values):
+                    total[i] += value
+        return merged
+
+    def reset(self):
+        with self._shards_lock:
+            self._retired.clear()
+            for _, shard in self._shards:
+                shard.clear()
+
+
+REQUESTS = Family('http_requests_total', 'HTTP requests by route, method and status class.', 'counter', ('route', 'method', 'status'))
+LATENCY = Family('http_request_duration_seconds', 'Time spent in Django per request.', 'histogram', ('route', 'method'), LATENCY_BUCKETS)
+RESPONSE_SIZE = Family('http_response_size_bytes', 'Response body size (streamed responses excluded).', 'histogram', ('route', 'method'), SIZE_BUCKETS)
+DB_QUERIES = Family('http_request_db_queries', 'SQL queries executed per request.', 'histogram', ('route', 'method'), QUERY_BUCKETS)
+DB_SECONDS = Family('http_request_db_seconds_total', 'Time spent executing SQL, summed over requests.', 'counter', ('route', 'method'))
+CACHE = Family('cache_requests_total', 'Cache lookups by cache and result (hit/miss).', 'counter', ('cache', 'result'))
+OUTBOUND = Family('outbound_request_duration_seconds', 'Outbound HTTP calls by service and outcome.', 'histogram', ('service', 'outcome'), LATENCY_BUCKETS)
+
+FAMILIES = (REQUESTS, LATENCY, RESPONSE_SIZE, DB_QUERIES, DB_SECONDS, CACHE, OUTBOUND)
+
+
+def record_cache(cache, hit):
+    """Count one lookup in cache `cache` ('response', 'auth_user', ...)."""
+    CACHE.inc((cache, 'hit' if hit else 'miss'))
+
+
+def record_outbound(service, seconds, ok):
+    """Record an outbound HTTP call to `service` that took `seconds`."""
+    OUTBOUND.observe((service, 'ok' if ok else 'error'), seconds)
+
+
+class _QueryTimer:
+    """Database execute wrapper counting queries and SQL time for one request."""
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Records request metrics under the matched URL pattern (e.g. `api/projects/<int:pk>/`),
+    so label cardinality is bounded by the URLconf. Place it first in MIDDLEWARE.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = _QueryTimer()
+        wrapper_lists = [connections[alias].execute_wrappers for alias in connections]
+        for wrappers in wrapper_lists:
+            wrappers.append(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            for wrappers in wrapper_lists:
+                wrappers.remove(timer)
+
+        match = getattr(request, 'resolver_match', None)
+        labels = (match.route if match is not None else UNMATCHED_ROUTE,
+                  request.method if request.method in METHODS else 'OTHER')
+        REQUESTS.inc(labels + (STATUS_CLASSES[min(max(response.status_code // 100, 1), 5) - 1],))
+        LATENCY.observe(labels, elapsed)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(labels, len(response.content))
+        DB_QUERIES.observe(labels, timer.count)
+        DB_SECONDS.inc(labels, timer.seconds)
+        return response
+
+
+# ---------- Exposition -----------------------------------------------
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """All families in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for family in FAMILIES:
+        lines.append(f'# HELP {family.name} {family.help_text}')
+        lines.append(f'# TYPE {family.name} {family.kind}')
+        for labels, values in sorted(family.collect().items()):
+            if family.kind == 'counter':
+                lines.append(f'{family.name}{_labels(family.labelnames, labels)} {_number(values[0])}')
+                continue
+            cumulative = 0
+            for bound, count in zip(family.buckets + ('+Inf',), values[:-1]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == '+Inf' else f'le="{_number(bound)}"'
+                lines.append(f'{family.name}_bucket{_labels(family.labelnames, labels, le)} {cumulative}')
+            lines.append(f'{family.name}_sum{_labels(family.labelnames, labels)} {_number(values[-1])}')
+            lines.append(f'{family.name}_count{_labels(family.labelnames, labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    """Zero every metric (tests)."""
+    for family in FAMILIES:
+        family.reset()
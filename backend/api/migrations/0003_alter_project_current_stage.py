@@ -13,12 +13,13 @@ class Migration(migrations.Migration):
                 id serial primary key,
                 name varchar(50) not null,
                 description text,
-                order integer not null
+                "order" integer not null
             );
             
             -- Now insert the proposal stage if it doesn't exist
-            INSERT INTO api_projectstage (name, order) VALUES ('proposal', 0)
-            ON CONFLICT (name) DO NOTHING;
+            INSERT INTO api_projectstage (name, description, "order")
+            SELECT 'proposal', '', 0
+            WHERE NOT EXISTS (SELECT 1 FROM api_projectstage WHERE name = 'proposal');
             
             -- Finally update existing projects to use the proposal stage ID
             UPDATE api_project 
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:58
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# BEFORE INSERT/UPDATE triggers keep search_vector in sync for every write path,
+# including bulk_create(), QuerySet.update() and raw SQL. Keep the weights and
+# the 'english' config in step with api/search.py.
+PROJECT_TRIGGER_SQL = """
+CREATE FUNCTION api_project_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(array_to_string(NEW.technologies, ' '), '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.capabilities, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER api_project_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, technologies, capabilities, description, search_vector
+    ON api_project
+    FOR EACH ROW EXECUTE FUNCTION api_project_search_vector_update();
+
+UPDATE api_project SET title = title;
+"""
+
+INQUIRY_TRIGGER_SQL = """
+CREATE FUNCTION api_contactinquiry_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.full_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.company, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.email, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.project_description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER api_contactinquiry_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF full_name, company, email, project_description, search_vector
+    ON api_contactinquiry
+    FOR EACH ROW EXECUTE FUNCTION api_contactinquiry_search_vector_update();
+
+UPDATE api_contactinquiry SET full_name = full_name;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_project_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactinquiry',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='contactinquiry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='api_inquiry_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='api_project_search_idx'),
+        ),
+        migrations.RunSQL(
+            PROJECT_TRIGGER_SQL,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS api_project_search_vector_trigger ON api_project;
+            DROP FUNCTION IF EXISTS api_project_search_vector_update();
+            """,
+        ),
+        migrations.RunSQL(
+            INQUIRY_TRIGGER_SQL,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS api_contactinquiry_search_vector_trigger ON api_contactinquiry;
+            DROP FUNCTION IF EXISTS api_contactinquiry_search_vector_update();
+            """,
+        ),
+    ]
@@ -0,0 +1,145 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:01
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+# Statement-level triggers keep api_technologyfacet in step with the array columns.
+# Each statement's transition tables are reduced to one signed delta per technology
+# (rows are counted once even if an array repeats a name), then applied in name order
+# so concurrent writers lock facet rows in the same order.
+FACET_FUNCTIONS_SQL = """
+CREATE FUNCTION api_techfacet_apply(src text, added text[], removed text[]) RETURNS void AS $$
+DECLARE
+    d record;
+BEGIN
+    FOR d IN
+        SELECT name, sum(n)::integer AS n FROM (
+            SELECT unnest(added) AS name, 1 AS n
+            UNION ALL
+            SELECT unnest(removed), -1
+        ) changes
+        WHERE name IS NOT NULL
+        GROUP BY name HAVING sum(n) <> 0
+        ORDER BY name
+    LOOP
+        UPDATE api_technologyfacet SET count = GREATEST(count + d.n, 0)
+        WHERE source = src AND name = d.name;
+        IF NOT FOUND AND d.n > 0 THEN
+            INSERT INTO api_technologyfacet (source, name, count) VALUES (src, d.name, d.n)
+            ON CONFLICT (source, name) DO UPDATE SET count = api_technologyfacet.count + EXCLUDED.count;
+        END IF;
+    END LOOP;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION api_project_techfacet_update() RETURNS trigger AS $$
+DECLARE
+    added text[] := '{}';
+    removed text[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        added := ARRAY(SELECT t FROM new_rows, LATERAL (SELECT DISTINCT unnest(new_rows.technologies) AS t) x);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        removed := ARRAY(SELECT t FROM old_rows, LATERAL (SELECT DISTINCT unnest(old_rows.technologies) AS t) x);
+    END IF;
+    PERFORM api_techfacet_apply('project', added, removed);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION api_contactinquiry_techfacet_update() RETURNS trigger AS $$
+DECLARE
+    added text[] := '{}';
+    removed text[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        added := ARRAY(SELECT t FROM new_rows, LATERAL (SELECT DISTINCT unnest(new_rows.preferred_technologies) AS t) x);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        removed := ARRAY(SELECT t FROM old_rows, LATERAL (SELECT DISTINCT unnest(old_rows.preferred_technologies) AS t) x);
+    END IF;
+    PERFORM api_techfacet_apply('inquiry', added, removed);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+def _triggers_sql(table, function):
+    return f"""
+    CREATE TRIGGER {table}_techfacet_insert AFTER INSERT ON {table}
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+    CREATE TRIGGER {table}_techfacet_update AFTER UPDATE ON {table}
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+    CREATE TRIGGER {table}_techfacet_delete AFTER DELETE ON {table}
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+    """
+
+
+def _drop_triggers_sql(table):
+    return ''.join(
+        f"DROP TRIGGER IF EXISTS {table}_techfacet_{event} ON {table};"
+        for event in ('insert', 'update', 'delete')
+    )
+
+
+BACKFILL_SQL = """
+INSERT INTO api_technologyfacet (source, name, count)
+SELECT 'project', t, count(*) FROM api_project, LATERAL (SELECT DISTINCT unnest(technologies) AS t) x
+WHERE t IS NOT NULL GROUP BY t;
+INSERT INTO api_technologyfacet (source, name, count)
+SELECT 'inquiry', t, count(*) FROM api_contactinquiry, LATERAL (SELECT DISTINCT unnest(preferred_technologies) AS t) x
+WHERE t IS NOT NULL GROUP BY t;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_search_vectors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TechnologyFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('project', 'Projects'), ('inquiry', 'Contact inquiries')], max_length=20)),
+                ('name', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='contactinquiry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['preferred_technologies'], name='api_inquiry_tech_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['technologies'], name='api_project_tech_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='technologyfacet',
+            constraint=models.UniqueConstraint(fields=('source', 'name'), name='api_techfacet_source_name_uniq'),
+        ),
+        migrations.RunSQL(
+            FACET_FUNCTIONS_SQL,
+            reverse_sql="""
+            DROP FUNCTION IF EXISTS api_project_techfacet_update();
+            DROP FUNCTION IF EXISTS api_contactinquiry_techfacet_update();
+            DROP FUNCTION IF EXISTS api_techfacet_apply(text, text[], text[]);
+            """,
+        ),
+        migrations.RunSQL(
+            _triggers_sql('api_project', 'api_project_techfacet_update'),
+            reverse_sql=_drop_triggers_sql('api_project'),
+        ),
+        migrations.RunSQL(
+            _triggers_sql('api_contactinquiry', 'api_contactinquiry_techfacet_update'),
+            reverse_sql=_drop_triggers_sql('api_contactinquiry'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_technology_facets'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.project')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='api.project')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('project', 'neighbour'), name='api_projsim_pair_uniq')],
+            },
+        ),
+    ]
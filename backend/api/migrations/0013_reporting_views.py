@@ -0,0 +1,149 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:08
+
+from django.db import migrations, models
+
+# Each view has a unique index so api/reports.py can REFRESH ... CONCURRENTLY
+# (readers keep the old rows while the new ones are computed).
+VIEWS = {
+    'api_report_budget_by_stage': (
+        """
+        SELECT coalesce(s.id, 0) AS stage_id,
+               coalesce(s.name, 'unassigned') AS stage,
+               coalesce(s."order", 999) AS stage_order,
+               count(*)::integer AS projects,
+               coalesce(sum(p.budget_used), 0)::numeric(14, 2) AS budget_used,
+               now() AS refreshed_at
+        FROM api_project p LEFT JOIN api_projectstage s ON s.id = p.current_stage_id
+        GROUP BY 1, 2, 3
+        """,
+        'stage_id',
+    ),
+    'api_report_tasks_weekly': (
+        """
+        SELECT date_trunc('week', updated_at)::date AS week,
+               count(*)::integer AS completed,
+               now() AS refreshed_at
+        FROM api_task WHERE completed
+        GROUP BY 1
+        """,
+        'week',
+    ),
+    'api_report_change_requests': (
+        """
+        SELECT priority || ':' || status AS key, priority, status,
+               count(*)::integer AS count,
+               now() AS refreshed_at
+        FROM api_changerequest
+        GROUP BY priority, status
+        """,
+        'key',
+    ),
+    'api_report_inquiries_by_budget': (
+        """
+        SELECT budget_range, count(*)::integer AS count, now() AS refreshed_at
+        FROM api_contactinquiry
+        GROUP BY budget_range
+        """,
+        'budget_range',
+    ),
+    'api_report_monthly_budget': (
+        """
+        SELECT date_trunc('month', created_at)::date AS month,
+               count(*)::integer AS projects,
+               coalesce(sum(budget_used), 0)::numeric(14, 2) AS budget_used,
+               now() AS refreshed_at
+        FROM api_project
+        GROUP BY 1
+        """,
+        'month',
+    ),
+}
+
+
+def _create_views_sql():
+    return ''.join(
+        f"CREATE MATERIALIZED VIEW {name} AS {query} WITH DATA;"
+        f"CREATE UNIQUE INDEX {name}_pk ON {name} ({key});"
+        for name, (query, key) in VIEWS.items()
+    )
+
+
+def _drop_views_sql():
+    return ''.join(f"DROP MATERIALIZED VIEW IF EXISTS {name};" for name in VIEWS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_project_similarity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BudgetByStageReport',
+            fields=[
+                ('stage_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('stage', models.CharField(max_length=50)),
+                ('stage_order', models.IntegerField()),
+                ('projects', models.IntegerField()),
+                ('budget_used', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'api_report_budget_by_stage',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeRequestReport',
+            fields=[
+                ('key', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('priority', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField()),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'api_report_change_requests',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='InquiryBudgetReport',
+            fields=[
+                ('budget_range', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('count', models.IntegerField()),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'api_report_inquiries_by_budget',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyBudgetReport',
+            fields=[
+                ('month', models.DateField(primary_key=True, serialize=False)),
+                ('projects', models.IntegerField()),
+                ('budget_used', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'api_report_monthly_budget',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyTaskReport',
+            fields=[
+                ('week', models.DateField(primary_key=True, serialize=False)),
+                ('completed', models.IntegerField()),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'api_report_tasks_weekly',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(_create_views_sql(), reverse_sql=_drop_views_sql()),
+    ]
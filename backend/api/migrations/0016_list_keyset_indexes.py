@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_project_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='communication',
+            index=models.Index(fields=['date', 'id'], name='api_comm_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['created_at', 'id'], name='api_customer_created_id_idx'),
+        ),
+    ]
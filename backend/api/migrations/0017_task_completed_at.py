@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:03
+
+from django.db import migrations, models
+
+# Row trigger keeping api_task.completed_at in step with `completed` on every write
+# path (Task.save() applies the same rule to the instance; bulk imports and
+# queryset updates only go through the trigger).
+COMPLETED_AT_SQL = """
+CREATE FUNCTION api_task_completed_at_update() RETURNS trigger AS $$
+BEGIN
+    IF NOT NEW.completed THEN
+        NEW.completed_at := NULL;
+    ELSIF NEW.completed_at IS NULL THEN
+        NEW.completed_at := now();
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER api_task_completed_at BEFORE INSERT OR UPDATE OF completed, completed_at ON api_task
+    FOR EACH ROW EXECUTE FUNCTION api_task_completed_at_update();
+"""
+
+DROP_COMPLETED_AT_SQL = """
+DROP TRIGGER IF EXISTS api_task_completed_at ON api_task;
+DROP FUNCTION IF EXISTS api_task_completed_at_update();
+"""
+
+# Tasks completed before this migration never recorded when; their last update is
+# the closest value available (exact for tasks not edited after completion).
+BACKFILL_SQL = "UPDATE api_task SET completed_at = updated_at WHERE completed;"
+
+
+def _weekly_view_sql(column):
+    return f"""
+    DROP MATERIALIZED VIEW IF EXISTS api_report_tasks_weekly;
+    CREATE MATERIALIZED VIEW api_report_tasks_weekly AS
+        SELECT date_trunc('week', {column})::date AS week,
+               count(*)::integer AS completed,
+               now() AS refreshed_at
+        FROM api_task WHERE completed
+        GROUP BY 1
+    WITH DATA;
+    CREATE UNIQUE INDEX api_report_tasks_weekly_pk ON api_report_tasks_weekly (week);
+    """
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_list_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(COMPLETED_AT_SQL, reverse_sql=DROP_COMPLETED_AT_SQL),
+        # Tasks completed per week by completion time, not by last edit
+        migrations.RunSQL(_weekly_view_sql('completed_at'), reverse_sql=_weekly_view_sql('updated_at')),
+    ]
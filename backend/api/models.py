@@ -1,6 +1,8 @@
 # api/models.py
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 from django.conf import settings   # for AUTH_USER_MODEL
 import uuid
@@ -31,11 +33,18 @@ class ProjectStage(models.Model):
 # ---------- 2.  Helper callable (placed *after* ProjectStage) -------
 
 def get_default_stage_id():
-    """Return PK of the 'proposal' stage; fallback = 1."""
-    try:
-        return ProjectStage.objects.get(name='proposal').id
-    except ProjectStage.DoesNotExist:
-        return 1
+    """Return PK of the 'proposal' stage; fallback = 1. Served from the stage registry (api/stages.py)."""
+    from .stages import default_stage_id
+    return default_stage_id()
+
+
+class DeferSearchVectorManager(models.Manager):
+    """
+    Default manager for models with a trigger-maintained `search_vector`:
+    the tsvector is only read inside SQL (api/search.py), so it is never loaded.
+    """
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
 
 
 # ---------- 3.  All other models ------------------------------------
@@ -47,6 +56,12 @@ class Customer(models.Model):
     address = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of /api/customers/ (api/pagination.py)
+            models.Index(fields=['created_at', 'id'], name='api_customer_created_id_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -85,6 +100,8 @@ class Project(models.Model):
     title       = models.CharField(max_length=200)
     description = models.TextField()
     image       = models.ImageField(upload_to='images/', blank=True, null=True)
+    # Resized AVIF/WebP copies of `image`, written by the process_project_image job (api/images.py)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     link        = models.URLField(blank=True)
     technologies = ArrayField(models.CharField(max_length=100), blank=True, default=list)
     capabilities = models.TextField(blank=True)
@@ -101,6 +118,21 @@ class Project(models.Model):
     budget_used          = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     estimated_completion = models.DateField(null=True, blank=True)
 
+    # Weighted full-text document (title/technologies A, capabilities B, description C),
+    # maintained by a database trigger (migration 0010)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = DeferSearchVectorManager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order for ProjectListView (api/pagination.py)
+            models.Index(fields=['created_at', 'id'], name='api_project_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='api_project_search_idx'),
+            # technologies__contains / __overlap filters (ProjectListView)
+            GinIndex(fields=['technologies'], name='api_project_tech_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -115,12 +147,23 @@ class Task(models.Model):
     assignee    = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     due_date    = models.DateField(null=True, blank=True)
     completed   = models.BooleanField(default=False)
+    # Set when `completed` turns true, cleared when it turns false; maintained by a
+    # database trigger (migration 0017) so bulk imports and queryset updates keep it too
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at  = models.DateTimeField(auto_now_add=True)
     updated_at  = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.title} ({'Completed' if self.completed else 'Pending'})"
 
+    def save(self, *args, **kwargs):
+        # Same rule as the trigger, so the instance (and API responses) see the value
+        if not self.completed:
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = timezone.now()
+        super().save(*args, **kwargs)
+
 
 class ChangeRequest(models.Model):
     """
@@ -165,6 +208,12 @@ class Communication(models.Model):
     notes    = models.TextField(blank=True)
     date     = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of /api/communications/ (api/pagination.py)
+            models.Index(fields=['date', 'id'], name='api_comm_date_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.type} with {self.customer.name} on {self.date}"
 
@@ -218,5 +267,212 @@ class ContactInquiry(models.Model):
 
     created_at = models.DateTimeField(default=timezone.now)
 
+    # Full-text document for admin search (name/company/email A, description B),
+    # maintained by a database trigger (migration 0010)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = DeferSearchVectorManager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='api_inquiry_search_idx'),
+            GinIndex(fields=['preferred_technologies'], name='api_inquiry_tech_idx'),
+        ]
+
+    def __str__(self):
+        return f"Inquiry {self.inquiry_id} by {self.full_name}"
+
+# ---------- 4.  Background job queue --------------------------------
+
+class BackgroundJob(models.Model):
+    """
+    Durable unit of work processed outside the request cycle.
+    Rows are written in the caller's transaction and claimed by
+    `manage.py run_jobs` workers (see api/jobs.py).
+    """
+    STATUS_PENDING   = 'pending'
+    STATUS_RUNNING   = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED    = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING,   'Pending'),
+        (STATUS_RUNNING,   'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED,    'Failed'),
+    ]
+
+    name         = models.CharField(max_length=100)
+    payload      = models.JSONField(default=dict, blank=True)
+    status       = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts     = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after    = models.DateTimeField(default=timezone.now)
+    locked_at    = models.DateTimeField(null=True, blank=True)
+    last_error   = models.TextField(blank=True)
+    created_at   = models.DateTimeField(auto_now_add=True)
+    updated_at   = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='api_job_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+# ---------- 5.  Technology facet counts ----------------------------
+
+class TechnologyFacet(models.Model):
+    """
+    Number of rows mentioning each technology, per source table.
+    Maintained incrementally by database triggers on Project.technologies and
+    ContactInquiry.preferred_technologies (migration 0011), so facet counts
+    are a primary-key read instead of an unnest() over every row.
+    """
+    SOURCE_PROJECT = 'project'
+    SOURCE_INQUIRY = 'inquiry'
+    SOURCE_CHOICES = [
+        (SOURCE_PROJECT, 'Projects'),
+        (SOURCE_INQUIRY, 'Contact inquiries'),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    name   = models.CharField(max_length=100)
+    count  = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'name'], name='api_techfacet_source_name_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.count})"
+
+
+# ---------- 6.  Precomputed recommendations ------------------------
+
+class ProjectSimilarity(models.Model):
+    """
+    Top-K most similar projects for each project, rebuilt offline by the
+    `rebuild_project_similarities` job (api/recommendations.py).
+    /api/recommend/ only reads these rows; it never computes similarity.
+    """
+    project   = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='neighbours')
+    neighbour = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    score     = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'neighbour'], name='api_projsim_pair_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} -> {self.neighbour_id} ({self.score:.3f})"
+
+
+# ---------- 7.  Reporting (materialized views) ---------------------
+# Read-only, pre-aggregated rows for /api/reports/ and /api/finances/.
+# The views are created in migration 0013 and refreshed concurrently by
+# api/reports.py; `refreshed_at` is the time of the last refresh.
+
+class BudgetByStageReport(models.Model):
+    stage_id     = models.IntegerField(primary_key=True)  # 0 = no stage
+    stage        = models.CharField(max_length=50)
+    stage_order  = models.IntegerField()
+    projects     = models.IntegerField()
+    budget_used  = models.DecimalField(max_digits=14, decimal_places=2)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'api_report_budget_by_stage'
+
+
+class WeeklyTaskReport(models.Model):
+    week         = models.DateField(primary_key=True)
+    completed    = models.IntegerField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'api_report_tasks_weekly'
+
+
+class ChangeRequestReport(models.Model):
+    key          = models.CharField(max_length=50, primary_key=True)  # "<priority>:<status>"
+    priority     = models.CharField(max_length=20)
+    status       = models.CharField(max_length=20)
+    count        = models.IntegerField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'api_report_change_requests'
+
+
+class InquiryBudgetReport(models.Model):
+    budget_range = models.CharField(max_length=50, primary_key=True)
+    count        = models.IntegerField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'api_report_inquiries_by_budget'
+
+
+class MonthlyBudgetReport(models.Model):
+    month        = models.DateField(primary_key=True)
+    projects     = models.IntegerField()
+    budget_used  = models.DecimalField(max_digits=14, decimal_places=2)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'api_report_monthly_budget'
+
+
+# ---------- 8.  Diagnostics (api/profiling.py) ----------------------
+
+class RequestProfile(models.Model):
+    """
+    Sampling-profiler capture of one request, requested by a staff user
+    with the `X-Profile: 1` header or `?_profile=1`.
+    """
+    created_at    = models.DateTimeField(auto_now_add=True, db_index=True)
+    user          = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    method        = models.CharField(max_length=10)
+    path          = models.CharField(max_length=500)
+    view_name     = models.CharField(max_length=200, blank=True)
+    status_code   = models.PositiveSmallIntegerField()
+    duration_ms   = models.FloatField()
+    query_count   = models.PositiveIntegerField()
+    sql_ms        = models.FloatField()
+    samples       = models.PositiveIntegerField()
+    summary       = models.TextField(blank=True)        # Top functions by inclusive/self samples
+    folded_stacks = models.TextField(blank=True)        # "frame;frame;frame count" lines (flamegraph.pl, speedscope)
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class SlowQuery(models.Model):
+    """
+    SQL statement slower than SLOW_QUERY_MS, with its EXPLAIN (ANALYZE, BUFFERS) plan
+    and the view that issued it.
+    """
+    created_at  = models.DateTimeField(auto_now_add=True, db_index=True)
+    view_name   = models.CharField(max_length=200, blank=True)
+    method      = models.CharField(max_length=10)
+    path        = models.CharField(max_length=500)
+    alias       = models.CharField(max_length=50)
+    duration_ms = models.FloatField()
+    sql         = models.TextField()
+    params      = models.TextField(blank=True)
+    plan        = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name_plural = 'slow queries'
+
     def __str__(self):
-        return f"Inquiry {self.inquiry_id} by {self.full_name}"
\ No newline at end of file
+        return f"{self.view_name or self.path}: {self.duration_ms:.0f} ms"
@@ -0,0 +1,53 @@
+# api/pagination.py
+"""
+Keyset (cursor) pagination over (created_at, id), or (<field>, id) for another
+indexed timestamp. Each page is a single index range scan starting at the cursor, so fetching page
+N costs the same as page 1 regardless of table size (unlike OFFSET).
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 12
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(obj, field='created_at'):
+    """Opaque cursor pointing just after `obj`."""
+    raw = f"{getattr(obj, field).isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor(); raises ValueError for malformed cursors."""
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def parse_page_size(value):
+    """Clamp a `limit` query param to 1..MAX_PAGE_SIZE; raises ValueError if not an int."""
+    if value in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(value), MAX_PAGE_SIZE))
+
+
+def keyset_page(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE, field='created_at'):
+    """
+    Return (rows, next_cursor) for the page after `cursor`:
+    - Rows are ordered by (`field`, id); `next_cursor` is None on the last page.
+    - The `field >= ...` bound is what lets PostgreSQL start the (`field`, id)
+      index scan at the cursor instead of filtering from the start.
+    """
+    queryset = queryset.order_by(field, 'id')
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        queryset = queryset.filter(**{f'{field}__gte': value}).filter(
+            Q(**{f'{field}__gt': value}) | Q(id__gt=pk)
+        )
+    rows = list(queryset[:page_size + 1])
+    next_cursor = encode_cursor(rows[page_size - 1], field) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
@@ -0,0 +1,224 @@
+# api/profiling.py
+"""
+On-demand request profiling and slow-query capture (browsable in the admin):
+- A staff user sending `X-Profile: 1` (or `?_profile=1`) gets the request run under
+  SamplingProfiler: a background thread samples the request thread's stack every
+  PROFILING_INTERVAL seconds. The result is stored as a RequestProfile (top functions
+  plus folded stacks for flamegraph.pl / speedscope) and its id is returned in the
+  `X-Profile-Id` response header.
+- Every request's SQL is timed; statements slower than SLOW_QUERY_MS are recorded with
+  the view that issued them. Once the response has been sent, SELECTs are re-run under
+  EXPLAIN (ANALYZE, BUFFERS) in a rolled-back transaction and stored as SlowQuery rows.
+  A statement is captured at most once per SLOW_QUERY_COOLDOWN seconds per process,
+  so a slow endpoint under load does not have its queries run twice on every call.
+- Captures are written with an explicit `using`, bypassing the replica router, so they
+  never pin the client to the primary.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .log import redact
+from .models import RequestProfile, SlowQuery
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_PARAM = '_profile'
+SUMMARY_LIMIT = 40
+MAX_SLOW_PER_REQUEST = 5
+_COOLDOWN_MAX_ENTRIES = 1_000
+
+_last_captured = {}  # SQL text -> time.monotonic() of its last capture
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for one thread: counts how often each call stack is seen.
+    Overhead is confined to the sampler thread (one stack walk per interval).
+    """
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._labels = {}
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopping.set()
+        self._thread.join()
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    def folded(self):
+        """Collapsed stacks, one `root;...;leaf count` line per distinct stack."""
+        return '\n'.join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common())
+
+    def summary(self, limit=SUMMARY_LIMIT):
+        """Functions with the most samples: inclusive (on the stack) and self (leaf)."""
+        inclusive, own = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            for label in set(stack):
+                inclusive[label] += count
+            own[stack[-1]] += count
+        total = self.samples or 1
+        lines = [f"{'incl %':>7} {'self %':>7}  function"]
+        for label, count in inclusive.most_common(limit):
+            lines.append(f"{100 * count / total:7.1f} {100 * own[label] / total:7.1f}  {label}")
+        return '\n'.join(lines)
+
+
+class _SqlRecorder:
+    """Execute wrapper: query count, SQL time, and statements over the slow threshold."""
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.count = 0
+        self.seconds = 0.0
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.seconds += elapsed
+            if self.threshold and elapsed >= self.threshold and not many and len(self.slow) < MAX_SLOW_PER_REQUEST:
+                self.slow.append((context['connection'].alias, sql, params, elapsed))
+
+
+def view_name(request):
+    """Class (or function) name of the view that handled `request`, e.g. 'TaskListView'."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return ''
+    func = match.func
+    view_class = getattr(func, 'view_class', None) or getattr(func, 'cls', None)
+    return getattr(view_class, '__name__', None) or getattr(func, '__name__', '')
+
+
+def _due_for_capture(sql):
+    now = time.monotonic()
+    last = _last_captured.get(sql)
+    if last is not None and now - last < settings.SLOW_QUERY_COOLDOWN:
+        return False
+    if len(_last_captured) >= _COOLDOWN_MAX_ENTRIES:
+        _last_captured.clear()
+    _last_captured[sql] = now
+    return True
+
+
+def explain(alias, sql, params):
+    """EXPLAIN (ANALYZE, BUFFERS) output for a SELECT, run in a rolled-back transaction."""
+    with transaction.atomic(using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        transaction.set_rollback(True, using=alias)
+    return plan
+
+
+def store_slow_queries(slow, view, method, path):
+    """Explain (SELECTs only) and save captured statements; never raises."""
+    rows = []
+    for alias, sql, params, elapsed in slow:
+        if not _due_for_capture(sql):
+            continue
+        plan = ''
+        if sql.lstrip()[:6].upper() == 'SELECT':
+            try:
+                plan = explain(alias, sql, params)
+            except Exception as e:
+                plan = f"EXPLAIN failed: {e}"
+        rows.append(SlowQuery(
+            view_name=view, method=method, path=path[:500], alias=alias, duration_ms=elapsed * 1000,
+            sql=sql, params=redact(repr(params)) if params else '', plan=plan,
+        ))
+    if rows:
+        try:
+            SlowQuery.objects.using(DEFAULT_DB_ALIAS).bulk_create(rows)
+            logger.warning(f"Captured {len(rows)} slow quer{'y' if len(rows) == 1 else 'ies'} in {view or path}")
+        except Exception as e:
+            logger.error(f"Failed to store slow queries: {str(e)}")
+
+
+def _profile_requested(request):
+    if request.headers.get(PROFILE_HEADER) != '1' and request.GET.get(PROFILE_PARAM) != '1':
+        return False
+    return request.user.is_authenticated and request.user.is_staff
+
+
+class ProfilingMiddleware:
+    """
+    Slow-query capture for every request, and sampling profiles on staff request.
+    Place it after AuthenticationMiddleware (it checks request.user.is_staff).
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = _SqlRecorder(settings.SLOW_QUERY_MS / 1000)
+        wrapper_lists = [connections[alias].execute_wrappers for alias in connections]
+        for wrappers in wrapper_lists:
+            wrappers.append(recorder)
+        profiler = None
+        start = time.perf_counter()
+        try:
+            if _profile_requested(request):
+                with SamplingProfiler(threading.get_ident(), settings.PROFILING_INTERVAL) as profiler:
+                    response = self.get_response(request)
+            else:
+                response = self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            for wrappers in wrapper_lists:
+                wrappers.remove(recorder)
+
+        if profiler is not None:
+            profile = RequestProfile.objects.using(DEFAULT_DB_ALIAS).create(
+                user=request.user, method=request.method, path=request.get_full_path()[:500],
+                view_name=view_name(request), status_code=response.status_code,
+                duration_ms=elapsed * 1000, query_count=recorder.count, sql_ms=recorder.seconds * 1000,
+                samples=profiler.samples, summary=profiler.summary(), folded_stacks=profiler.folded(),
+            )
+            response['X-Profile-Id'] = str(profile.pk)
+        if recorder.slow:
+            # After the body has been sent: EXPLAIN ANALYZE re-runs the statement
+            slow, view, method, path = recorder.slow, view_name(request), request.method, request.path
+            close = response.close
+
+            def close_and_capture():
+                try:
+                    store_slow_queries(slow, view, method, path)
+                finally:
+                    close()
+            response.close = close_and_capture  # The server calls close() once the body is out
+        return response
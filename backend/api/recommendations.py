@@ -0,0 +1,195 @@
+# api/recommendations.py
+"""
+Precomputed project-to-project recommendations:
+- Offline: rebuild_similarities() builds sparse feature matrices for every project
+  (binary technologies, TF-IDF over capabilities), scores all pairs with vectorised
+  sparse products in row chunks, and stores the top-K neighbours per project in
+  ProjectSimilarity. Runs as the `rebuild_project_similarities` background job
+  (scheduled after project edits) or `manage.py rebuild_recommendations`.
+- Online: recommend() reads the stored neighbour lists of the visitor's viewed
+  projects in one query and merges them; cost depends on K and the number of
+  viewed projects, not on the size of the catalogue.
+- score = TECH_WEIGHT * Jaccard(technologies) + (1 - TECH_WEIGHT) * cosine(TF-IDF capabilities)
+"""
+import logging
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from scipy import sparse
+
+from .jobs import enqueue
+from .models import BackgroundJob, Project, ProjectSimilarity
+
+logger = logging.getLogger(__name__)
+
+REBUILD_JOB = 'rebuild_project_similarities'
+MAX_VIEWED = 20        # Only the most recently viewed projects are merged
+CHUNK_SIZE = 256       # Rows scored per dense block (CHUNK_SIZE x projects floats)
+INSERT_BATCH_SIZE = 5_000
+
+_TOKEN_RE = re.compile(r'[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]')
+_VIEWED_RE = re.compile(r'(?:^|/projects/)(\d+)/?$')
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in into is it its of on or that the this to with we our you your'.split()
+)
+
+
+def _tokens(text):
+    return [token for token in _TOKEN_RE.findall((text or '').lower()) if token not in STOP_WORDS]
+
+
+def _l2_normalise(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def technology_matrix(technology_lists):
+    """Binary CSR matrix (projects x technologies); names are matched case-insensitively."""
+    vocabulary, rows, cols = {}, [], []
+    for i, names in enumerate(technology_lists):
+        for name in {name.strip().lower() for name in names or [] if name and name.strip()}:
+            rows.append(i)
+            cols.append(vocabulary.setdefault(name, len(vocabulary)))
+    return sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(len(technology_lists), len(vocabulary)),
+    )
+
+
+def tfidf_matrix(documents):
+    """L2-normalised TF-IDF CSR matrix (documents x terms) with sublinear term frequency."""
+    vocabulary, rows, cols, values = {}, [], [], []
+    for i, document in enumerate(documents):
+        for term, count in Counter(_tokens(document)).items():
+            rows.append(i)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            values.append(1.0 + np.log(count))
+    matrix = sparse.csr_matrix((values, (rows, cols)), shape=(len(documents), len(vocabulary)))
+    document_frequency = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = np.log((1 + matrix.shape[0]) / (1 + document_frequency)) + 1.0
+    return _l2_normalise(matrix @ sparse.diags(idf)).tocsr()
+
+
+def top_neighbours(ids, technology_lists, documents, top_k, tech_weight, chunk_size=CHUNK_SIZE):
+    """
+    Yield (project_id, neighbour_id, score) for each project's `top_k` best-scoring
+    neighbours (score > 0), best first. Memory is bounded by chunk_size x len(ids).
+    """
+    n = len(ids)
+    k = min(top_k, n - 1)
+    if k <= 0:
+        return
+    ids = np.asarray(ids)
+    tech = technology_matrix(technology_lists)
+    sizes = np.asarray(tech.sum(axis=1)).ravel()
+    text = tfidf_matrix(documents)
+
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        # sparse (all rows) @ dense (chunk rows): the products are dense anyway, and this
+        # avoids building sparse results entry by entry
+        intersection = (tech @ tech[start:end].toarray().T).T
+        union = sizes[start:end, None] + sizes[None, :] - intersection
+        jaccard = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+        cosine = (text @ text[start:end].toarray().T).T
+        scores = tech_weight * jaccard + (1.0 - tech_weight) * cosine
+        scores[np.arange(end - start), np.arange(start, end)] = 0.0  # Never recommend a project to itself
+
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        for offset, columns in enumerate(best):
+            row_scores = scores[offset, columns]
+            for position in np.argsort(-row_scores):
+                if row_scores[position] <= 0:
+                    break
+                yield int(ids[start + offset]), int(ids[columns[position]]), float(row_scores[position])
+
+
+def rebuild_similarities(top_k=None, tech_weight=None):
+    """
+    Recompute every project's neighbour list and swap it in atomically.
+    Readers keep seeing the previous lists until the transaction commits.
+    Returns the number of stored pairs.
+    """
+    top_k = top_k or settings.RECOMMENDATIONS_TOP_K
+    tech_weight = settings.RECOMMENDATIONS_TECH_WEIGHT if tech_weight is None else tech_weight
+
+    ids, technology_lists, documents = [], [], []
+    for pk, technologies, capabilities in Project.objects.order_by('pk').values_list('pk', 'technologies', 'capabilities').iterator(chunk_size=5_000):
+        ids.append(pk)
+        technology_lists.append(technologies)
+        documents.append(capabilities)
+
+    pairs = [
+        ProjectSimilarity(project_id=project_id, neighbour_id=neighbour_id, score=score)
+        for project_id, neighbour_id, score in top_neighbours(ids, technology_lists, documents, top_k, tech_weight)
+    ]
+    with transaction.atomic():
+        # Plain DELETE: QuerySet.delete() would fetch every row to send post_delete signals
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {connection.ops.quote_name(ProjectSimilarity._meta.db_table)}")
+        ProjectSimilarity.objects.bulk_create(pairs, batch_size=INSERT_BATCH_SIZE)
+    logger.info(f"Rebuilt project similarities: {len(pairs)} pairs for {len(ids)} projects (top {top_k})")
+    return len(pairs)
+
+
+def schedule_rebuild():
+    """
+    Queue a delayed rebuild unless one is already pending, so a burst of
+    project edits results in a single batch run.
+    """
+    pending = BackgroundJob.objects.filter(name=REBUILD_JOB, status=BackgroundJob.STATUS_PENDING).exists()
+    if not pending:
+        enqueue(REBUILD_JOB, delay=settings.RECOMMENDATIONS_REBUILD_DELAY)
+
+
+def parse_viewed(values):
+    """
+    Project ids from the frontend's viewed list (ids or paths like '/projects/12'),
+    most recent last, de-duplicated and capped at MAX_VIEWED.
+    """
+    ids = []
+    for value in values if isinstance(values, list) else []:
+        match = _VIEWED_RE.search(str(value).strip())
+        if match:
+            pk = int(match.group(1))
+            if pk in ids:
+                ids.remove(pk)
+            ids.append(pk)
+    return ids[-MAX_VIEWED:]
+
+
+def recommend(viewed_ids, limit=6):
+    """
+    Merge the stored neighbour lists of `viewed_ids` into a ranked list of
+    {'id', 'title', 'score', 'reason'} dicts, excluding projects already viewed.
+    """
+    if not viewed_ids:
+        return []
+    rows = (
+        ProjectSimilarity.objects.filter(project_id__in=viewed_ids)
+        .select_related('project', 'neighbour')
+        .only('score', 'project__title', 'neighbour__title')
+    )
+    viewed = set(viewed_ids)
+    totals = defaultdict(float)
+    best_source = {}
+    for row in rows:
+        if row.neighbour_id in viewed:
+            continue
+        totals[row.neighbour_id] += row.score
+        if row.neighbour_id not in best_source or row.score > best_source[row.neighbour_id][0]:
+            best_source[row.neighbour_id] = (row.score, row.project.title, row.neighbour.title)
+
+    ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [
+        {
+            'id': pk,
+            'title': best_source[pk][2],
+            'score': round(total, 4),
+            'reason': f"Similar to {best_source[pk][1]}",
+        }
+        for pk, total in ranked
+    ]
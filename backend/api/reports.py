@@ -0,0 +1,61 @@
+# api/reports.py
+"""
+Reporting layer over PostgreSQL materialized views (migration 0013):
+- Dashboards (/api/reports/, /api/finances/) read a handful of pre-aggregated
+  rows instead of aggregating projects, tasks and change requests per request.
+  Tasks are counted in the week of Task.completed_at (migration 0017).
+- refresh_reports() runs REFRESH MATERIALIZED VIEW CONCURRENTLY, so readers keep
+  seeing the previous rows until each view is swapped, then bumps the response
+  cache versions so ETags change with the data.
+- The `refresh_reports` job re-schedules itself every REPORTS_REFRESH_INTERVAL
+  seconds; start the cycle with `manage.py refresh_reports --schedule`
+  (or run the command from cron instead).
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .jobs import enqueue
+from .models import (
+    BackgroundJob, BudgetByStageReport, ChangeRequestReport, InquiryBudgetReport, MonthlyBudgetReport,
+    WeeklyTaskReport,
+)
+from .response_cache import bump_version
+
+logger = logging.getLogger(__name__)
+
+REFRESH_JOB = 'refresh_reports'
+REPORT_MODELS = (BudgetByStageReport, WeeklyTaskReport, ChangeRequestReport, InquiryBudgetReport, MonthlyBudgetReport)
+
+
+def refresh_reports(concurrently=True):
+    """
+    Refresh every reporting view; returns {view name: seconds taken}.
+    `concurrently=False` is faster but blocks readers while it runs.
+    """
+    timings = {}
+    mode = 'CONCURRENTLY ' if concurrently else ''
+    with connection.cursor() as cursor:
+        for model in REPORT_MODELS:
+            table = model._meta.db_table
+            start = time.perf_counter()
+            cursor.execute(f"REFRESH MATERIALIZED VIEW {mode}{connection.ops.quote_name(table)}")
+            timings[table] = time.perf_counter() - start
+            bump_version(model)
+    logger.info(f"Refreshed {len(timings)} reporting views in {sum(timings.values()):.2f}s")
+    return timings
+
+
+def schedule_refresh(delay=None):
+    """
+    Queue the next refresh unless one is already pending. A transaction-scoped
+    advisory lock serializes the check and the insert, so concurrent callers
+    (two workers finishing refreshes, a cron run) queue one job between them.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [REFRESH_JOB])
+        pending = BackgroundJob.objects.filter(name=REFRESH_JOB, status=BackgroundJob.STATUS_PENDING).exists()
+        if not pending:
+            enqueue(REFRESH_JOB, delay=settings.REPORTS_REFRESH_INTERVAL if delay is None else delay)
@@ -0,0 +1,174 @@
+# api/response_cache.py
+"""
+Model-versioned HTTP caching for read endpoints:
+- Each model has a version counter and a last-modified timestamp in the cache,
+  bumped by post_save/post_delete signals (api/signals.py) once the write commits.
+- ConditionalGetMixin derives strong ETags and Last-Modified from those counters and
+  answers If-None-Match / If-Modified-Since with 304 before the view queries or
+  serializes anything.
+- VersionedCacheMixin additionally stores rendered response bytes under the same
+  versions, so an edit makes old entries unreachable without explicit deletes.
+- Use a shared backend (Redis, Memcached, database) via CACHE_BACKEND when running
+  several worker processes. With local memory each process keeps its own counters;
+  they expire after API_CACHE_TIMEOUT, which bounds how long another worker can
+  serve stale data.
+- Cached bodies are rebuilt from the primary, and validators are withheld from bodies
+  read on a replica within DB_REPLICA_STICKY_SECONDS of a change (api/db_router.py):
+  replication lag must not put pre-write data under a post-write ETag.
+- Note: QuerySet.update()/bulk_create() do not send signals; call bump_version() after them.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .db_router import primary_reads, replica_used
+from .metrics import record_cache
+
+
+def _cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _version_key(model):
+    return f'apiver:{model._meta.label_lower}'
+
+
+def _modified_key(model):
+    return f'apimod:{model._meta.label_lower}'
+
+
+def get_versions(models):
+    """
+    Current (version, last_modified) pairs for `models`; one cache round-trip when set.
+    Missing counters are seeded from the clock, so an evicted or expired counter
+    never reuses an old version.
+    """
+    cache = _cache()
+    keys = [key for model in models for key in (_version_key(model), _modified_key(model))]
+    found = cache.get_many(keys)
+    result = []
+    for model in models:
+        version_key, modified_key = _version_key(model), _modified_key(model)
+        if version_key not in found or modified_key not in found:
+            now = time.time()
+            cache.add(version_key, int(now * 1000), settings.API_CACHE_TIMEOUT)
+            cache.add(modified_key, now, settings.API_CACHE_TIMEOUT)
+            found[version_key] = cache.get(version_key)
+            found[modified_key] = cache.get(modified_key, now)
+        result.append((found[version_key], found[modified_key]))
+    return result
+
+
+def bump_version(model):
+    """Invalidate every cached response and validator that depends on `model`."""
+    cache = _cache()
+    now = time.time()
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        cache.set(_version_key(model), int(now * 1000), settings.API_CACHE_TIMEOUT)
+    cache.set(_modified_key(model), now, settings.API_CACHE_TIMEOUT)
+
+
+class ConditionalGetMixin:
+    """
+    APIView mixin adding ETag / Last-Modified validators to GET responses:
+    - `cache_models`: models whose changes alter the response.
+    - Validators are checked after authentication and permissions, so protected
+      endpoints never answer 304 to anonymous users.
+    - A matching If-None-Match or If-Modified-Since returns 304 without running the view.
+    """
+    cache_models = ()
+
+    def get_validators(self, request):
+        """Return (etag, last_modified) for this request, computed once per request."""
+        if not hasattr(request, '_api_validators'):
+            versions = get_versions(self.cache_models)
+            raw = '|'.join([
+                request.get_full_path(),
+                request.META.get('HTTP_ACCEPT', ''),
+                *(str(version) for version, _ in versions),
+            ])
+            etag = '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+            last_modified = int(max((modified for _, modified in versions), default=time.time()))
+            request._api_validators = (etag, last_modified)
+        return request._api_validators
+
+    def set_validators(self, request, response):
+        etag, last_modified = self.get_validators(request)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method == 'GET' and self.cache_models:
+            etag, last_modified = self.get_validators(request)
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            record_cache('conditional_get', not_modified is not None)
+            if not_modified is not None:
+                raise _NotModified(self.set_validators(request, not_modified))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def may_be_stale(self, request):
+        """True when the body came from a replica that may not have the latest change yet."""
+        if not replica_used():
+            return False
+        _, last_modified = self.get_validators(request)
+        return time.time() - last_modified <= settings.DB_REPLICA_STICKY_SECONDS + 1
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method == 'GET' and self.cache_models and response.status_code == 200 and not self.may_be_stale(request):
+            self.set_validators(request, response)
+        return response
+
+
+class _NotModified(Exception):
+    """Carries a 304/412 response out of APIView.initial()."""
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class VersionedCacheMixin(ConditionalGetMixin):
+    """
+    ConditionalGetMixin plus a cache of rendered GET responses keyed by the ETag:
+    - Only 200 responses are cached. Hits (and 304s) bypass DRF entirely, without
+      auth/permission checks, so only use this on public, user-independent views.
+    """
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET':
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(request)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        record_cache('conditional_get', not_modified is not None)
+        if not_modified is not None:
+            return self.set_validators(request, not_modified)
+
+        cache = _cache()
+        key = 'apiresp:' + etag.strip('"')
+        cached = cache.get(key)
+        record_cache('response', cached is not None)
+        if cached is not None:
+            content, content_type = cached
+            return self.set_validators(request, HttpResponse(content, content_type=content_type))
+
+        # The body is stored under the current versions: build it from the primary
+        with primary_reads():
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            if hasattr(response, 'render'):
+                response.render()
+            cache.set(key, (response.content, response['Content-Type']), settings.API_CACHE_TIMEOUT)
+        return response
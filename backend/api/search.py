@@ -0,0 +1,57 @@
+# api/search.py
+"""
+PostgreSQL full-text search over trigger-maintained `search_vector` columns:
+- Free text is turned into a prefix tsquery ("djan ecom" -> 'djan':* & 'ecom':*),
+  so results appear while the user is still typing.
+- Matching uses the GIN index on search_vector; only matching rows are ranked
+  (ts_rank with A > B > C weights), never the whole table.
+- Ranking is capped at RANK_CANDIDATES matches, so a one-letter query that matches
+  most of the table costs the same as a specific one (ranking is then approximate).
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+SEARCH_CONFIG = 'english'  # Must match the triggers in migration 0010
+MAX_TERMS = 8
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+RANK_CANDIDATES = 500
+
+_TERM_RE = re.compile(r'\w+')
+
+
+def build_search_query(text):
+    """
+    Prefix-matching SearchQuery for free text, or None if it has no searchable words.
+    Only word characters reach to_tsquery(), so user input cannot produce a tsquery syntax error.
+    """
+    terms = _TERM_RE.findall(text or '')[:MAX_TERMS]
+    if not terms:
+        return None
+    raw = ' & '.join(f"{term}:*" for term in terms)
+    return SearchQuery(raw, search_type='raw', config=SEARCH_CONFIG)
+
+
+def full_text_filter(queryset, text):
+    """Filter `queryset` to rows matching `text`; an empty query matches nothing."""
+    query = build_search_query(text)
+    if query is None:
+        return queryset.none()
+    return queryset.filter(search_vector=query)
+
+
+def ranked_search(queryset, text, limit=DEFAULT_LIMIT):
+    """
+    Top `limit` rows matching `text`, best first, annotated with `rank`.
+    """
+    query = build_search_query(text)
+    if query is None:
+        return queryset.none()
+    candidates = queryset.filter(search_vector=query).values('pk')[:RANK_CANDIDATES]
+    return (
+        queryset.filter(pk__in=candidates)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', '-created_at')[:limit]
+    )
@@ -0,0 +1,135 @@
+# api/sendfile.py
+"""
+Delivery of stored files after a permission check in Django:
+- SENDFILE_BACKEND='nginx': an empty response with `X-Accel-Redirect: SENDFILE_URL + name`;
+  nginx serves the file from an `internal` location (Range, keep-alive, slow clients
+  included), so the worker is free as soon as the headers are written.
+- SENDFILE_BACKEND='xsendfile': `X-Sendfile: <absolute path>` for Apache mod_xsendfile
+  and lighttpd.
+- Otherwise (development) a FileResponse. Under a WSGI server with a file wrapper
+  (gunicorn) the bytes go out with sendfile(2) instead of through Python; a single
+  `Range: bytes=a-b` is answered with 206 Partial Content, so PDF viewers can seek.
+- serve_public_media() is the DEBUG /media/ server; it refuses the protected
+  inquiry document directory, which is only reachable through the permission check.
+"""
+import io
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.http import content_disposition_header
+from django.views.static import serve
+
+from .uploads import INQUIRY_DOC_DIR
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _FileRange(io.RawIOBase):
+    """
+    `length` bytes of `file` starting at `start`. Keeps fileno(), so a WSGI file
+    wrapper can sendfile() the range from the current offset (bounded by Content-Length).
+    """
+    def __init__(self, file, start, length):
+        super().__init__()
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single-range `Range` header; None to send the whole
+    file (no header, multiple or malformed ranges); ValueError when unsatisfiable.
+    """
+    match = _RANGE.match(header or '')
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:  # Suffix range: the last N bytes
+        if int(last) == 0:
+            raise ValueError(header)
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _file_response(request, name, filename, content_type):
+    file = default_storage.open(name, 'rb')
+    size = default_storage.size(name)
+    try:
+        byte_range = parse_range(request.headers.get('Range'), size)
+    except ValueError:
+        file.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(file, as_attachment=True, filename=filename, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            _FileRange(file, start, end - start + 1), status=206,
+            as_attachment=True, filename=filename, content_type=content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def sendfile(request, name, filename=None, content_type=None):
+    """
+    Response delivering stored file `name` as a download named `filename`.
+    The caller has already checked that `request` may read it.
+    """
+    filename = filename or os.path.basename(name)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    backend = settings.SENDFILE_BACKEND
+
+    if backend == 'nginx':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(settings.SENDFILE_URL.rstrip('/') + '/' + name)
+    elif backend == 'xsendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = default_storage.path(name)
+    else:
+        response = _file_response(request, name, filename, content_type)
+    if backend:
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
+
+def serve_public_media(request, path):
+    """django.views.static.serve for MEDIA_ROOT, except inquiry documents (DEBUG only)."""
+    normalized = posixpath.normpath(path).lstrip('/')  # As serve() resolves it: no `images/../` detours
+    if normalized == INQUIRY_DOC_DIR or normalized.startswith(INQUIRY_DOC_DIR + '/'):
+        raise Http404('Inquiry documents are served by /api/inquiries/<id>/documents/')
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
@@ -1,15 +1,69 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from .models import Project, Customer, Communication, ContactInquiry
 
-class ProjectSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Sparse fieldsets for ModelSerializers:
+    - Pass `fields=[...]` to limit output to those fields (e.g. from a `?fields=` query param).
+    - `fields=None` keeps the serializer's full field list.
+    """
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+class ImageVariantsField(serializers.Field):
+    """
+    Renders Project.image_variants as URLs for <picture>/<img srcset>:
+    {'srcset': {'avif': 'url 320w, url 768w, ...', 'webp': ...},
+     'sizes': {'thumb': {'width': 320, 'height': 180, 'avif': url, 'webp': url}, ...}}
+    Empty until the background job has processed the current image.
+    """
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value or not value.get('sizes'):
+            return {}
+        sizes, srcset = {}, {}
+        for name, entry in value['sizes'].items():
+            sizes[name] = {'width': entry['width'], 'height': entry['height']}
+            for format_name, path in entry.items():
+                if format_name in ('width', 'height'):
+                    continue
+                url = default_storage.url(path)
+                sizes[name][format_name] = url
+                srcset.setdefault(format_name, []).append(f"{url} {entry['width']}w")
+        return {'srcset': {name: ', '.join(urls) for name, urls in srcset.items()}, 'sizes': sizes}
+
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for Project model:
     - Validates and serializes project data, including array fields like technologies.
+    - `image_variants`: responsive image URLs and srcset strings (see ImageVariantsField).
+    - Supports sparse fieldsets via `fields=` (see SparseFieldsMixin).
     - Used by ProjectListView and ProjectDetailView.
     """
+    image_variants = ImageVariantsField()
+
+    class Meta:
+        model = Project
+        exclude = ['search_vector']
+
+class ProjectSearchResultSerializer(serializers.ModelSerializer):
+    """
+    Compact project card for SearchBar.jsx results, with the full-text `rank`.
+    Used by ProjectSearchView.
+    """
+    rank = serializers.FloatField(read_only=True)
+    image_variants = ImageVariantsField()
+
     class Meta:
         model = Project
-        fields = '__all__'
+        fields = ['id', 'title', 'description', 'image', 'image_variants', 'link', 'technologies', 'rank']
 
 class CustomerSerializer(serializers.ModelSerializer):
     """
@@ -45,7 +99,7 @@ class ContactInquirySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ContactInquiry
-        fields = '__all__'
+        exclude = ['search_vector']
 
     def validate_preferred_technologies(self, value):
         """
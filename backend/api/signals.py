@@ -0,0 +1,62 @@
+# api/signals.py
+"""
+Model signal receivers, connected in ApiConfig.ready().
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .auth import forget_user
+from .images import schedule_processing as schedule_image_processing
+
+from .models import (
+    ChangeRequest, ClientProfile, Communication, Customer, Project, ProjectStage, Task,
+)
+from .recommendations import schedule_rebuild
+from .response_cache import bump_version
+from .stages import clear as clear_stage_registry
+
+# Models served by read endpoints with cached responses or ETag validators
+VERSIONED_MODELS = (Project, ProjectStage, Customer, ClientProfile, Communication, Task, ChangeRequest)
+
+
+@receiver([post_save, post_delete])
+def invalidate_cached_responses(sender, using=None, **kwargs):
+    """
+    Bump the model's cache version so cached responses and ETags are refreshed.
+    Deferred to commit: a bump inside the writer's transaction would let a concurrent
+    read cache the old rows under the new version.
+    """
+    if sender in VERSIONED_MODELS:
+        transaction.on_commit(lambda: bump_version(sender), using=using)
+
+
+@receiver([post_save, post_delete], sender=ProjectStage)
+def reload_stage_registry(sender, using=None, **kwargs):
+    """Stage added, renamed or removed: reload the in-process stage registry once committed."""
+    transaction.on_commit(clear_stage_registry, using=using)
+
+
+@receiver(post_migrate)
+def reload_stage_registry_after_migrate(sender, **kwargs):
+    """Data migrations write stages without signals (e.g. while creating the test database)."""
+    clear_stage_registry()
+
+
+@receiver([post_save, post_delete], sender=Project)
+def schedule_recommendation_rebuild(sender, **kwargs):
+    """Project content changed: refresh precomputed recommendations in the background."""
+    schedule_rebuild()
+
+
+@receiver(post_save, sender=Project)
+def process_project_image(sender, instance, **kwargs):
+    """New or replaced Project.image: build its responsive variants in the background."""
+    schedule_image_processing(instance)
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def forget_cached_user(sender, instance, **kwargs):
+    """User changed (password, is_active, last_login, ...): drop the cached copy."""
+    forget_user(instance.pk)
@@ -0,0 +1,89 @@
+# api/stages.py
+"""
+Process-wide ProjectStage registry:
+- Stages are a handful of rarely edited rows, so all of them are loaded in one
+  query and kept in memory; default-stage resolution (Project.current_stage's
+  default), name <-> id mapping and the stage pipeline then cost no queries.
+- The registry is tagged with the ProjectStage cache version (api/response_cache.py),
+  which post_save/post_delete bump (api/signals.py). The version is re-read at most
+  every STAGE_REGISTRY_CHECK_INTERVAL seconds, so lookups (one per Project() via the
+  default stage) normally cost neither a query nor a cache round-trip; an edit in
+  another process is picked up within that interval. The same signals clear this
+  process's copy when the write commits (post_migrate clears it directly).
+- QuerySet.update()/bulk_create() on ProjectStage do not send signals; call
+  bump_version(ProjectStage) (other processes) and clear() (this one) after them.
+- Returned ProjectStage instances are shared between callers; do not modify them.
+"""
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import ProjectStage
+from .response_cache import get_versions
+
+DEFAULT_STAGE = 'proposal'
+FALLBACK_STAGE_ID = 1  # Historic default when no 'proposal' stage exists
+
+_registry = None
+
+
+class _Registry:
+    def __init__(self, version, stages):
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.stages = tuple(stages)
+        self.by_id = {stage.pk: stage for stage in self.stages}
+        self.by_name = {}
+        # Duplicate names resolve to the oldest row
+        for stage in sorted(self.stages, key=lambda stage: stage.pk):
+            self.by_name.setdefault(stage.name, stage)
+
+
+def _current():
+    global _registry
+    registry = _registry
+    now = time.monotonic()
+    if registry is not None and now - registry.checked_at < settings.STAGE_REGISTRY_CHECK_INTERVAL:
+        return registry
+    (version, _), = get_versions([ProjectStage])
+    if registry is not None and registry.version == version:
+        registry.checked_at = now
+    else:
+        # Tagged with the post-write version: load from the primary, never a lagging replica
+        registry = _registry = _Registry(version, ProjectStage.objects.using(DEFAULT_DB_ALIAS).order_by('order', 'id'))
+    return registry
+
+
+def clear():
+    """Forget the loaded stages; the next lookup reloads them."""
+    global _registry
+    _registry = None
+
+
+def all_stages():
+    """Every stage, in pipeline order (order, id)."""
+    return _current().stages
+
+
+def get_stage(pk):
+    """Stage with primary key `pk`, or None."""
+    return _current().by_id.get(pk)
+
+
+def stage_id(name):
+    """Primary key of the stage called `name` (e.g. 'active'), or None."""
+    stage = _current().by_name.get(name)
+    return stage.pk if stage is not None else None
+
+
+def stage_name(pk):
+    """Name of the stage with primary key `pk`, or None."""
+    stage = _current().by_id.get(pk)
+    return stage.name if stage is not None else None
+
+
+def default_stage_id():
+    """Primary key of the 'proposal' stage new projects start in."""
+    pk = stage_id(DEFAULT_STAGE)
+    return FALLBACK_STAGE_ID if pk is None else pk
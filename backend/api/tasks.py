@@ -0,0 +1,92 @@
+# api/tasks.py
+"""
+Background job handlers, executed by `manage.py run_jobs` (see api/jobs.py).
+Handlers must be idempotent: a job may run more than once if a worker dies mid-run.
+"""
+import logging
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+from .images import PROCESS_JOB, process_project_image
+from .jobs import job
+from .models import ContactInquiry
+from .recommendations import REBUILD_JOB, rebuild_similarities
+from .reports import REFRESH_JOB, refresh_reports, schedule_refresh
+
+logger = logging.getLogger(__name__)
+
+
+@job('send_inquiry_confirmation')
+def send_inquiry_confirmation(inquiry_id):
+    """
+    Sends the confirmation email for a ContactInquiry with inquiry details and Calendly link.
+    Raising lets the queue retry with backoff (e.g. SMTP temporarily unavailable).
+    """
+    try:
+        inquiry = ContactInquiry.objects.get(inquiry_id=inquiry_id)
+    except ContactInquiry.DoesNotExist:
+        logger.warning(f"Inquiry {inquiry_id} no longer exists, skipping confirmation email")
+        return
+
+    scheduling_link = 'https://calendly.com/your-name/consultation'  # Replace with your Calendly link
+    email_body = (
+        f"Dear {inquiry.full_name},\n\n"
+        f"Thank you for your inquiry (ID: {inquiry.inquiry_id}). We have received your request and will follow up within 24-48 hours to discuss your project.\n\n"
+        f"Inquiry Details:\n"
+        f"- Company/Organization: {inquiry.company}\n"
+        f"- Email: {inquiry.email}\n"
+        f"- Phone: {inquiry.phone}\n"
+        f"- Project Type: {inquiry.get_project_type_display()}\n"
+        f"- Project Description: {inquiry.project_description}\n"
+        f"- Preferred Technologies: {', '.join(inquiry.preferred_technologies) if inquiry.preferred_technologies else 'None'}\n"
+        f"- Budget Range: {inquiry.get_budget_range_display()}\n"
+        f"- Timeline: {inquiry.timeline}\n"
+        f"- Preferred Communication: {inquiry.get_communication_method_display()}\n"
+        f"- Meeting Platform: {inquiry.get_meeting_platform_display()}\n"
+        f"- Requirements Document: {'Uploaded' if inquiry.requirements_doc else 'Not provided'}\n"
+        f"- NDA Document: {'Uploaded' if inquiry.nda_doc else 'Not provided'}\n"
+        f"- Confidentiality Agreement: {'Accepted' if inquiry.confidentiality else 'Not accepted'}\n\n"
+        f"To schedule an initial consultation, please book a time slot here: {scheduling_link}\n\n"
+        f"We respect your privacy and comply with GDPR regulations. For details, see our privacy policy: https://yourdomain.com/privacy-policy\n\n"
+        f"Best regards,\nYour Name\ncontact@yourdomain.com"
+    )
+
+    send_mail(
+        subject='Your Project Inquiry - Confirmation',
+        message=email_body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[inquiry.email],
+        fail_silently=False,
+    )
+    logger.info(f"Confirmation email sent for inquiry {inquiry.inquiry_id} to {inquiry.email}")
+
+
+@job(REBUILD_JOB)
+def rebuild_project_similarities():
+    """
+    Recomputes the top-K neighbour lists behind /api/recommend/.
+    Scheduled (at most one pending) after project edits; safe to re-run.
+    """
+    rebuild_similarities()
+
+
+@job(REFRESH_JOB)
+def refresh_reporting_views():
+    """
+    Refreshes the reporting materialized views, then queues the next run
+    (even if this one fails, so the schedule survives a bad refresh).
+    """
+    try:
+        refresh_reports()
+    finally:
+        schedule_refresh()
+
+
+@job(PROCESS_JOB)
+def process_project_image_variants(project_id, image):
+    """
+    Builds the responsive variants of a newly uploaded Project.image.
+    Content-hashed file names make re-runs reuse the files already written.
+    """
+    process_project_image(project_id, image)
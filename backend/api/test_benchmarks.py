@@ -0,0 +1,176 @@
+"""
+Performance budget suite for every route in api/urls.py.
+
+Opt-in, because seeding takes a while:
+    RUN_BENCHMARKS=1 python manage.py test api.test_benchmarks
+    RUN_BENCHMARKS=1 BENCHMARK_SCALE=0.1 python manage.py test api.test_benchmarks
+
+Data comes from api.factories.seed_crm() at production-like volumes
+(10k projects, 100k tasks, 500k communications) times BENCHMARK_SCALE.
+Each route is requested cold (caches cleared). Query counts are always asserted:
+they do not depend on the machine. SQL and wall-clock times are reported, and only
+asserted with BENCHMARK_ENFORCE_TIMING=1 (dedicated, quiet performance runners),
+so shared CI runners do not fail on noise.
+"""
+import os
+import time
+from collections import namedtuple
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from .factories import seed_crm
+from .recommendations import rebuild_similarities
+from .reports import refresh_reports
+from .urls import urlpatterns
+
+# path: URL template formatted with ids from the seeded data (so are strings in `data`)
+# auth: request as a logged-in staff user
+# json: send `data` as a JSON body instead of form data
+RouteBudget = namedtuple('RouteBudget', 'method path auth queries sql_ms wall_ms data json')
+RouteBudget.__new__.__defaults__ = (None, False)
+
+CONTACT_FORM = {
+    'full_name': 'Benchmark Visitor', 'company': 'Bench Co', 'email': 'bench@example.com', 'phone': '+15550000000',
+    'project_type': 'web', 'project_description': 'Benchmark submission ' * 5, 'budget_range': '10k-25k',
+    'timeline': 'Three months', 'communication_method': 'email', 'meeting_platform': 'zoom',
+    'preferredTechnologies[]': ['React', 'Django'], 'captcha': 'benchmark-token',
+}
+
+# Declared budgets, keyed by URL pattern. None = route cannot currently be exercised.
+ROUTE_BUDGETS = {
+    'contact/submit/':              RouteBudget('post', '/api/contact/submit/', False, 6, 50, 250, CONTACT_FORM),
+    'contact/submit/async/':        RouteBudget('post', '/api/contact/submit/async/', False, 6, 50, 250, CONTACT_FORM),
+    # Needs a stored PDF; covered by InquiryDocumentTests in api/tests.py
+    'inquiries/<uuid:inquiry_id>/documents/<str:document>/': None,
+    'captcha/stats/':               RouteBudget('get', '/api/captcha/stats/', True, 2, 20, 100),
+    'db/pool/':                     RouteBudget('get', '/api/db/pool/', True, 4, 20, 100),
+    'projects/':                    RouteBudget('get', '/api/projects/?limit=12&fields=id,title,image,technologies&technologies__contains=Django', False, 1, 20, 100),
+    'projects/<int:pk>/':           RouteBudget('get', '/api/projects/{project}/', False, 1, 20, 100),
+    'projects/facets/':             RouteBudget('get', '/api/projects/facets/', False, 1, 20, 100),
+    'recommend/':                   RouteBudget('post', '/api/recommend/', False, 1, 20, 100, {'viewed': ['/projects/{project}']}, True),
+    'reports/':                     RouteBudget('get', '/api/reports/', True, 6, 20, 100),
+    'finances/':                    RouteBudget('get', '/api/finances/', True, 3, 20, 100),
+    'nlp-search/':                  RouteBudget('post', '/api/nlp-search/', False, 1, 50, 200, {'query': 'django dash'}),
+    # Budgeted paginated: the unpaginated form (kept for Customers.jsx) grows with the table
+    'customers/':                   RouteBudget('get', '/api/customers/?limit=50', True, 3, 20, 100),
+    'customers/<int:pk>/':          RouteBudget('get', '/api/customers/{customer}/', True, 3, 20, 100),
+    # Budgeted paginated: the unpaginated form (kept for Communications.jsx) grows with the table
+    'communications/':              RouteBudget('get', '/api/communications/?limit=50', True, 3, 20, 100),
+    'communications/<int:pk>/':     RouteBudget('get', '/api/communications/{communication}/', True, 3, 20, 100),
+    # Password hashing dominates login latency
+    'login/':                       RouteBudget('post', '/api/login/', False, 10, 50, 3000, {'username': 'bench-staff', 'password': 'bench-pass'}),
+    'register/':                    RouteBudget('post', '/api/register/', False, 0, 20, 100),
+    'logout/':                      RouteBudget('post', '/api/logout/', True, 4, 20, 100),
+    'user/role/':                   RouteBudget('get', '/api/user/role/', True, 2, 20, 100),
+    'user-role/':                   RouteBudget('get', '/api/user-role/', True, 2, 20, 100),
+    'csrf/':                        RouteBudget('get', '/api/csrf/', False, 0, 20, 100),
+    'stages/':                      RouteBudget('get', '/api/stages/', True, 3, 20, 100),
+    'tasks/':                       RouteBudget('get', '/api/tasks/?project={project}', True, 3, 50, 200),
+    'change-requests/':             RouteBudget('get', '/api/change-requests/?project={project}', True, 3, 50, 200),
+    'client-profile/<int:customer_id>/': RouteBudget('get', '/api/client-profile/{customer}/', True, 3, 20, 100),
+    'projects/<int:pk>/dashboard/':                RouteBudget('get', '/api/projects/{project}/dashboard/', True, 8, 50, 200),
+    'projects/<int:project_id>/tasks/':            RouteBudget('get', '/api/projects/{project}/tasks/', True, 3, 50, 200),
+    'projects/<int:project_id>/changes/':          RouteBudget('get', '/api/projects/{project}/changes/', True, 3, 50, 200),
+    'customers/<int:customer_id>/communications/': RouteBudget('get', '/api/customers/{customer}/communications/', True, 3, 50, 200),
+}
+
+SCALE = float(os.getenv('BENCHMARK_SCALE', '1'))
+ENFORCE_TIMING = os.getenv('BENCHMARK_ENFORCE_TIMING') == '1'
+
+
+def _format(value, ids):
+    """Fill {project}-style placeholders in request data."""
+    if isinstance(value, str):
+        return value.format(**ids)
+    if isinstance(value, list):
+        return [_format(item, ids) for item in value]
+    if isinstance(value, dict):
+        return {key: _format(item, ids) for key, item in value.items()}
+    return value
+
+
+class RouteBudgetCoverageTests(SimpleTestCase):
+    """
+    Runs with the normal suite: every route must declare a budget (or an explicit None).
+    """
+    def test_every_route_has_a_budget(self):
+        missing = [str(pattern.pattern) for pattern in urlpatterns if str(pattern.pattern) not in ROUTE_BUDGETS]
+        self.assertEqual(missing, [], f"Declare a RouteBudget in api/test_benchmarks.py for: {missing}")
+
+
+@skipUnless(os.getenv('RUN_BENCHMARKS'), 'Set RUN_BENCHMARKS=1 to run performance budgets')
+class RouteBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        start = time.perf_counter()
+        seeded = seed_crm(
+            projects=int(10_000 * SCALE),
+            tasks=int(100_000 * SCALE),
+            communications=int(500_000 * SCALE),
+            customers=int(5_000 * SCALE),
+            change_requests=int(20_000 * SCALE),
+            inquiries=int(1_000 * SCALE),
+        )
+        rebuild_similarities()
+        refresh_reports(concurrently=False)
+        from django.contrib.auth.models import User
+        cls.staff = User.objects.create_user('bench-staff', password='bench-pass', is_staff=True)
+        cls.ids = {
+            'project': seeded['project'].pk,
+            'customer': seeded['customer'].pk,
+            'communication': seeded['communication'].pk,
+        }
+        print(f"\nSeeded benchmark data (scale {SCALE}) in {time.perf_counter() - start:.1f}s")
+
+    def measure(self, budget):
+        """Issue one cold request; return (response, queries, sql_ms, wall_ms)."""
+        timings = []
+
+        def timed(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                timings.append(time.perf_counter() - start)
+
+        if budget.auth:
+            self.client.force_login(self.staff)
+        else:
+            self.client.logout()
+        cache.clear()
+
+        url = budget.path.format(**self.ids)
+        kwargs = {}
+        if budget.data:
+            kwargs['data'] = _format(budget.data, self.ids)
+        if budget.json:
+            kwargs['content_type'] = 'application/json'
+        with connection.execute_wrapper(timed):
+            start = time.perf_counter()
+            response = getattr(self.client, budget.method)(url, **kwargs)
+            wall_ms = (time.perf_counter() - start) * 1000
+        return response, len(timings), sum(timings) * 1000, wall_ms
+
+    @mock.patch('api.views.averify_captcha', new_callable=mock.AsyncMock, return_value={'success': True})
+    @mock.patch('api.views.verify_captcha', return_value={'success': True})
+    def test_routes_within_budget(self, *mocks):
+        rows = []
+        for pattern, budget in ROUTE_BUDGETS.items():
+            if budget is None:
+                continue
+            with self.subTest(route=pattern):
+                response, queries, sql_ms, wall_ms = self.measure(budget)
+                slow = sql_ms > budget.sql_ms or wall_ms > budget.wall_ms
+                rows.append(
+                    f"{pattern:<36} {response.status_code:>4} {queries:>4} q {sql_ms:>9.1f} ms sql {wall_ms:>9.1f} ms"
+                    + ('  over time budget' if slow else '')
+                )
+                self.assertLess(response.status_code, 400, f"{pattern}: {response.content[:200]}")
+                self.assertLessEqual(queries, budget.queries, f"{pattern}: {queries} queries > budget {budget.queries}")
+                if ENFORCE_TIMING:
+                    self.assertLessEqual(sql_ms, budget.sql_ms, f"{pattern}: {sql_ms:.1f}ms SQL > budget {budget.sql_ms}ms")
+                    self.assertLessEqual(wall_ms, budget.wall_ms, f"{pattern}: {wall_ms:.1f}ms > budget {budget.wall_ms}ms")
+        print('\n' + '\n'.join(rows))
@@ -1,3 +1,1132 @@
-from django.test import TestCase
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import captcha, images, jobs, metrics, profiling, stages
+from .log import JsonFormatter, QueueingStreamHandler, SamplingFilter
+from .models import (
+    BackgroundJob, ChangeRequest, Communication, ContactInquiry, Customer, Project, ProjectStage, RequestProfile,
+    SlowQuery, Task, TechnologyFacet,
+)
+from .serializers import ProjectSerializer
+
+
+class QueryCountTestCase(TestCase):
+    """
+    Base class for query-count regression tests:
+    - count_queries() issues a GET with caches cleared and returns the number of SQL queries.
+    - assertQueryCountConstant() runs a request with a small and a larger data set and
+      fails if the query count grows with the number of rows (an N+1 regression) or
+      exceeds the endpoint's declared budget.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user('staff', password='pass')
+        self.client.force_login(self.user)
+        self.stage = ProjectStage.objects.create(name='proposal', order=0)
+        self.project = Project.objects.create(title='Portfolio', description='Demo', current_stage=self.stage)
+        self.customer = Customer.objects.create(name='Acme', email='acme@example.com')
+
+    def count_queries(self, url):
+        cache.clear()  # Response cache / ETag counters would otherwise hide the queries
+        stages.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(context)
+
+    def assertQueryCountConstant(self, url, add_rows, budget, small=1, large=20):
+        add_rows(small)
+        small_count = self.count_queries(url)
+        add_rows(large - small)
+        large_count = self.count_queries(url)
+        self.assertEqual(
+            small_count, large_count,
+            f"{url}: {small_count} queries for {small} rows but {large_count} for {large} rows",
+        )
+        self.assertLessEqual(large_count, budget, f"{url}: {large_count} queries exceeds budget of {budget}")
+
+
+class ListEndpointQueryCountTests(QueryCountTestCase):
+    """
+    Session + user lookups account for 2 queries on authenticated endpoints.
+    """
+    def add_tasks(self, count):
+        assignees = [User.objects.create_user(f'user{Task.objects.count()}-{i}') for i in range(count)]
+        Task.objects.bulk_create(
+            Task(project=self.project, title=f'Task {i}', assignee=assignee) for i, assignee in enumerate(assignees)
+        )
+
+    def add_change_requests(self, count):
+        ChangeRequest.objects.bulk_create(
+            ChangeRequest(project=self.project, requester=self.customer, description=f'Change {i}') for i in range(count)
+        )
+
+    def add_communications(self, count):
+        Communication.objects.bulk_create(
+            Communication(customer=self.customer, type='email', notes=f'Note {i}') for i in range(count)
+        )
+
+    def add_customers(self, count):
+        offset = Customer.objects.count()
+        Customer.objects.bulk_create(
+            Customer(name=f'Customer {offset + i}', email=f'customer{offset + i}@example.com') for i in range(count)
+        )
+
+    def add_projects(self, count):
+        Project.objects.bulk_create(
+            Project(title=f'Project {i}', description='Demo', current_stage=self.stage) for i in range(count)
+        )
+
+    def test_task_list(self):
+        self.assertQueryCountConstant(f'/api/tasks/?project={self.project.pk}', self.add_tasks, budget=3)
+
+    def test_change_request_list(self):
+        self.assertQueryCountConstant(f'/api/change-requests/?project={self.project.pk}', self.add_change_requests, budget=3)
+
+    def test_communication_list(self):
+        self.assertQueryCountConstant('/api/communications/', self.add_communications, budget=3)
+
+    def test_customer_list(self):
+        self.assertQueryCountConstant('/api/customers/', self.add_customers, budget=3)
+
+    def test_project_list(self):
+        self.assertQueryCountConstant('/api/projects/', self.add_projects, budget=3)
+
+    def test_project_dashboard(self):
+        def add_activity(count):
+            self.add_tasks(count)
+            self.add_change_requests(count)
+        self.assertQueryCountConstant(f'/api/projects/{self.project.pk}/dashboard/', add_activity, budget=8)
+
+    def test_project_list_page(self):
+        self.assertQueryCountConstant('/api/projects/?limit=10&fields=id,title,image', self.add_projects, budget=3)
+
+    def test_customer_and_communication_pages(self):
+        self.assertQueryCountConstant('/api/customers/?limit=10', self.add_customers, budget=3)
+        self.assertQueryCountConstant('/api/communications/?limit=10', self.add_communications, budget=3)
+        page = self.client.get('/api/communications/?limit=10').json()
+        self.assertEqual(len(page['results']), 10)
+        rest = self.client.get('/api/communications/', {'cursor': page['nextCursor'], 'limit': 100}).json()
+        self.assertEqual((len(rest['results']), rest['nextCursor']), (Communication.objects.count() - 10, None))
+
+
+class ProjectPaginationTests(TestCase):
+    """
+    Keyset pagination and sparse fieldsets on /api/projects/.
+    """
+    def setUp(self):
+        cache.clear()  # bulk_create sends no signals: drop responses cached by other tests
+        Project.objects.bulk_create(Project(title=f'P{i}', description='D', technologies=['Django']) for i in range(7))
+        # Ties on created_at must be broken by id
+        Project.objects.filter(title__in=['P2', 'P3', 'P4']).update(created_at=timezone.now())
+
+    def test_cursor_walks_every_project_once_in_order(self):
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 3, 'fields': 'id,title', **({'cursor': cursor} if cursor else {})}
+            page = self.client.get('/api/projects/', params).json()
+            self.assertLessEqual(len(page['results']), 3)
+            seen.extend(project['id'] for project in page['results'])
+            cursor = page['nextCursor']
+            if cursor is None:
+                break
+        expected = list(Project.objects.order_by('created_at', 'id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_tampered_cursor_is_rejected(self):
+        for cursor in ('not-a-cursor', 'bm9wZQ==', 'MjAyNi0wMS0wMXxhYmM='):  # garbage, 'nope', '2026-01-01|abc'
+            self.assertEqual(self.client.get('/api/projects/', {'cursor': cursor}).status_code, 400, cursor)
+
+    def test_fields_limits_the_payload(self):
+        project = self.client.get('/api/projects/', {'limit': 1, 'fields': 'id,title'}).json()['results'][0]
+        self.assertEqual(set(project), {'id', 'title'})
+        detail = self.client.get(f"/api/projects/{project['id']}/", {'fields': 'technologies'}).json()
+        self.assertEqual(detail, {'technologies': ['Django']})
+        self.assertEqual(self.client.get('/api/projects/', {'fields': 'title,secret'}).status_code, 400)
+
+
+class ResponseCacheTests(TestCase):
+    """
+    Version-keyed response cache and conditional GETs (api/response_cache.py).
+    """
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(title='Shop', description='D')
+
+    def test_cached_response_is_invalidated_by_a_write(self):
+        self.assertEqual(self.client.get('/api/projects/').json()[0]['title'], 'Shop')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/projects/').json()[0]['title'], 'Shop')
+        self.project.title = 'Storefront'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        self.assertEqual(self.client.get('/api/projects/').json()[0]['title'], 'Storefront')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(self.client.get('/api/projects/').json(), [])
+
+    def test_version_is_bumped_when_the_write_commits(self):
+        from .response_cache import get_versions
+        before = get_versions([Project])
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.project.title = 'Storefront'
+                self.project.save()
+                self.assertEqual(get_versions([Project]), before)  # Readers still see the old rows
+            self.assertEqual(get_versions([Project]), before)
+        self.assertNotEqual(get_versions([Project]), before)
+
+    def test_etag_round_trip_and_invalidation(self):
+        self.client.force_login(User.objects.create_user('staff', password='pass'))
+        Customer.objects.create(name='Acme', email='acme@example.com')
+        first = self.client.get('/api/customers/')
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['ETag'] and first['Last-Modified'])
+
+        with CaptureQueriesContext(connection) as context:
+            revalidated = self.client.get('/api/customers/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((revalidated.status_code, revalidated.content), (304, b''))
+        self.assertFalse([query for query in context if 'api_customer' in query['sql']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.create(name='Globex', email='globex@example.com')
+        changed = self.client.get('/api/customers/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((changed.status_code, len(changed.json())), (200, 2))
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/customers/', HTTP_IF_NONE_MATCH=changed['ETag']).status_code, 403)
+
+
+class DatabasePoolStatsTests(TestCase):
+    """
+    pool_stats() in persistent-connection and psycopg pool modes (api/db_pool.py).
+    """
+    def test_persistent_connection_stats(self):
+        from .db_pool import pool_stats
+        stats = pool_stats()
+        self.assertIn(stats['mode'], ('persistent', 'per-request'))
+        self.assertEqual(stats['config'], {'connMaxAge': connection.settings_dict['CONN_MAX_AGE']})
+        self.assertTrue(stats['stats']['connected'])
+        self.assertGreaterEqual(stats['server']['total'], 1)
+        self.assertGreater(stats['server']['maxConnections'], 0)
+
+    def test_pool_stats(self):
+        from .db_pool import pool_stats
+        pool = mock.Mock(**{'get_stats.return_value': {'pool_size': 2, 'pool_available': 1, 'requests_waiting': 0}})
+        database = connections['default']
+        with mock.patch.dict(database.settings_dict['OPTIONS'], {'pool': {'min_size': 2, 'max_size': 10}}), \
+                mock.patch.object(type(database), 'pool', new_callable=mock.PropertyMock, return_value=pool):
+            stats = pool_stats()
+        self.assertEqual(stats['mode'], 'pool')
+        self.assertEqual(stats['config'], {'min_size': 2, 'max_size': 10})
+        self.assertEqual(stats['stats']['pool_size'], 2)
+
+    def test_endpoint_is_staff_only(self):
+        self.client.force_login(User.objects.create_user('visitor', password='pass'))
+        self.assertEqual(self.client.get('/api/db/pool/').status_code, 403)
+        self.client.force_login(User.objects.create_user('admin', password='pass', is_staff=True))
+        self.assertEqual(self.client.get('/api/db/pool/').json()['alias'], 'default')
+
+
+class CachedAuthTests(TestCase):
+    """
+    Cached sessions and users: warm authenticated requests skip django_session and auth_user.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user('admin', password='pass')
+        self.client.login(username='admin', password='pass')
+
+    def test_user_role_is_answered_from_cache(self):
+        self.client.get('/api/user-role/')  # Warm the user cache
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/user-role/')
+        self.assertEqual(response.json(), {'role': 'admin'})
+        self.assertEqual(len(context), 0)
+
+    def test_user_changes_are_seen_immediately(self):
+        self.client.get('/api/user-role/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/user-role/').json(), {'role': 'standard'})
+
+    def test_password_change_ends_cached_sessions(self):
+        self.client.get('/api/customers/')
+        self.user.set_password('new-pass')
+        self.user.save()
+        self.assertEqual(self.client.get('/api/customers/').status_code, 403)
+
+
+class StageRegistryTests(TestCase):
+    """
+    Default-stage resolution and stage lookups served from the in-process registry.
+    """
+    def test_default_stage_costs_no_queries(self):
+        proposal = stages.stage_id('proposal')
+        self.assertIsNotNone(proposal)
+        with CaptureQueriesContext(connection) as context:
+            projects = Project.objects.bulk_create(Project(title=f'P{i}', description='D') for i in range(500))
+        self.assertEqual(len(context), 1)
+        self.assertEqual({project.current_stage_id for project in projects}, {proposal})
+
+    def test_version_is_checked_at_most_once_per_interval(self):
+        stages.clear()
+        with mock.patch.object(stages, 'get_versions', wraps=stages.get_versions) as get_versions:
+            Project.objects.bulk_create(Project(title=f'P{i}', description='D') for i in range(50))
+            self.assertEqual(get_versions.call_count, 1)
+            with override_settings(STAGE_REGISTRY_CHECK_INTERVAL=0):
+                stages.all_stages()
+            self.assertEqual(get_versions.call_count, 2)
+
+    def test_stage_changes_reload_the_registry_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            stage = ProjectStage.objects.create(name='review', order=5, description='QA')
+        self.assertEqual(stages.stage_name(stage.pk), 'review')
+        with self.captureOnCommitCallbacks(execute=True):
+            stage.name = 'completed'
+            stage.save()
+            self.assertEqual(stages.get_stage(stage.pk).name, 'review')  # Not reloaded before commit
+        self.assertEqual(stages.get_stage(stage.pk).name, 'completed')
+        with self.captureOnCommitCallbacks(execute=True):
+            stage.delete()
+        self.assertIsNone(stages.stage_name(stage.pk))
+
+
+class BulkDataCommandTests(TestCase):
+    """
+    import_data / export_data round trips and upserts.
+    """
+    def run_command(self, *args):
+        out = StringIO()
+        call_command(*args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def write(self, name, text):
+        path = Path(self.tmp.name) / name
+        path.write_text(text)
+        return str(path)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_customer_upsert_and_communication_references(self):
+        Customer.objects.create(name='Old name', email='acme@example.com', phone='1')
+        customers = self.write('customers.csv', 'name,email,phone\nAcme,acme@example.com,\nGlobex,globex@example.com,2\n')
+        self.assertIn('Imported 2 customers', self.run_command('import_data', 'customers', customers))
+        self.assertEqual(Customer.objects.get(email='acme@example.com').name, 'Acme')
+        self.assertEqual(Customer.objects.count(), 2)
+
+        communications = self.write('communications.jsonl', '{"customer_email": "globex@example.com", "type": "call"}\n')
+        self.run_command('import_data', 'communications', communications)
+        self.assertEqual(Communication.objects.get().customer.name, 'Globex')
+
+        bad = self.write('bad.jsonl', '{"customer_email": "nobody@example.com", "type": "call"}\n')
+        with self.assertRaisesMessage(CommandError, "unknown customer_email 'nobody@example.com'"):
+            self.run_command('import_data', 'communications', bad)
+        self.assertEqual(Communication.objects.count(), 1)
+
+    def test_project_export_round_trip(self):
+        stage = ProjectStage.objects.create(name='review', order=3)
+        Project.objects.create(title='P', description='D', technologies=['Django', 'React'], current_stage=stage, budget_used='12.50')
+        for name in ('projects.csv', 'projects.jsonl'):
+            path = str(Path(self.tmp.name) / name)
+            self.run_command('export_data', 'projects', path)
+            Project.objects.update(title='Changed', technologies=[])
+            self.run_command('import_data', 'projects', path)
+            project = Project.objects.get()
+            self.assertEqual((project.title, project.technologies), ('P', ['Django', 'React']))
+            self.assertEqual((project.current_stage_id, str(project.budget_used)), (stage.pk, '12.50'))
+        self.assertEqual(TechnologyFacet.objects.get(source='project', name='Django').count, 1)
+
+        new = self.write('new.jsonl', '{"title": "Imported", "description": "D"}\n')
+        self.run_command('import_data', 'projects', new)
+        self.assertEqual(Project.objects.get(title='Imported').current_stage_id, stages.default_stage_id())
+
+
+class ProjectSearchTests(TestCase):
+    """
+    Full-text search: the trigger-maintained search_vector, prefix matching and ranking.
+    """
+    def setUp(self):
+        self.stage = ProjectStage.objects.create(name='active', order=1)
+        self.shop = Project.objects.create(
+            title='Ecommerce storefront', description='Online shop with payments', technologies=['Django', 'React'],
+            current_stage=self.stage,
+        )
+        self.blog = Project.objects.create(
+            title='Company blog', description='Marketing site mentioning ecommerce once', current_stage=self.stage,
+        )
+
+    def search(self, query):
+        response = self.client.post('/api/nlp-search/', {'query': query}, content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return [result['id'] for result in response.json()['results']]
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.assertEqual(self.search('ecommerce'), [self.shop.pk, self.blog.pk])
+
+    def test_prefix_and_technology_match(self):
+        self.assertEqual(self.search('djan'), [self.shop.pk])
+
+    def test_vector_follows_updates_and_bulk_create(self):
+        Project.objects.filter(pk=self.blog.pk).update(description='Recipes')
+        Project.objects.bulk_create([Project(title='Recipe planner', description='Meals', current_stage=self.stage)])
+        self.assertEqual(self.search('ecommerce'), [self.shop.pk])
+        self.assertEqual(len(self.search('recipe')), 2)
+
+    def test_punctuation_only_query_returns_nothing(self):
+        self.assertEqual(self.search('&|!:*'), [])
+
+    @override_settings(DB_REPLICA_ALIASES=['replica_1'])
+    def test_search_does_not_pin_the_client_to_the_primary(self):
+        from .db_router import PIN_COOKIE
+        response = self.client.post('/api/nlp-search/', {'query': 'shop'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+
+class TechnologyFacetTests(TestCase):
+    """
+    Trigger-maintained facet counts and the technology filters on the project list.
+    """
+    def setUp(self):
+        self.stage = ProjectStage.objects.create(name='active', order=1)
+
+    def facets(self):
+        cache.clear()
+        response = self.client.get('/api/projects/facets/')
+        self.assertEqual(response.status_code, 200, response.content)
+        return {facet['name']: facet['count'] for facet in response.json()['technologies']}
+
+    def add(self, *technologies):
+        return Project.objects.create(title='P', description='D', technologies=list(technologies), current_stage=self.stage)
+
+    def test_counts_follow_create_update_delete(self):
+        first = self.add('React', 'Django')
+        second = self.add('React', 'React')
+        self.assertEqual(self.facets(), {'React': 2, 'Django': 1})
+
+        first.technologies = ['Django', 'PostgreSQL']
+        first.save()
+        self.assertEqual(self.facets(), {'React': 1, 'Django': 1, 'PostgreSQL': 1})
+
+        second.delete()
+        Project.objects.bulk_create([
+            Project(title='B', description='D', technologies=['Django'], current_stage=self.stage) for _ in range(3)
+        ])
+        self.assertEqual(self.facets(), {'Django': 4, 'PostgreSQL': 1})
+
+    def test_contains_and_overlap_filters(self):
+        both = self.add('React', 'Django')
+        react = self.add('React')
+        self.add('Node.js')
+        cache.clear()
+        contains = self.client.get('/api/projects/?technologies__contains=React,Django&fields=id').json()
+        overlap = self.client.get('/api/projects/?technologies__overlap=Django,React&fields=id').json()
+        self.assertEqual([p['id'] for p in contains], [both.pk])
+        self.assertEqual(sorted(p['id'] for p in overlap), sorted([both.pk, react.pk]))
+
+
+class RecommendationTests(TestCase):
+    """
+    Offline similarity rebuild and the lookup-only /api/recommend/ endpoint.
+    """
+    def setUp(self):
+        stage = ProjectStage.objects.create(name='active', order=1)
+
+        def add(title, technologies, capabilities):
+            return Project.objects.create(
+                title=title, description='D', technologies=technologies, capabilities=capabilities, current_stage=stage,
+            )
+
+        self.shop = add('Shop', ['Django', 'React'], 'ecommerce checkout payments')
+        self.market = add('Marketplace', ['Django', 'React', 'PostgreSQL'], 'ecommerce payments vendors')
+        self.blog = add('Blog', ['Node.js'], 'articles comments')
+
+    def recommend(self, viewed):
+        response = self.client.post('/api/recommend/', {'viewed': viewed}, content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['recommendations']
+
+    def test_project_edits_schedule_a_single_rebuild(self):
+        self.assertEqual(BackgroundJob.objects.filter(name='rebuild_project_similarities').count(), 1)
+
+    def test_neighbours_are_merged_and_viewed_projects_excluded(self):
+        from .recommendations import rebuild_similarities
+        rebuild_similarities(top_k=2)
+        recommendations = self.recommend([f'/projects/{self.shop.pk}'])
+        self.assertEqual(recommendations[0]['id'], self.market.pk)
+        self.assertEqual(recommendations[0]['reason'], 'Similar to Shop')
+        self.assertNotIn(self.blog.pk, [r['id'] for r in recommendations])  # Nothing in common
+
+        with CaptureQueriesContext(connection) as context:
+            recommendations = self.recommend([self.shop.pk, f'/projects/{self.market.pk}/'])
+        self.assertEqual(recommendations, [])
+        self.assertEqual(len(context), 1)
+
+    def test_unknown_input_returns_nothing(self):
+        self.assertEqual(self.recommend('not-a-list'), [])
+        self.assertEqual(self.recommend(['/about']), [])
+
+
+class ReportingViewTests(TestCase):
+    """
+    /api/reports/ and /api/finances/ read materialized views, which change only on refresh.
+    """
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('staff', password='pass'))
+        stage = ProjectStage.objects.create(name='active', order=1)
+        customer = Customer.objects.create(name='Acme', email='acme@example.com')
+        project = Project.objects.create(title='P', description='D', current_stage=stage, budget_used=1500)
+        Project.objects.create(title='Q', description='D', current_stage=stage, budget_used=500)
+        Task.objects.create(project=project, title='Done', completed=True)
+        Task.objects.create(project=project, title='Open')
+        ChangeRequest.objects.create(project=project, requester=customer, description='C', priority='high')
+
+    def get(self, url):
+        cache.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_reports_reflect_data_after_refresh(self):
+        from .reports import refresh_reports
+        self.assertEqual(self.get('/api/reports/')['budgetByStage'], [])
+
+        refresh_reports()
+        report = self.get('/api/reports/')
+        self.assertEqual(report['budgetByStage'], [{'stage': 'active', 'projects': 2, 'budgetUsed': 2000.0}])
+        self.assertEqual([week['completed'] for week in report['tasksCompletedPerWeek']], [1])
+        self.assertEqual(report['changeRequests'], [{'priority': 'high', 'status': 'pending', 'count': 1}])
+        self.assertIsNotNone(report['refreshedAt'])
+
+        finances = self.get('/api/finances/')
+        self.assertEqual(finances['budgetUsed'], [2000.0])
+        self.assertEqual(finances['projectsStarted'], [2])
+
+    def test_tasks_are_counted_in_the_week_they_were_completed(self):
+        from .reports import refresh_reports
+        task = Task.objects.get(title='Done')
+        completed_at = timezone.now() - timedelta(weeks=3)
+        Task.objects.filter(pk=task.pk).update(completed_at=completed_at)
+        task.refresh_from_db()
+        task.description = 'Edited after completion'
+        task.save()
+
+        refresh_reports()
+        weeks = self.get('/api/reports/')['tasksCompletedPerWeek']
+        monday = timezone.localdate(completed_at) - timedelta(days=timezone.localdate(completed_at).weekday())
+        self.assertEqual(weeks, [{'week': monday.isoformat(), 'completed': 1}])
+
+    def test_refresh_is_queued_once_under_an_advisory_lock(self):
+        from .reports import REFRESH_JOB, schedule_refresh
+        with CaptureQueriesContext(connection) as context:
+            schedule_refresh()
+        statements = [query['sql'] for query in context]
+        lock = next(i for i, sql in enumerate(statements) if 'pg_advisory_xact_lock' in sql)
+        insert = next(i for i, sql in enumerate(statements) if sql.startswith('INSERT INTO "api_backgroundjob"'))
+        self.assertLess(lock, insert)
+        schedule_refresh()
+        self.assertEqual(BackgroundJob.objects.filter(name=REFRESH_JOB).count(), 1)
+
+    def test_completed_at_follows_completed_on_queryset_updates(self):
+        Task.objects.update(completed=False)
+        self.assertFalse(Task.objects.filter(completed_at__isnull=False).exists())
+        Task.objects.filter(title='Open').update(completed=True)
+        self.assertIsNotNone(Task.objects.get(title='Open').completed_at)
+
+
+class ProjectDashboardTests(TestCase):
+    """
+    The composite dashboard payload replacing the stages/tasks/change-requests round-trips.
+    """
+    def test_dashboard_summarises_project_activity(self):
+        self.client.force_login(User.objects.create_user('staff', password='pass'))
+        stage = ProjectStage.objects.create(name='active', order=1)
+        project = Project.objects.create(title='P', description='D', current_stage=stage)
+        customer = Customer.objects.create(name='Acme', email='acme@example.com')
+        Task.objects.create(project=project, title='Done', completed=True)
+        Task.objects.create(project=project, title='Late', due_date='2000-01-01')
+        ChangeRequest.objects.create(project=project, requester=customer, description='C')
+
+        response = self.client.get(f'/api/projects/{project.pk}/dashboard/')
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        self.assertEqual(data['project']['title'], 'P')
+        self.assertEqual(data['currentStage'], stage.pk)
+        self.assertIn(stage.pk, [row['id'] for row in data['stages']])
+        self.assertEqual(data['taskSummary'], {'total': 2, 'completed': 1, 'pending': 1, 'overdue': 1})
+        self.assertEqual([task['title'] for task in data['tasks']], ['Late', 'Done'])
+        self.assertEqual(data['changeRequestSummary'], {'pending': 1})
+        self.assertEqual(len(data['changeRequests']), 1)
+
+        self.assertEqual(self.client.get('/api/projects/999999/dashboard/').status_code, 404)
+
+
+class ContactSubmissionTests(TestCase):
+    """
+    Inquiry submissions through ContactSubmitView and AsyncContactSubmitView (CAPTCHA mocked).
+    """
+    FORM = {
+        'full_name': 'Ada Lovelace', 'company': 'Acme', 'email': 'ada@example.com', 'phone': '+15550000000',
+        'project_type': 'web', 'project_description': 'A shop', 'budget_range': '10k-25k', 'timeline': 'Q3',
+        'communication_method': 'email', 'meeting_platform': 'zoom', 'preferredTechnologies[]': ['React', 'Django'],
+        'captcha': 'token',
+    }
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media = Path(media.name)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.verify = self.enterContext(mock.patch('api.views.verify_captcha', return_value={'success': True}))
+        self.averify = self.enterContext(
+            mock.patch('api.views.averify_captcha', new_callable=mock.AsyncMock, return_value={'success': True})
+        )
+
+    def submit(self, url='/api/contact/submit/', **files):
+        return self.client.post(url, {**self.FORM, **files})
+
+    def test_async_endpoint_saves_inquiry_and_queues_email(self):
+        response = self.submit('/api/contact/submit/async/')
+        self.assertEqual(response.status_code, 201, response.content)
+        inquiry = ContactInquiry.objects.get(pk=response.json()['inquiryId'])
+        self.assertEqual(inquiry.preferred_technologies, ['React', 'Django'])
+        self.assertEqual(
+            BackgroundJob.objects.get(name='send_inquiry_confirmation').payload, {'inquiry_id': str(inquiry.pk)},
+        )
+        self.averify.assert_awaited_once_with('token')
+        self.verify.assert_not_called()
+
+    def test_async_endpoint_captcha_failures(self):
+        self.averify.return_value = {'success': False, 'error-codes': ['invalid-input-response']}
+        self.assertEqual(self.submit('/api/contact/submit/async/').status_code, 400)
+        self.averify.side_effect = captcha.CaptchaUnavailable('timeout')
+        self.assertEqual(self.submit('/api/contact/submit/async/').status_code, 503)
+        self.assertFalse(ContactInquiry.objects.exists())
+
+    def test_inquiry_is_written_with_one_insert(self):
+        from .serializers import ContactInquirySerializer
+        data = {key: value for key, value in self.FORM.items() if not key.endswith('[]')}
+        serializer = ContactInquirySerializer(data={**data, 'preferred_technologies': ['React']})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertNumQueries(1):
+            serializer.save(inquiry_id=uuid.uuid4(), requirements_doc='inquiries/requirements/brief.pdf')
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.submit().status_code, 201)
+        inquiry_writes = [query['sql'].split()[0] for query in context if '"api_contactinquiry"' in query['sql']]
+        self.assertEqual(inquiry_writes, ['INSERT'])
+
+    def stored_documents(self):
+        return [path for path in self.media.rglob('*') if path.is_file()]
+
+    def test_documents_are_stored_under_the_inquiry_id(self):
+        pdf = SimpleUploadedFile('brief.pdf', b'%PDF-1.4 brief', content_type='application/pdf')
+        response = self.submit(requirementsDoc=pdf)
+        self.assertEqual(response.status_code, 201, response.content)
+        inquiry = ContactInquiry.objects.get(pk=response.json()['inquiryId'])
+        self.assertEqual(inquiry.requirements_doc.name, f'inquiries/requirements/{inquiry.pk}_brief.pdf')
+        self.assertEqual(inquiry.requirements_doc.read(), b'%PDF-1.4 brief')
+
+    def test_non_pdf_upload_is_rejected(self):
+        fake = SimpleUploadedFile('brief.pdf', b'MZ\x90\x00 not a pdf', content_type='application/pdf')
+        response = self.submit(requirementsDoc=fake)
+        self.assertEqual((response.status_code, response.json()['error']), (400, 'Requirements document must be a PDF'))
+        self.assertEqual((ContactInquiry.objects.count(), self.stored_documents()), (0, []))
+
+    @override_settings(INQUIRY_DOC_MAX_SIZE=1024 * 1024)
+    def test_oversize_upload_is_rejected(self):
+        large = SimpleUploadedFile('nda.pdf', b'%PDF-1.4' + b'0' * (1024 * 1024), content_type='application/pdf')
+        response = self.submit(ndaDoc=large)
+        self.assertEqual((response.status_code, response.json()['error']), (400, 'NDA document must be under 1MB'))
+        self.assertEqual((ContactInquiry.objects.count(), self.stored_documents()), (0, []))
+
+    def test_failed_save_removes_stored_documents(self):
+        pdf = SimpleUploadedFile('brief.pdf', b'%PDF-1.4 brief', content_type='application/pdf')
+        with mock.patch('api.views.enqueue', side_effect=RuntimeError('queue down')):
+            response = self.submit(requirementsDoc=pdf)
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual((ContactInquiry.objects.count(), self.stored_documents()), (0, []))
+
+
+class JobQueueTests(TestCase):
+    """
+    Claiming, retries with backoff and stale-lock recovery in the job queue (api/jobs.py).
+    """
+    def setUp(self):
+        self.handler = mock.Mock()
+        self.enterContext(mock.patch.dict(jobs._registry, {'tests.job': self.handler}))
+
+    def test_failures_back_off_then_fail_permanently(self):
+        self.handler.side_effect = RuntimeError('SMTP down')
+        queued = jobs.enqueue('tests.job', {'inquiry': 1}, max_attempts=2)
+        background_job, = jobs.claim_jobs()
+        jobs.run_job(background_job)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts, queued.locked_at), ('pending', 1, None))
+        self.assertGreaterEqual((queued.run_after - timezone.now()).total_seconds(), 9)
+        self.assertIn('SMTP down', queued.last_error)
+        self.handler.assert_called_once_with(inquiry=1)
+
+        BackgroundJob.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        jobs.run_job(jobs.claim_jobs()[0])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('failed', 2))
+        self.assertEqual(jobs.claim_jobs(), [])
+
+    def test_worker_runs_due_jobs(self):
+        jobs.enqueue('tests.job')
+        jobs.enqueue('tests.job', delay=60)
+        with mock.patch.object(jobs, 'close_old_connections'):  # Would close the test transaction
+            self.assertEqual(jobs.work(burst=True), 1)
+        self.assertEqual(
+            sorted(BackgroundJob.objects.values_list('status', flat=True)), ['pending', 'succeeded'],
+        )
+
+    def test_stale_job_is_requeued_and_old_claim_cannot_record(self):
+        queued = jobs.enqueue('tests.job')
+        stale, = jobs.claim_jobs()
+        long_ago = timezone.now() - timedelta(seconds=settings.JOB_QUEUE_LOCK_TIMEOUT + 1)
+        BackgroundJob.objects.filter(pk=queued.pk).update(locked_at=long_ago)
+        stale.locked_at = long_ago
+        self.assertEqual(jobs.requeue_stale_jobs(), 1)
+
+        self.assertFalse(jobs.renew_lock(stale))  # The first worker skips it
+        jobs.run_job(stale)  # ...and even if it ran, the outcome is discarded
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'pending')
+
+        fresh, = jobs.claim_jobs()
+        self.assertTrue(jobs.renew_lock(fresh))
+        jobs.run_job(fresh)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('succeeded', 2))
+
+
+class CaptchaVerificationTests(SimpleTestCase):
+    """
+    Once-per-token verification and the siteverify circuit breaker (api/captcha.py).
+    """
+    def setUp(self):
+        cache.clear()
+        self.breaker = captcha.CircuitBreaker(failure_rate=0.5, min_calls=2, window=30, reset_timeout=0.05, slow_call=1)
+        self.enterContext(mock.patch.object(captcha, 'breaker', self.breaker))
+
+    def test_breaker_opens_then_half_opens_then_closes(self):
+        self.breaker.record(False)
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, captcha.CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        time.sleep(0.06)
+        self.assertTrue(self.breaker.allow_request())  # The single half-open trial
+        self.assertFalse(self.breaker.allow_request())
+        self.breaker.record(True, 0.1)
+        self.assertEqual(self.breaker.state, captcha.CircuitBreaker.CLOSED)
+
+    def test_replayed_token_is_rejected_without_upstream_call(self):
+        with mock.patch.object(captcha, '_siteverify', return_value={'success': True}) as siteverify:
+            self.assertTrue(captcha.verify_captcha('token-1')['success'])
+            self.assertEqual(captcha.verify_captcha('token-1')['error-codes'], ['timeout-or-duplicate'])
+        siteverify.assert_called_once()
+
+    def test_open_circuit_fails_fast(self):
+        self.breaker.record(False)
+        self.breaker.record(False)
+        with mock.patch.object(captcha, '_siteverify') as siteverify, self.assertRaises(captcha.CaptchaUnavailable):
+            captcha.verify_captcha('token-2')
+        siteverify.assert_not_called()
+
+    def test_unexpected_error_ends_trial_and_releases_token(self):
+        self.breaker.record(False)
+        self.breaker.record(False)
+        time.sleep(0.06)
+        with mock.patch.object(captcha, '_siteverify', side_effect=KeyError('success')), self.assertRaises(KeyError):
+            captcha.verify_captcha('token-3')
+        self.assertFalse(self.breaker._trial_in_flight)
+        self.assertIsNone(cache.get(captcha._cache_key('token-3')))
+
+        time.sleep(0.06)
+        with mock.patch.object(captcha, '_siteverify', return_value={'success': True}):
+            self.assertTrue(captcha.verify_captcha('token-3')['success'])  # Retry is verified, not a replay
+        self.assertEqual(self.breaker.state, captcha.CircuitBreaker.CLOSED)
+
+    def test_cancelled_async_verification_releases_token(self):
+        with mock.patch.object(captcha, '_asiteverify', side_effect=asyncio.CancelledError), \
+                self.assertRaises(asyncio.CancelledError):
+            asyncio.run(captcha.averify_captcha('token-4'))
+        self.assertIsNone(cache.get(captcha._cache_key('token-4')))
+
+
+class MetricsTests(TestCase):
+    """
+    Per-route request metrics and the Prometheus /metrics endpoint.
+    """
+    def setUp(self):
+        metrics.reset()
+
+    @override_settings(METRICS_ALLOWED_IPS=['127.0.0.1'])
+    def test_requests_are_recorded_per_route(self):
+        self.client.get('/api/projects/')
+        self.client.get('/api/projects/')
+        self.client.get('/api/projects/999999/')
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('http_requests_total{route="api/projects/",method="GET",status="2xx"} 2', body)
+        self.assertIn('http_requests_total{route="api/projects/<int:pk>/",method="GET",status="4xx"} 1', body)
+        self.assertIn('http_request_duration_seconds_count{route="api/projects/",method="GET"} 2', body)
+        self.assertIn('http_request_db_queries_bucket{route="api/projects/",method="GET",le="+Inf"} 2', body)
+        self.assertIn('cache_requests_total{cache="response",result="miss"}', body)
+
+    def test_exited_threads_are_folded_into_one_total(self):
+        import threading
+        family = metrics.Family('test_total', 'Test counter.', 'counter', ('name',))
+        for _ in range(20):
+            thread = threading.Thread(target=family.inc, args=(('a',),))
+            thread.start()
+            thread.join()
+        family.inc(('a',))
+        self.assertEqual(family.collect(), {('a',): [21]})
+        self.assertEqual(len(family._shards), 1)  # Only this thread's shard is left
+
+    def test_scrapes_are_refused_by_default(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)  # Even from 127.0.0.1
+
+    @override_settings(METRICS_ALLOWED_IPS=[], METRICS_TOKEN='secret')
+    def test_scrapes_need_the_token_from_other_hosts(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+
+class DiagnosticsTests(TestCase):
+    """
+    Staff request profiles and slow-query capture (api/profiling.py), viewed in the admin.
+    """
+    def setUp(self):
+        self.staff = User.objects.create_superuser('root', password='pass')
+        profiling._last_captured.clear()
+
+    def test_staff_can_profile_a_request(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/projects/?_profile=1')
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual((profile.view_name, profile.status_code), ('ProjectListView', 200))
+        self.assertIn('incl %', profile.summary)
+        self.assertEqual(self.client.get(f'/admin/api/requestprofile/{profile.pk}/change/').status_code, 200)
+        self.assertEqual(self.client.get(f'/admin/api/requestprofile/{profile.pk}/folded/').status_code, 200)
+
+        self.client.force_login(User.objects.create_user('visitor', password='pass'))
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/projects/', HTTP_X_PROFILE='1'))
+
+    @override_settings(SLOW_QUERY_MS=0.000001)
+    def test_slow_queries_are_captured_with_plan_and_view(self):
+        self.client.force_login(self.staff)
+        self.client.get('/api/customers/')
+        captured = SlowQuery.objects.filter(view_name='CustomerListView').first()
+        self.assertIsNotNone(captured)
+        self.assertIn('actual time', captured.plan)
+        self.client.get('/api/customers/')
+        self.assertEqual(SlowQuery.objects.filter(sql=captured.sql).count(), 1)  # Cooldown
+        self.assertEqual(self.client.get(f'/admin/api/slowquery/{captured.pk}/change/').status_code, 200)
+
+    @override_settings(SLOW_QUERY_MS=0.000001)
+    def test_slow_queries_are_captured_when_the_response_is_closed(self):
+        from django.core.signals import request_finished
+        from django.db import close_old_connections
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        request_finished.disconnect(close_old_connections)  # As the test client does
+        self.addCleanup(request_finished.connect, close_old_connections)
+        request = RequestFactory().get('/api/customers/')
+        request.user = self.staff
+
+        def view(request):
+            list(Customer.objects.all())
+            return HttpResponse('ok')
+
+        response = profiling.ProfilingMiddleware(view)(request)
+        self.assertFalse(SlowQuery.objects.exists())
+        response.close()
+        self.assertTrue(SlowQuery.objects.filter(sql__contains='api_customer').exists())
+
+
+class ImageVariantTests(TestCase):
+    """
+    Responsive Project.image variants (api/images.py): queued on upload, built by the job.
+    """
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name, IMAGE_VARIANT_FORMATS=['webp']))
+
+    def upload(self, width=1000, height=500):
+        buffer = BytesIO()
+        Image.new('RGB', (width, height), 'teal').save(buffer, 'PNG')
+        return SimpleUploadedFile('shot.png', buffer.getvalue(), content_type='image/png')
+
+    def test_upload_is_processed_into_srcset(self):
+        project = Project.objects.create(title='Shop', description='d', technologies=['Django'], image=self.upload())
+        queued = BackgroundJob.objects.get(name=images.PROCESS_JOB)
+        self.assertEqual(queued.payload, {'project_id': project.pk, 'image': project.image.name})
+
+        self.assertTrue(images.process_project_image(**queued.payload))
+        project.refresh_from_db()
+        sizes = project.image_variants['sizes']
+        self.assertEqual(sorted(sizes), ['large', 'medium', 'thumb'])  # 1600 clamped to the 1000px original
+        self.assertEqual((sizes['thumb']['width'], sizes['thumb']['height']), (320, 160))
+        self.assertEqual(sizes['large']['width'], 1000)
+
+        data = ProjectSerializer(project).data['image_variants']
+        self.assertEqual(data['srcset']['webp'].count('w,'), 2)
+        self.assertTrue(data['sizes']['thumb']['webp'].endswith('-thumb.webp'))
+
+        project.save()  # Variants match the image: nothing new to do
+        self.assertEqual(BackgroundJob.objects.filter(name=images.PROCESS_JOB).count(), 1)
+
+    def test_replaced_image_is_not_overwritten_by_a_stale_job(self):
+        project = Project.objects.create(title='Shop', description='d', technologies=['Django'], image=self.upload())
+        stale = project.image.name
+        project.image = self.upload(400, 400)
+        project.save()
+        self.assertFalse(images.process_project_image(project.pk, stale))
+        self.assertEqual(Project.objects.get(pk=project.pk).image_variants, {})
+
+
+class InquiryDocumentTests(TestCase):
+    """
+    Staff-only inquiry document downloads (InquiryDocumentView, api/sendfile.py).
+    """
+    PDF = b'%PDF-1.4\n' + bytes(range(256)) * 8
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name, SENDFILE_BACKEND=''))
+        self.inquiry = ContactInquiry.objects.create(
+            full_name='Ada', company='Acme', email='ada@example.com', phone='+15550000000', project_type='web',
+            project_description='Shop', budget_range='<10k', timeline='Soon', communication_method='email',
+            meeting_platform='zoom',
+        )
+        self.inquiry.requirements_doc = default_storage.save(
+            f'inquiries/requirements/{self.inquiry.pk}_brief.pdf', ContentFile(self.PDF),
+        )
+        self.inquiry.save()
+        self.url = f'/api/inquiries/{self.inquiry.pk}/documents/requirements/'
+        self.client.force_login(User.objects.create_user('admin', password='pass', is_staff=True))
+
+    def test_file_response_supports_ranges(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/pdf')
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'application/pdf'))
+        self.assertIn('filename="brief.pdf"', response['Content-Disposition'])
+        self.assertEqual(b''.join(response.streaming_content), self.PDF)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=9-24')
+        self.assertEqual((response.status_code, response['Content-Range']), (206, f'bytes 9-24/{len(self.PDF)}'))
+        self.assertEqual(b''.join(response.streaming_content), self.PDF[9:25])
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), self.PDF[-10:])
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.PDF)}-').status_code, 416)
+
+    def test_front_server_transfer_and_permissions(self):
+        with override_settings(SENDFILE_BACKEND='nginx'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.inquiry.requirements_doc.name}')
+        self.assertEqual(response.content, b'')
+
+        self.assertEqual(self.client.get(self.url.replace('requirements', 'nda')).status_code, 404)
+        self.client.force_login(User.objects.create_user('visitor', password='pass'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_development_media_server_hides_inquiry_documents(self):
+        from django.http import Http404
+        from django.test import RequestFactory
+        from .sendfile import serve_public_media
+        name = self.inquiry.requirements_doc.name
+        default_storage.save('images/shot.png', ContentFile(b'png'))
+        request = RequestFactory().get('/media/')
+        self.assertEqual(serve_public_media(request, 'images/shot.png').status_code, 200)
+        for path in (name, f'images/../{name}', f'/{name}', 'inquiries'):
+            with self.assertRaises(Http404, msg=path):
+                serve_public_media(request, path)
+
+
+class LoggingPipelineTests(SimpleTestCase):
+    """
+    Queue-based JSON logging with redaction and sampling (api/log.py).
+    """
+    def make_logger(self, name, **filter_options):
+        stream = StringIO()
+        handler = QueueingStreamHandler(stream=stream)
+        handler.setFormatter(JsonFormatter())
+        self.addCleanup(handler.close)
+        test_logger = logging.getLogger(name)
+        test_logger.addHandler(handler)
+        test_logger.propagate = False
+        test_logger.setLevel(logging.INFO)
+        if filter_options:
+            sampling = SamplingFilter(**filter_options)
+            test_logger.addFilter(sampling)
+            self.addCleanup(test_logger.removeFilter, sampling)
+        self.addCleanup(test_logger.removeHandler, handler)
+        return test_logger, handler, stream
+
+    def lines(self, handler, stream):
+        handler.flush()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_records_are_written_as_redacted_json(self):
+        test_logger, handler, stream = self.make_logger('api.tests.json')
+        test_logger.info("Inquiry from jane@example.com, call +1 555 123 4567 on 2025-01-01 12:00:00", extra={'password': 'x', 'job': 7})
+        [entry] = self.lines(handler, stream)
+        self.assertEqual(entry['message'], "Inquiry from [email], call [phone] on 2025-01-01 12:00:00")
+        self.assertEqual((entry['level'], entry['logger'], entry['password'], entry['job']), ('INFO', 'api.tests.json', '[redacted]', 7))
+
+    def test_sampling_keeps_warnings(self):
+        test_logger, handler, stream = self.make_logger('api.tests.sampled', rate=0.0)
+        test_logger.info("Retrieved project list")
+        test_logger.warning("Slow response")
+        self.assertEqual([entry['message'] for entry in self.lines(handler, stream)], ["Slow response"])
+
+    def test_other_handlers_see_the_original_record(self):
+        test_logger, handler, stream = self.make_logger('api.tests.shared')
+        seen = []
+        other = logging.Handler()
+        other.emit = seen.append
+        test_logger.addHandler(other)
+        self.addCleanup(test_logger.removeHandler, other)
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            test_logger.exception("Failed for %s", 'jane')
+        [record] = seen
+        self.assertEqual((record.msg, record.args), ("Failed for %s", ('jane',)))
+        self.assertIs(record.exc_info[0], ValueError)
+        [entry] = self.lines(handler, stream)
+        self.assertEqual(entry['message'], "Failed for jane")
+        self.assertIn('ValueError: boom', entry['exception'])
+
+    def test_concurrent_first_records_start_one_writer(self):
+        import threading
+        from . import log
+        handler = QueueingStreamHandler(stream=StringIO())
+        self.addCleanup(handler.close)
+        barrier = threading.Barrier(8)
+        started = self.enterContext(mock.patch.object(log._Listener, 'start', autospec=True))
+        pid = os.getpid()
+
+        def slow_getpid():
+            time.sleep(0.01)  # Widen the window between the PID check and starting the writer
+            return pid
+        self.enterContext(mock.patch.object(log.os, 'getpid', side_effect=slow_getpid))
+
+        def first_record():
+            barrier.wait()
+            handler._ensure_listener()
+
+        threads = [threading.Thread(target=first_record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(started.call_count, 1)
+        handler._listener = None  # Never started: nothing for close() to stop
+
+
+@override_settings(DB_REPLICA_ALIASES=['replica_1'], DB_REPLICA_STICKY_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    """
+    Routing decisions made by ReplicaRoutingMiddleware + ReplicaRouter (no replica database needed).
+    """
+    def route(self, method='get', cookies=None, write=False, status_code=200):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from .db_router import PIN_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware
+
+        router = ReplicaRouter()
+        seen = {}
+
+        def view(request):
+            seen['before'] = router.db_for_read(Project)
+            if write:
+                router.db_for_write(Project)
+                seen['after'] = router.db_for_read(Project)
+            return HttpResponse(status=status_code)
+
+        request = getattr(RequestFactory(), method)('/api/projects/')
+        request.COOKIES.update(cookies or {})
+        response = ReplicaRoutingMiddleware(view)(request)
+        return seen, response.cookies.get(PIN_COOKIE)
+
+    def test_safe_requests_read_from_replica(self):
+        seen, pin = self.route()
+        self.assertEqual(seen['before'], 'replica_1')
+        self.assertIsNone(pin)
+
+    def test_successful_write_pins_client_to_primary(self):
+        import time
+        from .db_router import PIN_COOKIE
+        _, pin = self.route(method='post', write=True)
+        self.assertEqual(pin['max-age'], 10)
+
+        seen, _ = self.route(cookies={PIN_COOKIE: str(time.time() + 5)})
+        self.assertEqual(seen['before'], 'default')
+        seen, _ = self.route(cookies={PIN_COOKIE: str(time.time() - 1)})
+        self.assertEqual(seen['before'], 'replica_1')
+
+    def test_failed_write_does_not_pin(self):
+        _, pin = self.route(method='post', status_code=400)
+        self.assertIsNone(pin)
+
+    def test_read_only_post_does_not_pin(self):
+        _, pin = self.route(method='post')
+        self.assertIsNone(pin)
+
+    def test_reads_after_a_write_in_the_same_request_use_primary(self):
+        seen, pin = self.route(write=True)
+        self.assertEqual((seen['before'], seen['after']), ('replica_1', 'default'))
+        self.assertIsNotNone(pin)
+
+    def test_outside_requests_everything_uses_primary(self):
+        from .db_router import ReplicaRouter
+        self.assertEqual(ReplicaRouter().db_for_read(Project), 'default')
+
+    @override_settings(DB_REPLICA_ALIASES=['replica_1', 'replica_2', 'replica_3'])
+    def test_one_replica_per_request(self):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from .db_router import ReplicaRouter, ReplicaRoutingMiddleware, primary_reads, replica_used
+        router = ReplicaRouter()
+        seen = []
+
+        def view(request):
+            seen.extend(router.db_for_read(Project) for _ in range(20))
+            with primary_reads():  # Cache fills
+                seen.append(router.db_for_read(Project))
+            seen.append(replica_used())
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(RequestFactory().get('/api/projects/'))
+        self.assertEqual(len(set(seen[:20])), 1)
+        self.assertEqual(seen[20:], ['default', True])
@@ -0,0 +1,56 @@
+# api/uploads.py
+"""
+Upload handling for inquiry documents (requirementsDoc / ndaDoc from Contact.jsx).
+"""
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+PDF_MAGIC = b'%PDF-'
+
+# Multipart field name -> label used in error messages
+INQUIRY_DOC_FIELDS = {
+    'requirementsDoc': 'Requirements document',
+    'ndaDoc': 'NDA document',
+}
+
+# Storage directory of inquiry documents; never served from MEDIA_URL (api/sendfile.py)
+INQUIRY_DOC_DIR = 'inquiries'
+
+# Download URL segment (/api/inquiries/<id>/documents/<segment>/) -> ContactInquiry file field
+INQUIRY_DOC_DOWNLOADS = {
+    'requirements': 'requirements_doc',
+    'nda': 'nda_doc',
+}
+
+
+class InquiryDocumentUploadHandler(FileUploadHandler):
+    """
+    Validating pass-through handler, listed first in FILE_UPLOAD_HANDLERS:
+    - Checks the PDF signature on the first chunk and the running size on every
+      chunk, so bad or oversized uploads are dropped while streaming instead of
+      after the whole body has been buffered.
+    - Passes accepted chunks on unchanged to Django's memory/temp-file handlers.
+    - Rejections are recorded on `request.upload_errors` ({field: 'type'|'size'}).
+    Fields other than the inquiry documents are not touched.
+    """
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name in INQUIRY_DOC_FIELDS
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        if start == 0 and not raw_data.startswith(PDF_MAGIC):
+            self._reject('type')
+        if start + len(raw_data) > settings.INQUIRY_DOC_MAX_SIZE:
+            self._reject('size')
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None  # Let the next handler build the UploadedFile
+
+    def _reject(self, reason):
+        if not hasattr(self.request, 'upload_errors'):
+            self.request.upload_errors = {}
+        self.request.upload_errors[self.field_name] = reason
+        raise SkipFile()
@@ -1,7 +1,7 @@
 # Import Django URL utilities
 from django.urls import path
 from .views import (
-    ContactSubmitView, ProjectListView, ProjectDetailView,
+    ContactSubmitView, AsyncContactSubmitView, InquiryDocumentView, CaptchaStatsView, DatabasePoolStatsView, ProjectListView, ProjectDetailView, ProjectSearchView, TechnologyFacetView, RecommendView, ReportsView, FinancesView,
     CustomerListView, CustomerDetailView, CommunicationListView,
     CommunicationDetailView, LoginView, RegisterView, LogoutView,
     UserRoleView, CSRFView, ProjectStageListView,
@@ -21,9 +21,18 @@ from .views import (
 urlpatterns = [
     # Contact form submission
     path('contact/submit/', ContactSubmitView.as_view(), name='contact-submit'),
+    path('contact/submit/async/', AsyncContactSubmitView.as_view(), name='contact-submit-async'),
+    path('inquiries/<uuid:inquiry_id>/documents/<str:document>/', InquiryDocumentView.as_view(), name='inquiry-document'),
+    path('captcha/stats/', CaptchaStatsView.as_view(), name='captcha-stats'),
+    path('db/pool/', DatabasePoolStatsView.as_view(), name='db-pool-stats'),
     # Project endpoints
     path('projects/', ProjectListView.as_view(), name='project-list'),
     path('projects/<int:pk>/', ProjectDetailView.as_view(), name='project-detail'),
+    path('projects/facets/', TechnologyFacetView.as_view(), name='project-facets'),
+    path('nlp-search/', ProjectSearchView.as_view(), name='project-search'),
+    path('recommend/', RecommendView.as_view(), name='recommend'),
+    path('reports/', ReportsView.as_view(), name='reports'),
+    path('finances/', FinancesView.as_view(), name='finances'),
     # Customer endpoints
     path('customers/', CustomerListView.as_view(), name='customer-list'),
     path('customers/<int:pk>/', CustomerDetailView.as_view(), name='customer-detail'),
@@ -35,14 +44,15 @@ urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('logout/', LogoutView.as_view(), name='logout'),
     path('user/role/', UserRoleView.as_view(), name='user-role'),
+    path('user-role/', UserRoleView.as_view(), name='user-role-legacy'),  # Path used by UserContext.jsx
     path('csrf/', CSRFView.as_view(), name='csrf'),
     path('stages/', ProjectStageListView.as_view(), name='project-stages'),
     path('tasks/', TaskListView.as_view(), name='task-list'),
     path('change-requests/', ChangeRequestListView.as_view(), name='change-request-list'),
     path('client-profile/<int:customer_id>/', ClientProfileView.as_view(), name='client-profile'),
-    path('projects/<uuid:pk>/dashboard/', ProjectDashboard.as_view(), name='project-dashboard'),
-    path('projects/<uuid:project_id>/tasks/',    TaskList.as_view(),        name='task-list'),
-    path('projects/<uuid:project_id>/changes/',  ChangeRequestList.as_view(), name='change-request-list'),
+    path('projects/<int:pk>/dashboard/', ProjectDashboard.as_view(), name='project-dashboard'),
+    path('projects/<int:project_id>/tasks/',    TaskList.as_view(),        name='task-list'),
+    path('projects/<int:project_id>/changes/',  ChangeRequestList.as_view(), name='change-request-list'),
     path('customers/',                            CustomerList.as_view(),      name='customer-list'),
-    path('customers/<uuid:customer_id>/communications/', CommunicationList.as_view(), name='communication-list'),
+    path('customers/<int:customer_id>/communications/', CommunicationList.as_view(), name='communication-list'),
 ]
\ No newline at end of file
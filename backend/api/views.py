@@ -1,22 +1,38 @@
 # Import required Django and REST Framework modules
 import logging
-import requests
 import os
-from django.core.mail import send_mail
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 from django.core.exceptions import ValidationError
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views import View
 from django.utils import timezone
+from django.db import transaction
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.utils.decorators import method_decorator
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
-from .models import Project, Customer, Communication, ContactInquiry
-from .serializers import ProjectSerializer, CustomerSerializer, CommunicationSerializer, ContactInquirySerializer,ProjectStageSerializer,ClientProfileSerializer
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from .models import Project, ProjectStage, Customer, Communication, ContactInquiry, TechnologyFacet
+from .models import BudgetByStageReport, WeeklyTaskReport, ChangeRequestReport, InquiryBudgetReport, MonthlyBudgetReport
+from .serializers import ProjectSerializer, ProjectSearchResultSerializer, CustomerSerializer, CommunicationSerializer, ContactInquirySerializer,ProjectStageSerializer,ClientProfileSerializer
+from .jobs import enqueue
+from .uploads import INQUIRY_DOC_DIR, INQUIRY_DOC_DOWNLOADS, INQUIRY_DOC_FIELDS
+from .sendfile import sendfile
+from .pagination import keyset_page, parse_page_size
+from .recommendations import parse_viewed, recommend
+from .reports import REPORT_MODELS
+from .search import ranked_search, DEFAULT_LIMIT as SEARCH_DEFAULT_LIMIT, MAX_LIMIT as SEARCH_MAX_LIMIT
+from .response_cache import ConditionalGetMixin, VersionedCacheMixin
+from .captcha import verify_captcha, averify_captcha, captcha_stats, CaptchaUnavailable
+from .db_pool import pool_stats
+from .auth import user_role
+from .stages import all_stages
+from . import metrics
 
 #CRM views import
 from django.db import models
@@ -28,20 +44,114 @@ from rest_framework import generics, permissions
 
 # Configure logging for debugging
 logger = logging.getLogger(__name__)
+# Per-call lines of read endpoints; sampled (settings.LOG_READ_SAMPLE_RATE)
+read_logger = logging.getLogger('api.reads')
+
+def _check_captcha_result(captcha_response):
+    """
+    Maps a siteverify response to an error (payload, status) pair, or None if it passed.
+    """
+    if not captcha_response.get('success'):
+        logger.error(f"CAPTCHA verification failed: {captcha_response.get('error-codes', 'Unknown error')}")
+        return {'error': 'Invalid CAPTCHA verification'}, status.HTTP_400_BAD_REQUEST
+    return None
+
+
+def _delete_orphan_files(names):
+    """
+    Removes files stored for an inquiry whose transaction rolled back.
+    """
+    for name in names:
+        try:
+            default_storage.delete(name)
+        except Exception as e:
+            logger.error(f"Failed to remove orphaned upload {name}: {str(e)}")
+
+
+def _process_inquiry(form_data, files, upload_errors=None):
+    """
+    Shared by ContactSubmitView and AsyncContactSubmitView once the CAPTCHA has passed:
+    validates files and form data, saves the inquiry and queues the confirmation email.
+    `upload_errors` are documents rejected while streaming (api/uploads.py).
+    Returns a (payload, status) pair. Blocking (DB + storage I/O).
+    """
+    # Step 2: Handle file uploads and form data
+    requirements_doc = files.get('requirementsDoc')
+    nda_doc = files.get('ndaDoc')
+    data = form_data.dict()
+
+    # Extract preferred_technologies as a list to avoid string input
+    preferred_technologies = form_data.getlist('preferredTechnologies[]')
+    data['preferred_technologies'] = preferred_technologies if preferred_technologies else []
+
+    # Step 3: Validate file types (PDF only) and size (<5MB).
+    # Signature and size are enforced chunk-by-chunk by InquiryDocumentUploadHandler;
+    # rejected uploads never reach `files`.
+    max_size_mb = settings.INQUIRY_DOC_MAX_SIZE // (1024 * 1024)
+    for field_name, reason in (upload_errors or {}).items():
+        label = INQUIRY_DOC_FIELDS[field_name]
+        if reason == 'size':
+            logger.error(f"{label} too large (over {settings.INQUIRY_DOC_MAX_SIZE} bytes)")
+            return {'error': f'{label} must be under {max_size_mb}MB'}, status.HTTP_400_BAD_REQUEST
+        logger.error(f"{label} is not a PDF (bad file signature)")
+        return {'error': f'{label} must be a PDF'}, status.HTTP_400_BAD_REQUEST
+
+    for field_name, document in (('requirementsDoc', requirements_doc), ('ndaDoc', nda_doc)):
+        if document and document.content_type != 'application/pdf':
+            logger.error(f"Invalid {INQUIRY_DOC_FIELDS[field_name]} type: {document.content_type}")
+            return {'error': f'{INQUIRY_DOC_FIELDS[field_name]} must be a PDF'}, status.HTTP_400_BAD_REQUEST
+
+    # Step 4: Validate inquiry data using ContactInquirySerializer
+    serializer = ContactInquirySerializer(data=data)
+    if not serializer.is_valid():
+        logger.error(f"Serializer validation errors: {serializer.errors}")
+        return {'error': serializer.errors}, status.HTTP_400_BAD_REQUEST
+
+    # Step 5: Store files under their final path, then write the inquiry row once.
+    # The UUID is fixed up front so file names never need a second UPDATE; the row and
+    # its confirmation job commit together, and stored files are removed on rollback.
+    inquiry_id = uuid.uuid4()
+    stored_files = []
+    try:
+        with transaction.atomic():
+            # Storage copies the upload chunk by chunk from its temp file; never read() it whole
+            documents = {}
+            if requirements_doc:
+                path = f'{INQUIRY_DOC_DIR}/requirements/{inquiry_id}_{requirements_doc.name}'
+                documents['requirements_doc'] = default_storage.save(path, requirements_doc)
+                stored_files.append(documents['requirements_doc'])
+            if nda_doc:
+                path = f'{INQUIRY_DOC_DIR}/nda/{inquiry_id}_{nda_doc.name}'
+                documents['nda_doc'] = default_storage.save(path, nda_doc)
+                stored_files.append(documents['nda_doc'])
+
+            inquiry = serializer.save(inquiry_id=inquiry_id, **documents)
+
+            # Step 6: Queue the confirmation email; a `run_jobs` worker sends it off the request path
+            enqueue('send_inquiry_confirmation', {'inquiry_id': str(inquiry_id)})
+    except Exception as e:
+        logger.error(f"Error saving inquiry {inquiry_id}: {str(e)}")
+        _delete_orphan_files(stored_files)
+        return {'error': 'Failed to save inquiry'}, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    # Step 7: Log success and return inquiry ID
+    logger.info(f"Inquiry {inquiry.inquiry_id} submitted successfully")
+    return {'inquiryId': str(inquiry.inquiry_id)}, status.HTTP_201_CREATED
+
 
 class ContactSubmitView(APIView):
     """
     Handles contact form submissions from Contact.jsx:
-    - Validates CAPTCHA using Google reCAPTCHA API.
+    - Validates CAPTCHA using Google reCAPTCHA API (pooled connection, api/captcha.py).
     - Processes FormData, including preferred_technologies as a list.
-    - Validates and saves files (PDF, <5MB).
+    - Validates and saves files (PDF, <5MB), streamed to storage in chunks.
     - Saves inquiry to ContactInquiry model.
-    - Sends confirmation email with inquiry details and Calendly link.
+    - Queues the confirmation email as a background job (api/tasks.py).
     """
     @method_decorator(ensure_csrf_cookie)
     def post(self, request):
         try:
-            logger.info(f"Incoming request data: {request.data}")
+            logger.debug(f"Inquiry submission with fields {sorted(request.data.keys())}")
 
             # Step 1: Verify CAPTCHA
             captcha_token = request.data.get('captcha')
@@ -49,116 +159,16 @@ class ContactSubmitView(APIView):
                 logger.error("Missing CAPTCHA token in request")
                 return Response({'error': 'Please complete the CAPTCHA'}, status=status.HTTP_400_BAD_REQUEST)
 
-            captcha_response = requests.post(
-                'https://www.google.com/recaptcha/api/siteverify',
-                data={
-                    'secret': settings.RECAPTCHA_SECRET_KEY,
-                    'response': captcha_token,
-                },
-                timeout=5
-            ).json()
-
-            if not captcha_response.get('success'):
-                logger.error(f"CAPTCHA verification failed: {captcha_response.get('error-codes', 'Unknown error')}")
-                return Response({'error': 'Invalid CAPTCHA verification'}, status=status.HTTP_400_BAD_REQUEST)
-
-            # Step 2: Handle file uploads and form data
-            requirements_doc = request.FILES.get('requirementsDoc')
-            nda_doc = request.FILES.get('ndaDoc')
-            data = request.data.dict()
-
-            # Extract preferred_technologies as a list to avoid string input
-            preferred_technologies = request.data.getlist('preferredTechnologies[]')
-            data['preferred_technologies'] = preferred_technologies if preferred_technologies else []
-
-            # Step 3: Validate file types (PDF only) and size (<5MB)
-            allowed_types = ['application/pdf']
-            max_size = 5 * 1024 * 1024  # 5MB
-            if requirements_doc:
-                if requirements_doc.content_type not in allowed_types:
-                    logger.error(f"Invalid requirements document type: {requirements_doc.content_type}")
-                    return Response({'error': 'Requirements document must be a PDF'}, status=status.HTTP_400_BAD_REQUEST)
-                if requirements_doc.size > max_size:
-                    logger.error(f"Requirements document too large: {requirements_doc.size} bytes")
-                    return Response({'error': 'Requirements document must be under 5MB'}, status=status.HTTP_400_BAD_REQUEST)
-                data['requirementsDoc'] = requirements_doc
-            if nda_doc:
-                if nda_doc.content_type not in allowed_types:
-                    logger.error(f"Invalid NDA document type: {nda_doc.content_type}")
-                    return Response({'error': 'NDA document must be a PDF'}, status=status.HTTP_400_BAD_REQUEST)
-                if nda_doc.size > max_size:
-                    logger.error(f"NDA document too large: {nda_doc.size} bytes")
-                    return Response({'error': 'NDA document must be under 5MB'}, status=status.HTTP_400_BAD_REQUEST)
-                data['ndaDoc'] = nda_doc
-
-            # Step 4: Validate and save inquiry using ContactInquirySerializer
-            serializer = ContactInquirySerializer(data=data)
-            if not serializer.is_valid():
-                logger.error(f"Serializer validation errors: {serializer.errors}")
-                return Response({'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
-
-            inquiry = serializer.save()
-
-            # Step 5: Save uploaded files with unique filenames
-            try:
-                if requirements_doc:
-                    path = f'inquiries/requirements/{inquiry.inquiry_id}_{requirements_doc.name}'
-                    default_storage.save(path, ContentFile(requirements_doc.read()))
-                    inquiry.requirements_doc = path
-                if nda_doc:
-                    path = f'inquiries/nda/{inquiry.inquiry_id}_{nda_doc.name}'
-                    default_storage.save(path, ContentFile(nda_doc.read()))
-                    inquiry.nda_doc = path
-                inquiry.save()
-            except Exception as e:
-                logger.error(f"Error saving files for inquiry {inquiry.inquiry_id}: {str(e)}")
-                inquiry.delete()  # Rollback if file saving fails
-                return Response({'error': 'Failed to save uploaded files'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            # Step 6: Send confirmation email with detailed inquiry info
-            try:
-                scheduling_link = 'https://calendly.com/your-name/consultation'  # Replace with your Calendly link
-                email_body = (
-                    f"Dear {inquiry.full_name},\n\n"
-                    f"Thank you for your inquiry (ID: {inquiry.inquiry_id}). We have received your request and will follow up within 24-48 hours to discuss your project.\n\n"
-                    f"Inquiry Details:\n"
-                    f"- Company/Organization: {inquiry.company}\n"
-                    f"- Email: {inquiry.email}\n"
-                    f"- Phone: {inquiry.phone}\n"
-                    f"- Project Type: {inquiry.get_project_type_display()}\n"
-                    f"- Project Description: {inquiry.project_description}\n"
-                    f"- Preferred Technologies: {', '.join(inquiry.preferred_technologies) if inquiry.preferred_technologies else 'None'}\n"
-                    f"- Budget Range: {inquiry.get_budget_range_display()}\n"
-                    f"- Timeline: {inquiry.timeline}\n"
-                    f"- Preferred Communication: {inquiry.get_communication_method_display()}\n"
-                    f"- Meeting Platform: {inquiry.get_meeting_platform_display()}\n"
-                    f"- Requirements Document: {'Uploaded' if inquiry.requirements_doc else 'Not provided'}\n"
-                    f"- NDA Document: {'Uploaded' if inquiry.nda_doc else 'Not provided'}\n"
-                    f"- Confidentiality Agreement: {'Accepted' if inquiry.confidentiality else 'Not accepted'}\n\n"
-                    f"To schedule an initial consultation, please book a time slot here: {scheduling_link}\n\n"
-                    f"We respect your privacy and comply with GDPR regulations. For details, see our privacy policy: https://yourdomain.com/privacy-policy\n\n"
-                    f"Best regards,\nYour Name\ncontact@yourdomain.com"
-                )
+            error = _check_captcha_result(verify_captcha(captcha_token))
+            if error:
+                return Response(error[0], status=error[1])
 
-                send_mail(
-                    subject='Your Project Inquiry - Confirmation',
-                    message=email_body,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[inquiry.email],
-                    fail_silently=False,
-                )
-                logger.info(f"Confirmation email sent for inquiry {inquiry.inquiry_id} to {inquiry.email}")
-            except Exception as e:
-                logger.error(f"Failed to send confirmation email for inquiry {inquiry.inquiry_id}: {str(e)}")
-                return Response({
-                    'inquiryId': str(inquiry.inquiry_id),
-                    'warning': 'Inquiry saved, but failed to send confirmation email'
-                }, status=status.HTTP_201_CREATED)
-
-            # Step 7: Log success and return inquiry ID
-            logger.info(f"Inquiry {inquiry.inquiry_id} submitted successfully by {inquiry.full_name}")
-            return Response({'inquiryId': str(inquiry.inquiry_id)}, status=status.HTTP_201_CREATED)
+            payload, status_code = _process_inquiry(request.data, request.FILES, getattr(request, 'upload_errors', None))
+            return Response(payload, status=status_code)
 
+        except CaptchaUnavailable as e:
+            logger.error(f"CAPTCHA service unavailable: {str(e)}")
+            return Response({'error': 'CAPTCHA verification is temporarily unavailable. Please try again later.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except ValidationError as e:
             logger.error(f"Validation error in ContactSubmitView: {str(e)}")
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -166,81 +176,374 @@ class ContactSubmitView(APIView):
             logger.error(f"Unexpected error in ContactSubmitView: {str(e)}")
             return Response({'error': 'An unexpected error occurred. Please try again later.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class ProjectListView(APIView):
+
+class AsyncContactSubmitView(View):
+    """
+    Native async variant of ContactSubmitView for ASGI deployments:
+    - Awaits CAPTCHA verification on a shared keep-alive client, so the worker's
+      event loop keeps serving other submissions while Google responds.
+    - Runs form parsing, DB writes and file storage in a worker thread.
+    - Same request format and responses as ContactSubmitView.
+    """
+    @method_decorator(ensure_csrf_cookie)
+    async def post(self, request):
+        try:
+            form_data, files = await sync_to_async(lambda: (request.POST, request.FILES))()
+            upload_errors = getattr(request, 'upload_errors', None)
+
+            # Step 1: Verify CAPTCHA
+            captcha_token = form_data.get('captcha')
+            if not captcha_token:
+                logger.error("Missing CAPTCHA token in request")
+                return JsonResponse({'error': 'Please complete the CAPTCHA'}, status=status.HTTP_400_BAD_REQUEST)
+
+            error = _check_captcha_result(await averify_captcha(captcha_token))
+            if error:
+                return JsonResponse(error[0], status=error[1])
+
+            payload, status_code = await sync_to_async(_process_inquiry)(form_data, files, upload_errors)
+            return JsonResponse(payload, status=status_code)
+
+        except CaptchaUnavailable as e:
+            logger.error(f"CAPTCHA service unavailable: {str(e)}")
+            return JsonResponse({'error': 'CAPTCHA verification is temporarily unavailable. Please try again later.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except ValidationError as e:
+            logger.error(f"Validation error in AsyncContactSubmitView: {str(e)}")
+            return JsonResponse({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Unexpected error in AsyncContactSubmitView: {str(e)}")
+            return JsonResponse({'error': 'An unexpected error occurred. Please try again later.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class CaptchaStatsView(APIView):
+    """
+    Returns CAPTCHA verifier counters (cache hits/misses, replays, open-circuit
+    short-circuits) and the circuit breaker state for this worker process.
+    Staff only.
+    """
+    permission_classes = [IsAdminUser]
+    def get(self, request):
+        return Response(captcha_stats(), status=status.HTTP_200_OK)
+
+class DatabasePoolStatsView(APIView):
+    """
+    Returns database connection reuse settings and counters for this worker
+    (psycopg pool stats or persistent-connection age) plus server-side
+    connection counts, for sizing DB_POOL_MAX_SIZE against the worker count.
+    Staff only.
+    """
+    permission_classes = [IsAdminUser]
+    def get(self, request):
+        return Response(pool_stats(), status=status.HTTP_200_OK)
+
+class InquiryDocumentView(APIView):
+    """
+    Downloads an inquiry's uploaded PDF (`document`: requirements or nda). Staff only.
+    Django only checks permissions; the bytes are sent by the front server
+    (X-Accel-Redirect / X-Sendfile) or, in development, by a FileResponse (api/sendfile.py).
+    """
+    permission_classes = [IsAdminUser]
+
+    def perform_content_negotiation(self, request, force=False):
+        # `Accept: application/pdf` must not be refused by the JSON renderers
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, inquiry_id, document):
+        field = INQUIRY_DOC_DOWNLOADS.get(document)
+        if field is None:
+            return Response({'error': f'Unknown document: {document}'}, status=status.HTTP_404_NOT_FOUND)
+        name = ContactInquiry.objects.filter(pk=inquiry_id).values_list(field, flat=True).first()
+        if not name or not default_storage.exists(name):
+            logger.error(f"No {document} document for inquiry {inquiry_id}")
+            return Response({'error': 'Document not found'}, status=status.HTTP_404_NOT_FOUND)
+        logger.info(f"Inquiry {inquiry_id} {document} document downloaded by {request.user.username}")
+        filename = os.path.basename(name).removeprefix(f'{inquiry_id}_')
+        return sendfile(request, name, filename, 'application/pdf')
+
+class MetricsView(View):
+    """
+    Prometheus scrape target (`/metrics`): request, SQL, cache and outbound HTTP
+    metrics for this worker process (api/metrics.py).
+    - Plain Django view: no session, auth or content negotiation per scrape.
+    - Allowed with `Authorization: Bearer <METRICS_TOKEN>` or from METRICS_ALLOWED_IPS;
+      with neither configured every scrape is refused.
+    """
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        authorized = bool(token) and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+        if not authorized and request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+            return HttpResponse(status=status.HTTP_403_FORBIDDEN)
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def _requested_fields(request, serializer_class):
+    """
+    Parses a `?fields=a,b,c` sparse-fieldset param, validated against the serializer.
+    Returns None when absent; raises ValueError on unknown field names.
+    """
+    raw = request.query_params.get('fields')
+    if not raw:
+        return None
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = set(fields) - set(serializer_class().fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields
+
+def _only_columns(model, fields):
+    """
+    Model columns to load for a sparse fieldset; `id` and `created_at` are always
+    kept because keyset pagination needs them.
+    """
+    concrete = {field.name for field in model._meta.concrete_fields}
+    return {'id', 'created_at'} | (set(fields) & concrete)
+
+# Array lookups served by the GIN index on Project.technologies
+TECHNOLOGY_LOOKUPS = ('technologies__contains', 'technologies__overlap')
+
+def _filter_technologies(request, queryset):
+    """
+    Applies `?technologies__contains=Django,React` (has all) and
+    `?technologies__overlap=Django,React` (has any) filters.
+    """
+    for lookup in TECHNOLOGY_LOOKUPS:
+        raw = request.query_params.get(lookup)
+        if raw:
+            names = [name.strip() for name in raw.split(',') if name.strip()]
+            queryset = queryset.filter(**{lookup: names})
+    return queryset
+
+class ProjectListView(VersionedCacheMixin, APIView):
     """
     Returns a list of all projects for display in the frontend (e.g., portfolio section).
+    - `?fields=title,image,technologies` returns (and loads) only those fields.
+    - `?technologies__contains=Django,React` / `?technologies__overlap=...` filter by technology.
+    - `?limit=N` and/or `?cursor=...` switch to keyset pagination ordered by
+      (created_at, id): {'results': [...], 'nextCursor': '...' | null}.
+    - Without either param the full list is returned, as before.
+    - Rendered responses are cached until a Project or ProjectStage changes.
     """
+    cache_models = (Project, ProjectStage)
+
     def get(self, request):
-        projects = Project.objects.all()
-        serializer = ProjectSerializer(projects, many=True)
-        logger.info("Retrieved project list")
+        paginate = 'limit' in request.query_params or 'cursor' in request.query_params
+        try:
+            fields = _requested_fields(request, ProjectSerializer)
+            projects = _filter_technologies(request, Project.objects.all())
+            if fields:
+                projects = projects.only(*_only_columns(Project, fields))
+            if paginate:
+                page_size = parse_page_size(request.query_params.get('limit'))
+                projects, next_cursor = keyset_page(projects, request.query_params.get('cursor'), page_size)
+        except ValueError as e:
+            logger.error(f"Invalid project list parameters: {str(e)}")
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = ProjectSerializer(projects, many=True, fields=fields)
+        read_logger.info("Retrieved project list")
+        if paginate:
+            return Response({'results': serializer.data, 'nextCursor': next_cursor}, status=status.HTTP_200_OK)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-class ProjectDetailView(APIView):
+class ProjectDetailView(VersionedCacheMixin, APIView):
     """
     Returns details of a single project by ID for detailed portfolio views.
+    Accepts the same `?fields=` sparse fieldset as ProjectListView.
+    Rendered responses are cached until a Project or ProjectStage changes.
     """
+    cache_models = (Project, ProjectStage)
+
     def get(self, request, pk):
         try:
-            project = Project.objects.get(pk=pk)
-            serializer = ProjectSerializer(project)
-            logger.info(f"Retrieved project {pk}")
+            fields = _requested_fields(request, ProjectSerializer)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            projects = Project.objects.all()
+            if fields:
+                projects = projects.only(*_only_columns(Project, fields))
+            project = projects.get(pk=pk)
+            serializer = ProjectSerializer(project, fields=fields)
+            read_logger.info(f"Retrieved project {pk}")
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Project.DoesNotExist:
             logger.error(f"Project {pk} not found")
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
 
-class CustomerListView(APIView):
+class TechnologyFacetView(VersionedCacheMixin, APIView):
+    """
+    Technology facet counts for the portfolio filter, e.g. React (42) / Django (31).
+    Reads the trigger-maintained TechnologyFacet table (one row per technology),
+    most used first: {'technologies': [{'name': 'React', 'count': 42}, ...]}.
+    """
+    cache_models = (Project,)
+
+    def get(self, request):
+        facets = (
+            TechnologyFacet.objects.filter(source=TechnologyFacet.SOURCE_PROJECT, count__gt=0)
+            .order_by('-count', 'name')
+            .values('name', 'count')
+        )
+        return Response({'technologies': list(facets)}, status=status.HTTP_200_OK)
+
+class ProjectSearchView(APIView):
+    """
+    Full-text project search for SearchBar.jsx:
+    - POST {'query': 'django ecommerce', 'limit': 10} -> {'results': [...]}, best match first.
+    - Prefix matching over title, technologies, capabilities and description,
+      served from the GIN index on Project.search_vector (api/search.py).
+    """
+    def post(self, request):
+        text = str(request.data.get('query', '')).strip()
+        try:
+            limit = max(1, min(int(request.data.get('limit', SEARCH_DEFAULT_LIMIT)), SEARCH_MAX_LIMIT))
+        except (TypeError, ValueError):
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not text:
+            return Response({'results': []}, status=status.HTTP_200_OK)
+
+        projects = ranked_search(Project.objects.all(), text, limit)
+        serializer = ProjectSearchResultSerializer(projects, many=True)
+        read_logger.info(f"Project search for '{text[:100]}' returned {len(serializer.data)} results")
+        return Response({'results': serializer.data}, status=status.HTTP_200_OK)
+
+class RecommendView(APIView):
+    """
+    Project recommendations for Recommendations.jsx:
+    - POST {'viewed': ['/projects/3', 7, ...]} -> {'recommendations': [{'id', 'title', 'score', 'reason'}]}.
+    - Merges precomputed neighbour lists (api/recommendations.py); no similarity is computed per request.
+    """
+    def post(self, request):
+        viewed = parse_viewed(request.data.get('viewed'))
+        recommendations = recommend(viewed)
+        read_logger.info(f"Recommended {len(recommendations)} projects for {len(viewed)} viewed")
+        return Response({'recommendations': recommendations}, status=status.HTTP_200_OK)
+
+def _refreshed_at(*row_lists):
+    """Oldest refresh time among the report rows read, or None if every list is empty."""
+    times = [rows[0]['refreshed_at'] for rows in row_lists if rows]
+    return min(times) if times else None
+
+class ReportsView(ConditionalGetMixin, APIView):
+    """
+    CRM dashboard aggregates for Reports.jsx, read from materialized views (api/reports.py):
+    budget by stage, tasks completed per week, change requests by priority/status
+    and inquiries by budget range. Rows are as fresh as `refreshedAt`.
+    """
+    permission_classes = [IsAuthenticated]
+    cache_models = REPORT_MODELS
+
+    def get(self, request):
+        stages = list(BudgetByStageReport.objects.order_by('stage_order', 'stage_id').values())
+        weeks = list(reversed(WeeklyTaskReport.objects.order_by('-week').values()[:settings.REPORTS_HISTORY_WEEKS]))
+        changes = list(ChangeRequestReport.objects.order_by('priority', 'status').values())
+        inquiries = list(InquiryBudgetReport.objects.order_by('budget_range').values())
+        return Response({
+            'budgetByStage': [
+                {'stage': row['stage'], 'projects': row['projects'], 'budgetUsed': row['budget_used']} for row in stages
+            ],
+            'tasksCompletedPerWeek': [{'week': row['week'], 'completed': row['completed']} for row in weeks],
+            'changeRequests': [
+                {'priority': row['priority'], 'status': row['status'], 'count': row['count']} for row in changes
+            ],
+            'inquiriesByBudget': [{'budgetRange': row['budget_range'], 'count': row['count']} for row in inquiries],
+            'refreshedAt': _refreshed_at(stages, weeks, changes, inquiries),
+        }, status=status.HTTP_200_OK)
+
+class FinancesView(ConditionalGetMixin, APIView):
+    """
+    Monthly budget series for Finances.jsx, read from the monthly budget materialized view:
+    {'months': ['2026-01', ...], 'budgetUsed': [...], 'projectsStarted': [...], 'refreshedAt': ...}.
+    """
+    permission_classes = [IsAuthenticated]
+    cache_models = (MonthlyBudgetReport,)
+
+    def get(self, request):
+        months = list(reversed(MonthlyBudgetReport.objects.order_by('-month').values()[:settings.REPORTS_HISTORY_MONTHS]))
+        return Response({
+            'months': [row['month'].strftime('%Y-%m') for row in months],
+            'budgetUsed': [row['budget_used'] for row in months],
+            'projectsStarted': [row['projects'] for row in months],
+            'refreshedAt': _refreshed_at(months),
+        }, status=status.HTTP_200_OK)
+
+class CustomerListView(ConditionalGetMixin, APIView):
     """
     Returns a list of all customers for admin use (e.g., in Sidebar.jsx admin view).
     Requires authentication.
+    `?limit=N` and/or `?cursor=...` switch to keyset pagination ordered by
+    (created_at, id), as for projects; without them the full list is returned.
     """
     permission_classes = [IsAuthenticated]
+    cache_models = (Customer,)
     def get(self, request):
         customers = Customer.objects.all()
+        paginated = 'limit' in request.query_params or 'cursor' in request.query_params
+        if paginated:
+            try:
+                page_size = parse_page_size(request.query_params.get('limit'))
+                customers, next_cursor = keyset_page(customers, request.query_params.get('cursor'), page_size)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         serializer = CustomerSerializer(customers, many=True)
-        logger.info("Retrieved customer list")
+        read_logger.info("Retrieved customer list")
+        if paginated:
+            return Response({'results': serializer.data, 'nextCursor': next_cursor}, status=status.HTTP_200_OK)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-class CustomerDetailView(APIView):
+class CustomerDetailView(ConditionalGetMixin, APIView):
     """
     Returns details of a single customer by ID for admin use.
     Requires authentication.
     """
     permission_classes = [IsAuthenticated]
+    cache_models = (Customer,)
     def get(self, request, pk):
         try:
             customer = Customer.objects.get(pk=pk)
             serializer = CustomerSerializer(customer)
-            logger.info(f"Retrieved customer {pk}")
+            read_logger.info(f"Retrieved customer {pk}")
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Customer.DoesNotExist:
             logger.error(f"Customer {pk} not found")
             return Response({'error': 'Customer not found'}, status=status.HTTP_404_NOT_FOUND)
 
-class CommunicationListView(APIView):
+class CommunicationListView(ConditionalGetMixin, APIView):
     """
     Returns a list of all communications for admin use (e.g., in Sidebar.jsx admin view).
     Requires authentication.
+    `?limit=N` and/or `?cursor=...` switch to keyset pagination ordered by
+    (date, id); without them the full list is returned.
     """
     permission_classes = [IsAuthenticated]
+    cache_models = (Communication,)
     def get(self, request):
         communications = Communication.objects.all()
+        paginated = 'limit' in request.query_params or 'cursor' in request.query_params
+        if paginated:
+            try:
+                page_size = parse_page_size(request.query_params.get('limit'))
+                communications, next_cursor = keyset_page(
+                    communications, request.query_params.get('cursor'), page_size, field='date',
+                )
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         serializer = CommunicationSerializer(communications, many=True)
-        logger.info("Retrieved communication list")
+        read_logger.info("Retrieved communication list")
+        if paginated:
+            return Response({'results': serializer.data, 'nextCursor': next_cursor}, status=status.HTTP_200_OK)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-class CommunicationDetailView(APIView):
+class CommunicationDetailView(ConditionalGetMixin, APIView):
     """
     Returns details of a single communication by ID for admin use.
     Requires authentication.
     """
     permission_classes = [IsAuthenticated]
+    cache_models = (Communication,)
     def get(self, request, pk):
         try:
             communication = Communication.objects.get(pk=pk)
             serializer = CommunicationSerializer(communication)
-            logger.info(f"Retrieved communication {pk}")
+            read_logger.info(f"Retrieved communication {pk}")
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Communication.DoesNotExist:
             logger.error(f"Communication {pk} not found")
@@ -290,10 +593,11 @@ class UserRoleView(APIView):
     """
     Returns user role for Sidebar.jsx:
     - 'admin' if authenticated and username is 'admin', else 'standard'.
+    - Answered from the cached session and user (api/auth.py): no queries once warm.
     """
     def get(self, request):
-        role = 'admin' if request.user.is_authenticated and request.user.username == 'admin' else 'standard'
-        logger.info(f"User role checked: {role}")
+        role = user_role(request.user)
+        read_logger.info(f"User role checked: {role}")
         return Response({'role': role}, status=status.HTTP_200_OK)
 
 class CSRFView(APIView):
@@ -303,7 +607,7 @@ class CSRFView(APIView):
     @method_decorator(ensure_csrf_cookie)
     def get(self, request):
         csrf_token = request.META.get('CSRF_COOKIE') or ''
-        logger.info("CSRF token requested")
+        read_logger.info("CSRF token requested")
         return Response({'csrfToken': csrf_token}, status=status.HTTP_200_OK)
     
 
@@ -311,24 +615,28 @@ class CSRFView(APIView):
 from .models import ProjectStage, Task, ChangeRequest, ClientProfile
 from rest_framework import permissions
 
-class ProjectStageListView(APIView):
+class ProjectStageListView(ConditionalGetMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (ProjectStage,)
     
     def get(self, request):
-        stages = ProjectStage.objects.all().order_by('order')
+        stages = all_stages()
         serializer = ProjectStageSerializer(stages, many=True)
         return Response(serializer.data)
 
-class TaskListView(APIView):
+class TaskListView(ConditionalGetMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Task,)
     
     def get(self, request):
-        tasks = Task.objects.filter(project=request.query_params.get('project'))
+        # Join the assignee so TaskSerializer.get_assignee_username doesn't query per row
+        tasks = Task.objects.filter(project=request.query_params.get('project')).select_related('assignee')
         serializer = TaskSerializer(tasks, many=True)
         return Response(serializer.data)
 
-class ChangeRequestListView(APIView):
+class ChangeRequestListView(ConditionalGetMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (ChangeRequest,)
     
     def get(self, request):
         requests = ChangeRequest.objects.filter(project=request.query_params.get('project'))
@@ -336,8 +644,9 @@ class ChangeRequestListView(APIView):
         return Response(serializer.data)
 
 # api/views.py
-class ClientProfileView(APIView):
+class ClientProfileView(ConditionalGetMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (ClientProfile,)
     
     def get(self, request, customer_id):
         profile = ClientProfile.objects.get(related_customer_id=customer_id)
@@ -362,39 +671,96 @@ from .serializers import (
 )
 
 
-class ProjectDashboard(generics.RetrieveAPIView):
-    queryset = Project.objects.all()
-    serializer_class = ProjectSerializer
+DASHBOARD_TASK_LIMIT = 50
+DASHBOARD_CHANGE_REQUEST_LIMIT = 10
+DASHBOARD_PROJECT_FIELDS = [
+    'id', 'title', 'description', 'technologies', 'current_stage', 'budget_used', 'estimated_completion', 'created_at',
+]
+
+class ProjectDashboard(ConditionalGetMixin, APIView):
+    """
+    Everything ProjectDashboard.jsx shows, in one response:
+    - project, the stage pipeline and the current stage
+    - task counts plus up to DASHBOARD_TASK_LIMIT tasks (open first, by due date)
+    - change request counts by status plus the most recent change requests
+    Five queries regardless of how many tasks or change requests the project has
+    (stages come from the in-process registry, api/stages.py).
+    """
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Project, ProjectStage, Task, ChangeRequest)
 
+    def get(self, request, pk):
+        try:
+            project = Project.objects.only(*DASHBOARD_PROJECT_FIELDS).get(pk=pk)
+        except Project.DoesNotExist:
+            logger.error(f"Project {pk} not found")
+            return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
 
-class TaskList(generics.ListAPIView):
+        stages = all_stages()
+        tasks = Task.objects.filter(project_id=pk)
+        counts = tasks.aggregate(
+            total_count=models.Count('id'),
+            completed_count=models.Count('id', filter=models.Q(completed=True)),
+            overdue_count=models.Count('id', filter=models.Q(completed=False, due_date__lt=timezone.localdate())),
+        )
+        task_summary = {
+            'total': counts['total_count'],
+            'completed': counts['completed_count'],
+            'pending': counts['total_count'] - counts['completed_count'],
+            'overdue': counts['overdue_count'],
+        }
+        task_rows = (
+            tasks.select_related('assignee')
+            .order_by('completed', models.F('due_date').asc(nulls_last=True), 'id')[:DASHBOARD_TASK_LIMIT]
+        )
+        change_requests = ChangeRequest.objects.filter(project_id=pk)
+        change_request_summary = dict(
+            change_requests.order_by().values_list('status').annotate(count=models.Count('id'))
+        )
+        recent_changes = change_requests.order_by('-created_at', '-id')[:DASHBOARD_CHANGE_REQUEST_LIMIT]
+
+        return Response({
+            'project': ProjectSerializer(project, fields=DASHBOARD_PROJECT_FIELDS).data,
+            'currentStage': project.current_stage_id,
+            'stages': ProjectStageSerializer(stages, many=True).data,
+            'taskSummary': task_summary,
+            'tasks': TaskSerializer(task_rows, many=True).data,
+            'changeRequestSummary': change_request_summary,
+            'changeRequests': ChangeRequestSerializer(recent_changes, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+
+class TaskList(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Task,)
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
-        return Task.objects.filter(project_id=project_id)
+        return Task.objects.filter(project_id=project_id).select_related('assignee')
 
 
-class ChangeRequestList(generics.ListAPIView):
+class ChangeRequestList(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = ChangeRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (ChangeRequest,)
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
         return ChangeRequest.objects.filter(project_id=project_id)
 
 
-class CustomerList(generics.ListCreateAPIView):
+class CustomerList(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Customer,)
 
 
-class CommunicationList(generics.ListCreateAPIView):
+class CommunicationList(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = CommunicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Communication,)
 
     def get_queryset(self):
         customer_id = self.kwargs.get('customer_id')
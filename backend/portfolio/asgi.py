@@ -12,5 +12,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio.settings')
+os.environ.setdefault('DB_POOL', 'True')  # Persistent connections don't carry over between async requests
 
 application = get_asgi_application()
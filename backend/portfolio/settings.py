@@ -26,12 +26,15 @@ INSTALLED_APPS = [
 
 # Middleware for request/response processing
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',  # First, so timings cover every other middleware
     'django.middleware.security.SecurityMiddleware',
+    'api.db_router.ReplicaRoutingMiddleware',  # Must precede anything that reads the database
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',  # CSRF protection for Contact.jsx
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.profiling.ProfilingMiddleware',  # Needs request.user (staff-only profiles)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -66,6 +69,20 @@ TEMPLATES = [
 WSGI_APPLICATION = 'portfolio.wsgi.application'
 
 # Database configuration (PostgreSQL)
+# Connection reuse (see /api/db/pool/ for live numbers):
+# - WSGI: persistent connections kept for DB_CONN_MAX_AGE seconds, health-checked before reuse.
+# - ASGI: a psycopg connection pool (DB_POOL, on by default in portfolio/asgi.py), because
+#   persistent connections are not reused across async requests.
+#   Size it so DB_POOL_MAX_SIZE x worker processes stays below PostgreSQL's max_connections.
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '60'))                       # Seconds; 0 = new connection per request
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True'    # Ping reused/pooled connections first
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '2'))                      # Connections kept open per process
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))                     # Upper bound per process
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))                     # Seconds to wait for a free connection
+DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))         # Recycle connections after this long
+DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', '300'))                  # Close surplus idle connections after this long
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -74,8 +91,56 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', 'todo_secure_pass_2025'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL else DB_CONN_MAX_AGE,  # Pooling and persistent connections are exclusive
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        'OPTIONS': {
+            'pool': {
+                'min_size': DB_POOL_MIN_SIZE,
+                'max_size': DB_POOL_MAX_SIZE,
+                'timeout': DB_POOL_TIMEOUT,
+                'max_lifetime': DB_POOL_MAX_LIFETIME,
+                'max_idle': DB_POOL_MAX_IDLE,
+            },
+        } if DB_POOL else {},
+    }
+}
+
+# Read replicas (api/db_router.py): comma-separated host[:port] list, one alias each
+# (replica_1, replica_2, ...). GET/HEAD/OPTIONS requests read from a random replica unless
+# the client wrote within DB_REPLICA_STICKY_SECONDS. DB_REPLICA_HOSTS=localhost adds an
+# alias pointing at the primary, which is enough to exercise the routing locally.
+DB_REPLICA_HOSTS = [host.strip() for host in os.getenv('DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+DB_REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', '10'))  # Read-your-writes window
+for index, replica in enumerate(DB_REPLICA_HOSTS, start=1):
+    replica_host, _, replica_port = replica.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'TEST': {'MIRROR': 'default'},  # Tests read the primary's test database
+    }
+DB_REPLICA_ALIASES = [f'replica_{index}' for index in range(1, len(DB_REPLICA_HOSTS) + 1)]
+DATABASE_ROUTERS = ['api.db_router.ReplicaRouter']
+
+# Cache configuration: local memory by default; set CACHE_BACKEND/CACHE_LOCATION to share
+# the cache between worker processes (e.g. django.core.cache.backends.redis.RedisCache)
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
+API_CACHE_ALIAS = os.getenv('API_CACHE_ALIAS', 'default')       # Cache used for public API responses
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', '300'))  # Upper bound on staleness (seconds)
+
+# Cached sessions and users (api/auth.py): a warm authenticated request makes no
+# django_session / auth_user queries. cached_db writes through to the database.
+SESSION_ENGINE = os.getenv('SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+AUTHENTICATION_BACKENDS = ['api.auth.CachedModelBackend']
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', '300'))  # Seconds a user stays cached
+STAGE_REGISTRY_CHECK_INTERVAL = float(os.getenv('STAGE_REGISTRY_CHECK_INTERVAL', '5'))  # Seconds between stage-version checks (api/stages.py)
 
 # Password validation rules
 AUTH_PASSWORD_VALIDATORS = [
@@ -95,10 +160,60 @@ EMAIL_HOST_PASSWORD = 'your-password'
 DEFAULT_FROM_EMAIL = 'your-email@example.com'
 RECAPTCHA_SECRET_KEY = 'YOUR_RECAPTCHA_SECRET_KEY'  # Replace with your reCAPTCHA secret key
 
+# reCAPTCHA verification HTTP client (api/captcha.py)
+# Point RECAPTCHA_VERIFY_URL at `manage.py run_captcha_stub` (e.g. http://127.0.0.1:8099/siteverify) for offline load tests
+RECAPTCHA_VERIFY_URL = os.getenv('RECAPTCHA_VERIFY_URL', 'https://www.google.com/recaptcha/api/siteverify')
+RECAPTCHA_HTTP_TIMEOUT = float(os.getenv('RECAPTCHA_HTTP_TIMEOUT', '5'))              # Connect/read timeout (seconds)
+RECAPTCHA_HTTP_POOL_TIMEOUT = float(os.getenv('RECAPTCHA_HTTP_POOL_TIMEOUT', '5'))    # Max wait for a free pooled connection
+RECAPTCHA_HTTP_MAX_CONNECTIONS = int(os.getenv('RECAPTCHA_HTTP_MAX_CONNECTIONS', '100'))
+RECAPTCHA_HTTP_MAX_KEEPALIVE = int(os.getenv('RECAPTCHA_HTTP_MAX_KEEPALIVE', '20'))
+RECAPTCHA_MAX_CONCURRENCY = int(os.getenv('RECAPTCHA_MAX_CONCURRENCY', '500'))        # In-flight verifications per event loop
+RECAPTCHA_CACHE_TTL = int(os.getenv('RECAPTCHA_CACHE_TTL', '120'))                     # Tokens expire after 2 minutes upstream
+RECAPTCHA_BREAKER_FAILURE_RATE = float(os.getenv('RECAPTCHA_BREAKER_FAILURE_RATE', '0.5'))  # Failed/slow share that opens the circuit
+RECAPTCHA_BREAKER_MIN_CALLS = int(os.getenv('RECAPTCHA_BREAKER_MIN_CALLS', '10'))
+RECAPTCHA_BREAKER_WINDOW = float(os.getenv('RECAPTCHA_BREAKER_WINDOW', '30'))           # Seconds of outcomes considered
+RECAPTCHA_BREAKER_RESET_TIMEOUT = float(os.getenv('RECAPTCHA_BREAKER_RESET_TIMEOUT', '30'))  # Open -> half-open after this
+RECAPTCHA_BREAKER_SLOW_CALL = float(os.getenv('RECAPTCHA_BREAKER_SLOW_CALL', '2'))      # Slower calls count as failures
+RECAPTCHA_DEGRADED_POLICY = os.getenv('RECAPTCHA_DEGRADED_POLICY', 'reject')           # 'reject' (503) or 'allow'
+
+# Background job queue (api/jobs.py, processed by `manage.py run_jobs`)
+JOB_QUEUE_EAGER = os.getenv('JOB_QUEUE_EAGER', 'False') == 'True'  # Run jobs in-process on commit (dev/tests)
+JOB_QUEUE_MAX_ATTEMPTS = int(os.getenv('JOB_QUEUE_MAX_ATTEMPTS', '5'))
+JOB_QUEUE_BACKOFF_BASE = float(os.getenv('JOB_QUEUE_BACKOFF_BASE', '10'))   # Seconds before the first retry
+JOB_QUEUE_BACKOFF_MAX = float(os.getenv('JOB_QUEUE_BACKOFF_MAX', '3600'))   # Upper bound for retry delay
+JOB_QUEUE_POLL_INTERVAL = float(os.getenv('JOB_QUEUE_POLL_INTERVAL', '1'))  # Idle sleep between polls
+JOB_QUEUE_LOCK_TIMEOUT = int(os.getenv('JOB_QUEUE_LOCK_TIMEOUT', '300'))    # Requeue jobs running longer than this
+
+# Precomputed recommendations (api/recommendations.py)
+RECOMMENDATIONS_TOP_K = int(os.getenv('RECOMMENDATIONS_TOP_K', '20'))                    # Neighbours stored per project
+RECOMMENDATIONS_TECH_WEIGHT = float(os.getenv('RECOMMENDATIONS_TECH_WEIGHT', '0.6'))     # Technologies vs capabilities text
+RECOMMENDATIONS_REBUILD_DELAY = int(os.getenv('RECOMMENDATIONS_REBUILD_DELAY', '300'))   # Seconds to batch edits before a rebuild
+
+# Reporting materialized views (api/reports.py)
+REPORTS_REFRESH_INTERVAL = int(os.getenv('REPORTS_REFRESH_INTERVAL', '900'))  # Seconds between scheduled refreshes
+REPORTS_HISTORY_WEEKS = int(os.getenv('REPORTS_HISTORY_WEEKS', '12'))         # Weeks of task completions returned
+REPORTS_HISTORY_MONTHS = int(os.getenv('REPORTS_HISTORY_MONTHS', '12'))       # Months of budget history returned
+
 # Media file settings for file uploads
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Upload handlers: inquiry PDFs are validated while streaming (api/uploads.py), then
+# spooled to memory (small requests) or a temp file, never held twice in memory
+FILE_UPLOAD_HANDLERS = [
+    'api.uploads.InquiryDocumentUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+INQUIRY_DOC_MAX_SIZE = int(os.getenv('INQUIRY_DOC_MAX_SIZE', str(5 * 1024 * 1024)))  # 5MB per document
+
+# Authenticated inquiry document downloads (api/sendfile.py): after the permission check
+# the transfer is handed to the front server. nginx needs an internal location, e.g.
+#   location /protected-media/ { internal; alias /app/backend/media/; }
+# and MEDIA_ROOT must not be served publicly. Empty: Django streams the file itself.
+SENDFILE_BACKEND = os.getenv('SENDFILE_BACKEND', '')  # 'nginx' (X-Accel-Redirect), 'xsendfile' (Apache/lighttpd) or ''
+SENDFILE_URL = os.getenv('SENDFILE_URL', '/protected-media/')  # nginx internal location mapped to MEDIA_ROOT
+
 # Static file settings
 STATIC_URL = 'static/'
 
@@ -111,19 +226,52 @@ USE_TZ = True
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-# Logging configuration for debugging
+# Responsive Project.image variants (api/images.py); widths are never upscaled
+IMAGE_VARIANT_WIDTHS = {'thumb': 320, 'medium': 768, 'large': 1600}
+IMAGE_VARIANT_FORMATS = [name.strip() for name in os.getenv('IMAGE_VARIANT_FORMATS', 'avif,webp').split(',') if name.strip()]  # Preference order
+
+# Prometheus metrics (api/metrics.py), scraped from /metrics
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')  # Bearer token for scrapers
+# Scraper addresses allowed without a token (REMOTE_ADDR). Never list the reverse proxy's
+# address (e.g. 127.0.0.1 behind a same-host nginx): every proxied request comes from it
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+
+# Diagnostics (api/profiling.py): staff request profiles and slow-query capture, in the admin
+PROFILING_INTERVAL = float(os.getenv('PROFILING_INTERVAL', '0.002'))  # Seconds between stack samples
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))  # Capture SQL slower than this (0 disables)
+SLOW_QUERY_COOLDOWN = int(os.getenv('SLOW_QUERY_COOLDOWN', '300'))  # Seconds before the same statement is captured again
+
+# Logging: JSON lines written by a background thread (api/log.py), with PII redaction
+# and sampling of per-call read endpoint lines (logger `api.reads`)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))  # Records buffered before new ones are dropped
+LOG_READ_SAMPLE_RATE = float(os.getenv('LOG_READ_SAMPLE_RATE', '0.01'))  # Fraction of read endpoint INFO lines kept
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'api.log.JsonFormatter'},
+        'text': {'()': 'api.log.TextFormatter'},
+    },
+    'filters': {
+        'sample_reads': {'()': 'api.log.SamplingFilter', 'rate': LOG_READ_SAMPLE_RATE},
+    },
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
+            'class': 'api.log.QueueingStreamHandler',
+            'formatter': LOG_FORMAT,
+            'queue_size': LOG_QUEUE_SIZE,
         },
     },
     'loggers': {
         '': {
             'handlers': ['console'],
-            'level': 'INFO',
+            'level': LOG_LEVEL,
+        },
+        'api.reads': {
+            'filters': ['sample_reads'],
         },
     },
-}
\ No newline at end of file
+}
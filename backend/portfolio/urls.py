@@ -1,9 +1,16 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from api.sendfile import serve_public_media
+from api.views import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
-]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path('metrics', MetricsView.as_view(), name='metrics'),
+]
+
+# Development media server (like django.conf.urls.static.static), minus inquiry documents
+if settings.DEBUG and settings.MEDIA_URL.startswith('/'):
+    urlpatterns += [re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_public_media)]
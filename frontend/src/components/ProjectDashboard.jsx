@@ -6,20 +6,20 @@ const ProjectDashboard = ({ projectId }) => {
     const [stages, setStages] = useState([]);
     const [currentStage, setCurrentStage] = useState('');
     const [tasks, setTasks] = useState([]);
+    const [taskSummary, setTaskSummary] = useState(null);
     const [changeRequests, setChangeRequests] = useState([]);
 
     useEffect(() => {
-        // Fetch project stages
-        axios.get('/api/stages/')
-            .then(response => setStages(response.data));
-
-        // Fetch project tasks
-        axios.get(`/api/tasks/?project=${projectId}`)
-            .then(response => setTasks(response.data));
-
-        // Fetch change requests
-        axios.get(`/api/change-requests/?project=${projectId}`)
-            .then(response => setChangeRequests(response.data));
+        // One round-trip: project, stage pipeline, tasks and recent change requests
+        axios.get(`/api/projects/${projectId}/dashboard/`)
+            .then(response => {
+                setStages(response.data.stages);
+                setCurrentStage(response.data.currentStage);
+                setTasks(response.data.tasks);
+                setTaskSummary(response.data.taskSummary);
+                setChangeRequests(response.data.changeRequests);
+            })
+            .catch(error => console.error('Error fetching project dashboard:', error));
     }, [projectId]);
 
     const updateStage = (stageId) => {
@@ -50,6 +50,11 @@ const ProjectDashboard = ({ projectId }) => {
             {/* Tasks Section */}
             <div className="mb-6">
                 <h3 className="font-semibold mb-2">Tasks</h3>
+                {taskSummary && (
+                    <p className="text-sm text-gray-600 mb-2">
+                        {taskSummary.completed}/{taskSummary.total} completed, {taskSummary.overdue} overdue
+                    </p>
+                )}
                 <ul className="space-y-2">
                     {tasks.map(task => (
                         <li key={task.id} className="flex items-center justify-between p-2 border rounded">
@@ -16,25 +16,33 @@ function Finances() {
         labels: data ? data.months : [],
         datasets: [
             {
-                label: 'Revenue',
-                data: data ? data.revenue : [],
-                borderColor: '#10B981',
+                label: 'Budget Used',
+                data: data ? data.budgetUsed : [],
+                borderColor: '#EF4444',
                 tension: 0.1,
             },
             {
-                label: 'Expenses',
-                data: data ? data.expenses : [],
-                borderColor: '#EF4444',
+                label: 'Projects Started',
+                data: data ? data.projectsStarted : [],
+                borderColor: '#10B981',
                 tension: 0.1,
+                yAxisID: 'projects',
             },
         ],
     };
 
+    const options = {
+        scales: {
+            y: { position: 'left' },
+            projects: { position: 'right', grid: { drawOnChartArea: false } },
+        },
+    };
+
     return (
         <main className="ml-64 p-8">
             <h1 className="text-3xl font-bold mb-6">Financial Performance</h1>
             <div className="bg-gray-800 p-6 rounded-lg">
-                <Line data={chartData} />
+                <Line data={chartData} options={options} />
             </div>
         </main>
     );
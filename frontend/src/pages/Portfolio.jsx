@@ -4,25 +4,68 @@ import axios from 'axios';
 
 function Portfolio() {
   const [projects, setProjects] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [facets, setFacets] = useState([]);
+  const [selected, setSelected] = useState([]);
 
-  useEffect(() => {
-    axios.get('/api/projects/')
-      .then(response => setProjects(response.data))
+  // Only the fields the grid renders, one keyset page at a time
+  const loadProjects = (cursor = null) => {
+    const params = { fields: 'id,title,image,image_variants,description', limit: 12 };
+    if (cursor) params.cursor = cursor;
+    if (selected.length) params.technologies__contains = selected.join(',');
+    axios.get('/api/projects/', { params })
+      .then(response => {
+        setProjects(prev => (cursor ? [...prev, ...response.data.results] : response.data.results));
+        setNextCursor(response.data.nextCursor);
+      })
       .catch(error => console.error('Error fetching projects:', error));
+  };
+
+  useEffect(() => {
+    axios.get('/api/projects/facets/')
+      .then(response => setFacets(response.data.technologies))
+      .catch(error => console.error('Error fetching technology facets:', error));
   }, []);
 
+  useEffect(() => {
+    loadProjects();
+  }, [selected]);
+
+  const toggleTechnology = (name) => {
+    setSelected(prev => (prev.includes(name) ? prev.filter(item => item !== name) : [...prev, name]));
+  };
+
   return (
     <section className="py-16 bg-gray-900">
       <div className="max-w-7xl mx-auto px-4">
         <h2 className="text-2xl text-center text-primary mb-12">"One scroll, every spark — code, design, and craft distilled into an immersive journey that moves faster than thought."</h2>
+        {facets.length > 0 && (
+          <div className="flex flex-wrap justify-center gap-2 mb-8">
+            {facets.map(facet => (
+              <button
+                key={facet.name}
+                onClick={() => toggleTechnology(facet.name)}
+                className={`px-3 py-1 rounded-full text-sm ${selected.includes(facet.name) ? 'bg-primary text-white' : 'bg-gray-800 text-gray-300'}`}
+              >
+                {facet.name} ({facet.count})
+              </button>
+            ))}
+          </div>
+        )}
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
           {projects.map(project => (
             <div key={project.id} className="bg-gray-800 rounded-lg shadow-lg p-6 hover:shadow-xl transition-shadow fixed-h-96 w-80 overflow-hidden">
-              <img
-                src={project.image}
-                alt={project.title}
-                className="w-full h-48 object-cover rounded-lg mb-4"
-              />
+              <picture>
+                {Object.entries(project.image_variants?.srcset || {}).map(([format, srcset]) => (
+                  <source key={format} type={`image/${format}`} srcSet={srcset} sizes="320px" />
+                ))}
+                <img
+                  src={project.image}
+                  alt={project.title}
+                  loading="lazy"
+                  className="w-full h-48 object-cover rounded-lg mb-4"
+                />
+              </picture>
               <h3 className="text-2xl font-semibold text-white mb-2">{project.title}</h3>
               <p className="text-gray-300 mb-4 line-clamp-3">{project.description}</p>
               <Link to={`/projects/${project.id}`} className="text-accent hover:underline">
@@ -31,6 +74,16 @@ function Portfolio() {
             </div>
           ))}
         </div>
+        {nextCursor && (
+          <div className="text-center mt-12">
+            <button
+              onClick={() => loadProjects(nextCursor)}
+              className="px-6 py-2 bg-primary text-white rounded-lg hover:opacity-90 transition-opacity"
+            >
+              Load more
+            </button>
+          </div>
+        )}
       </div>
     </section>
   );
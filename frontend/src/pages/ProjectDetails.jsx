@@ -8,6 +8,10 @@ function ProjectDetails() {
     const { id } = useParams();
 
     useEffect(() => {
+        // Most recent last; read by Recommendations.jsx
+        const viewed = JSON.parse(localStorage.getItem('viewedPages') || '[]').filter(page => page !== `/projects/${id}`);
+        localStorage.setItem('viewedPages', JSON.stringify([...viewed, `/projects/${id}`].slice(-20)));
+
         axios.get(`/api/projects/${id}/`)
             .then(response => {
                 setProject(response.data);
@@ -26,11 +30,17 @@ function ProjectDetails() {
                 <h2 className="text-4xl font-bold text-center text-primary mb-12">{project.title}</h2>
                 <div className="grid grid-cols-1 md:grid-cols-2 gap-8">
                     <div>
-                        <img
-                            src={project.image}
-                            alt={project.title}
-                            className="w-full h-96 object-cover rounded-lg mb-4"
-                        />
+                        <picture>
+                            {/* AVIF/WebP variants once processed; the original upload otherwise */}
+                            {Object.entries(project.image_variants?.srcset || {}).map(([format, srcset]) => (
+                                <source key={format} type={`image/${format}`} srcSet={srcset} sizes="(min-width: 768px) 50vw, 100vw" />
+                            ))}
+                            <img
+                                src={project.image}
+                                alt={project.title}
+                                className="w-full h-96 object-cover rounded-lg mb-4"
+                            />
+                        </picture>
                         <div className="grid grid-cols-3 gap-4">
                             {/* Example additional pictures; replace with real data */}
                             <img src="https://via.placeholder.com/200" alt="Capability 1" className="w-full h-32 object-cover rounded" />
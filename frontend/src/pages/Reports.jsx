@@ -12,23 +12,56 @@ function Reports() {
             .catch(error => console.error('Error fetching reports:', error));
     }, []);
 
-    const barData = {
-        labels: reportData ? reportData.categories : [],
+    const stages = reportData ? reportData.budgetByStage : [];
+    const weeks = reportData ? reportData.tasksCompletedPerWeek : [];
+    const inquiries = reportData ? reportData.inquiriesByBudget : [];
+
+    // Change requests per status, summed over priorities
+    const statusCounts = {};
+    (reportData ? reportData.changeRequests : []).forEach(row => {
+        statusCounts[row.status] = (statusCounts[row.status] || 0) + row.count;
+    });
+
+    const colors = ['#10B981', '#EF4444', '#FBBF24', '#3B82F6', '#8B5CF6'];
+
+    const budgetData = {
+        labels: stages.map(row => row.stage),
         datasets: [
             {
-                label: 'Sales by Category',
-                data: reportData ? reportData.sales : [],
+                label: 'Budget Used',
+                data: stages.map(row => row.budgetUsed),
                 backgroundColor: '#10B981',
             },
         ],
     };
 
-    const pieData = {
-        labels: reportData ? reportData.statuses : [],
+    const tasksData = {
+        labels: weeks.map(row => row.week),
+        datasets: [
+            {
+                label: 'Tasks Completed',
+                data: weeks.map(row => row.completed),
+                backgroundColor: '#3B82F6',
+            },
+        ],
+    };
+
+    const statusData = {
+        labels: Object.keys(statusCounts),
         datasets: [
             {
-                data: reportData ? reportData.statusCounts : [],
-                backgroundColor: ['#10B981', '#EF4444', '#FBBF24'],
+                data: Object.values(statusCounts),
+                backgroundColor: colors,
+            },
+        ],
+    };
+
+    const inquiryData = {
+        labels: inquiries.map(row => row.budgetRange),
+        datasets: [
+            {
+                data: inquiries.map(row => row.count),
+                backgroundColor: colors,
             },
         ],
     };
@@ -38,14 +71,25 @@ function Reports() {
             <h1 className="text-3xl font-bold mb-6">Reports</h1>
             <div className="grid grid-cols-1 md:grid-cols-2 gap-8">
                 <div className="bg-gray-800 p-6 rounded-lg">
-                    <h2 className="text-xl font-semibold mb-4">Sales by Category</h2>
-                    <Bar data={barData} />
+                    <h2 className="text-xl font-semibold mb-4">Budget by Stage</h2>
+                    <Bar data={budgetData} />
+                </div>
+                <div className="bg-gray-800 p-6 rounded-lg">
+                    <h2 className="text-xl font-semibold mb-4">Tasks Completed per Week</h2>
+                    <Bar data={tasksData} />
+                </div>
+                <div className="bg-gray-800 p-6 rounded-lg">
+                    <h2 className="text-xl font-semibold mb-4">Change Request Status</h2>
+                    <Pie data={statusData} />
                 </div>
                 <div className="bg-gray-800 p-6 rounded-lg">
-                    <h2 className="text-xl font-semibold mb-4">Order Status Distribution</h2>
-                    <Pie data={pieData} />
+                    <h2 className="text-xl font-semibold mb-4">Inquiries by Budget Range</h2>
+                    <Pie data={inquiryData} />
                 </div>
             </div>
+            {reportData && reportData.refreshedAt && (
+                <p className="mt-4 text-sm text-gray-400">Last updated {new Date(reportData.refreshedAt).toLocaleString()}</p>
+            )}
             <div className="mt-8 text-center">
                 <button className="bg-accent text-white py-2 px-4 rounded hover:bg-green-600">Export Report</button>
             </div>
@@ -53,4 +97,4 @@ function Reports() {
     );
 }
 
-export default Reports;
\ No newline at end of file
+export default Reports;